@@ -0,0 +1,84 @@
+"""
+=======================================================
+BENCHMARK: Extracción de HTML (lxml incremental vs BeautifulSoup)
+=======================================================
+Compara tiempo y memoria pico de los dos motores de extracción de
+WebScraper sobre las páginas guardadas en benchmarks/fixtures/, y
+comprueba que ambos producen exactamente el mismo título y texto.
+
+Uso:
+    python benchmarks/bench_extraccion.py [--repeticiones 20] [--fixtures DIR]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'src'))
+
+from scraping import extraer_con_beautifulsoup, extraer_con_lxml
+
+
+MOTORES = {
+    'beautifulsoup': extraer_con_beautifulsoup,
+    'lxml': extraer_con_lxml,
+}
+
+
+def medir(funcion, contenido, repeticiones):
+    """Devuelve (milisegundos por página, memoria pico en KB)"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion(contenido)
+    ms = (time.perf_counter() - inicio) * 1000 / repeticiones
+
+    tracemalloc.start()
+    funcion(contenido)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return ms, pico / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticiones', type=int, default=20)
+    parser.add_argument('--fixtures', default=os.path.join(current_dir, 'fixtures'))
+    args = parser.parse_args()
+
+    rutas = sorted(glob.glob(os.path.join(args.fixtures, '*.html')))
+    if not rutas:
+        print(f"❌ No hay archivos .html en {args.fixtures}")
+        sys.exit(1)
+
+    print(f"{'Página':<28}{'KB':>8}{'Motor':>15}{'ms/pág':>10}{'Pico KB':>10}")
+    print("-" * 71)
+
+    for ruta in rutas:
+        with open(ruta, 'rb') as f:
+            contenido = f.read()
+
+        salidas = {nombre: funcion(contenido) for nombre, funcion in MOTORES.items()}
+        if salidas['lxml'] != salidas['beautifulsoup']:
+            print(f"❌ Los motores difieren en {os.path.basename(ruta)}")
+            sys.exit(1)
+
+        tiempos = {}
+        for nombre, funcion in MOTORES.items():
+            ms, pico = medir(funcion, contenido, args.repeticiones)
+            tiempos[nombre] = ms
+            print(f"{os.path.basename(ruta):<28}{len(contenido) / 1024:>8.1f}"
+                  f"{nombre:>15}{ms:>10.2f}{pico:>10.0f}")
+
+        print(f"{'':<36}{'aceleración':>15}{tiempos['beautifulsoup'] / tiempos['lxml']:>9.1f}x")
+
+    print("\n✅ Ambos motores producen la misma salida en todas las páginas")
+
+
+if __name__ == "__main__":
+    main()
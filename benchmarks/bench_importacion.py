@@ -0,0 +1,113 @@
+"""
+=======================================================
+BENCHMARK: Tiempo de importación de los módulos de src/
+=======================================================
+Importa cada módulo en un proceso nuevo con `python -X importtime`,
+muestra el tiempo acumulado (mediana de varias ejecuciones) y las
+dependencias más costosas, y comprueba que:
+1. Ningún módulo supera su tiempo objetivo
+2. Ninguno carga al importarse librerías pesadas que solo se usan en
+   algunos métodos (gráficos, scikit-learn, NLTK, scipy)
+
+Uso:
+    python benchmarks/bench_importacion.py [--repeticiones 5] [--tolerancia 1.0]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..', 'src')
+
+
+# Tiempo objetivo (ms) de `import <módulo>` en un proceso nuevo
+OBJETIVOS_MS = {
+    'preprocessing': 250,
+    'model': 200,
+    'paquete_modelo': 300,
+}
+
+# Librerías que no deben cargarse solo por importar los módulos
+PESADAS = ['matplotlib', 'seaborn', 'sklearn', 'nltk', 'scipy', 'joblib', 'pandas']
+
+
+def medir_importacion(modulo):
+    """
+    Importa el módulo con -X importtime
+
+    Returns:
+        Tupla (ms acumulados del módulo, lista (ms, paquete) de sus dependencias)
+    """
+    entorno = dict(os.environ, PYTHONPATH=src_dir)
+    proceso = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+                             capture_output=True, text=True, env=entorno, check=True)
+
+    tiempos = []
+    for linea in proceso.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+        _, acumulado, paquete = linea[len('import time:'):].split('|')
+        tiempos.append((int(acumulado) / 1000, paquete.strip()))
+
+    total = next(ms for ms, paquete in reversed(tiempos) if paquete == modulo)
+    return total, tiempos
+
+
+def pesadas_cargadas(modulo):
+    """Librerías de PESADAS presentes en sys.modules tras importar el módulo"""
+    entorno = dict(os.environ, PYTHONPATH=src_dir)
+    codigo = (f"import sys, {modulo}; "
+              f"print(' '.join(m for m in {PESADAS!r} if m in sys.modules))")
+    proceso = subprocess.run([sys.executable, '-c', codigo], capture_output=True,
+                             text=True, env=entorno, check=True)
+    return proceso.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--tolerancia', type=float, default=1.0,
+                        help='Multiplica los objetivos (máquinas más lentas)')
+    parser.add_argument('--top', type=int, default=5,
+                        help='Dependencias más costosas que se muestran por módulo')
+    args = parser.parse_args()
+
+    fallos = []
+    print(f"{'Módulo':<18}{'ms (mediana)':>14}{'objetivo':>10}  Estado")
+    print("-" * 52)
+
+    for modulo, objetivo in OBJETIVOS_MS.items():
+        mediciones = [medir_importacion(modulo) for _ in range(args.repeticiones)]
+        mediana = statistics.median(total for total, _ in mediciones)
+        limite = objetivo * args.tolerancia
+
+        estado = '✅' if mediana <= limite else '❌'
+        if mediana > limite:
+            fallos.append(f"{modulo}: {mediana:.0f} ms > {limite:.0f} ms")
+        print(f"{modulo:<18}{mediana:>14.1f}{limite:>10.0f}  {estado}")
+
+        # Dependencias directas e indirectas más costosas (última ejecución)
+        _, tiempos = mediciones[-1]
+        for ms, paquete in sorted((t for t in tiempos if t[1] != modulo), reverse=True)[:args.top]:
+            print(f"{'':<4}{paquete:<32}{ms:>8.1f} ms")
+
+        cargadas = pesadas_cargadas(modulo)
+        if cargadas:
+            fallos.append(f"{modulo} carga al importarse: {', '.join(cargadas)}")
+
+    if fallos:
+        print("\n❌ Objetivos no cumplidos:")
+        for fallo in fallos:
+            print(f"   • {fallo}")
+        sys.exit(1)
+
+    print("\n✅ Todos los módulos cumplen su objetivo de importación")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+=======================================================
+BENCHMARK: Memoria del pipeline (float64 vs float32)
+=======================================================
+Genera un corpus sintético a partir del vocabulario de
+data/processed/dataset_procesado.csv, lo vectoriza, entrena el
+clasificador y el clustering, y muestra por etapa el tamaño de la
+matriz resultante (nnz, MB, tipo de índices) y el pico de RSS. Cada
+dtype se ejecuta en un proceso nuevo para que los picos no se mezclen.
+
+Uso:
+    python benchmarks/bench_memoria.py [--documentos 20000] [--max-features 20000]
+                                       [--modo tfidf] [--clusters 8]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'src'))
+
+from memoria import InformeMemoria
+from model import ModeloAprendizajeWeb
+from preprocessing import PreprocesadorTexto
+
+
+DATASET = os.path.join(current_dir, '..', 'data', 'processed', 'dataset_procesado.csv')
+
+
+def generar_corpus(n_documentos, palabras_por_documento=120, semilla=42):
+    """
+    Documentos sintéticos: cada categoría del dataset aporta sus palabras,
+    mezcladas con un vocabulario de cola larga para que la matriz tenga
+    un tamaño realista
+
+    Returns:
+        Tupla (textos, categorías)
+    """
+    df = pd.read_csv(DATASET)
+    rng = np.random.default_rng(semilla)
+    categorias = df['categoria'].unique()
+    palabras_categoria = {c: ' '.join(df.loc[df['categoria'] == c, 'texto_procesado']).split()
+                          for c in categorias}
+    cola = np.array([f"term{i}" for i in range(50_000)])
+    pesos_cola = 1 / np.arange(1, len(cola) + 1)
+    pesos_cola /= pesos_cola.sum()
+
+    textos, etiquetas = [], []
+    for i in range(n_documentos):
+        categoria = categorias[i % len(categorias)]
+        propias = rng.choice(palabras_categoria[categoria], palabras_por_documento // 2)
+        comunes = rng.choice(cola, palabras_por_documento // 2, p=pesos_cola)
+        textos.append(' '.join(np.concatenate([propias, comunes])))
+        etiquetas.append(categoria)
+    return textos, np.array(etiquetas)
+
+
+def ejecutar(args):
+    """Pipeline completo con un dtype; imprime su informe"""
+    textos, etiquetas = generar_corpus(args.documentos)
+    informe = InformeMemoria()
+    prep = PreprocesadorTexto()
+    modelo = ModeloAprendizajeWeb(dtype=args.dtype)
+
+    with informe.etapa('vectorizar') as registro:
+        X = prep.vectorizar_textos(textos, max_features=args.max_features, modo=args.modo,
+                                   dtype=args.dtype)
+        registro['matriz'] = X
+    with informe.etapa('entrenar clasificador'):
+        modelo.entrenar_clasificador(X, etiquetas)
+    informe.agregar_matriz('  parámetros NB', modelo.modelo_clasificacion.feature_log_prob_)
+    with informe.etapa('clustering') as registro:
+        modelo.entrenar_clustering(X, n_clusters=args.clusters)
+        registro['matriz'] = modelo.modelo_clustering.cluster_centers_
+
+    print(f"\n📊 INFORME DE MEMORIA ({args.dtype}, {args.documentos} documentos, modo {args.modo})")
+    informe.mostrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--documentos', type=int, default=20_000)
+    parser.add_argument('--max-features', type=int, default=20_000)
+    parser.add_argument('--modo', choices=['tfidf', 'hashing', 'incremental'], default='tfidf')
+    parser.add_argument('--clusters', type=int, default=8)
+    parser.add_argument('--dtype', choices=['float64', 'float32'],
+                        help='Ejecutar solo este dtype en el proceso actual')
+    args = parser.parse_args()
+
+    if args.dtype:
+        ejecutar(args)
+        return
+
+    for dtype in ('float64', 'float32'):
+        subprocess.run([sys.executable, os.path.abspath(__file__), *sys.argv[1:], '--dtype', dtype],
+                       check=True)
+
+
+if __name__ == "__main__":
+    main()
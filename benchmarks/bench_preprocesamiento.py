@@ -0,0 +1,96 @@
+"""
+=======================================================
+BENCHMARK: Preprocesamiento (pipeline NLTK vs pasada única)
+=======================================================
+Compara el tiempo por documento de los dos modos de PreprocesadorTexto
+('nltk': limpiar_texto + word_tokenize; 'rapido': una sola pasada con
+expresiones precompiladas), con y sin caché de raíces, sobre los datasets
+del repositorio y el texto de las páginas de benchmarks/fixtures/, y
+comprueba que ambos modos producen exactamente la misma salida.
+
+Uso:
+    python benchmarks/bench_preprocesamiento.py [--repeticiones 5]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'src'))
+
+from preprocessing import PreprocesadorTexto
+from scraping import extraer_con_lxml
+
+
+DATASETS = [
+    os.path.join(current_dir, '..', 'data', 'raw', 'contenido_extraido.csv'),
+    os.path.join(current_dir, '..', 'data', 'processed', 'dataset_procesado.csv'),
+]
+
+
+def cargar_textos():
+    """Textos de los datasets y de las páginas de fixtures"""
+    textos = []
+    for ruta in DATASETS:
+        if os.path.exists(ruta):
+            textos.extend(pd.read_csv(ruta)['texto'].dropna().tolist())
+
+    for ruta in sorted(glob.glob(os.path.join(current_dir, 'fixtures', '*.html'))):
+        with open(ruta, 'rb') as f:
+            _, texto = extraer_con_lxml(f.read())
+        textos.append(texto)
+
+    return textos
+
+
+def medir(prep, textos, repeticiones):
+    """Devuelve (milisegundos por documento, salida de la última pasada)"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        salida = [prep.procesar_texto(texto) for texto in textos]
+    ms = (time.perf_counter() - inicio) * 1000 / (repeticiones * len(textos))
+    return ms, salida
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    textos = cargar_textos()
+    if not textos:
+        print("❌ No se encontraron textos para el benchmark")
+        sys.exit(1)
+
+    palabras = sum(len(texto.split()) for texto in textos)
+    print(f"📚 {len(textos)} documentos, {palabras} palabras\n")
+    print(f"{'Modo':<10}{'Caché raíces':>14}{'ms/doc':>10}{'aceleración':>14}")
+    print("-" * 48)
+
+    referencia = None
+    tiempo_base = None
+    for tam_cache in (0, 100_000):
+        for modo in ('nltk', 'rapido'):
+            prep = PreprocesadorTexto(modo=modo, tam_cache_stems=tam_cache)
+            ms, salida = medir(prep, textos, args.repeticiones)
+
+            if referencia is None:
+                referencia, tiempo_base = salida, ms
+            elif salida != referencia:
+                print(f"❌ El modo '{modo}' (caché {tam_cache}) no produce la misma salida")
+                sys.exit(1)
+
+            cache = 'sí' if tam_cache else 'no'
+            print(f"{modo:<10}{cache:>14}{ms:>10.3f}{tiempo_base / ms:>13.1f}x")
+
+    print("\n✅ Todos los modos producen la misma salida en todos los documentos")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,7 @@ sys.path.insert(0, src_path)
 
 from scraping import WebScraper
 from preprocessing import PreprocesadorTexto
+from cache_preprocesado import CachePreprocesado
 from model import ModeloAprendizajeWeb
 import pandas as pd
 import numpy as np
@@ -121,13 +122,14 @@ def main():
     imprimir_seccion("🔧 PASO 2: PREPROCESAMIENTO DE TEXTO")
     
     print("Inicializando preprocesador...")
-    prep = PreprocesadorTexto()
+    prep = PreprocesadorTexto(
+        ruta_cache_stems='models/cache_stems.json',
+        cache_textos=CachePreprocesado('data/processed/cache_preprocesado.sqlite')
+    )
     
     print("Procesando textos...")
-    textos_procesados = []
-    for texto in df['texto']:
-        texto_proc = prep.procesar_texto(texto)
-        textos_procesados.append(texto_proc)
+    textos_procesados = prep.procesar_textos(df['texto'], n_jobs=1)
+    prep.guardar_cache_stems()
     
     df['texto_procesado'] = textos_procesados
     print(f"✅ {len(textos_procesados)} textos procesados")
@@ -260,8 +262,8 @@ def main():
     df.to_csv('data/processed/dataset_procesado.csv', index=False, encoding='utf-8')
     print("✅ Dataset procesado guardado en: data/processed/dataset_procesado.csv")
     
-    # Guardar modelo
-    modelo.guardar_modelo('models/clasificador_final.pkl')
+    # Guardar modelo junto con el preprocesador y el vectorizador
+    modelo.guardar_paquete('models/paquete_final', prep)
     
     # Guardar resumen de métricas
     resumen = pd.DataFrame({
@@ -0,0 +1,186 @@
+"""
+=======================================================
+MÓDULO: ALMACÉN DE TÉRMINOS - Conteos por documento en disco
+=======================================================
+Este módulo guarda, una sola vez, los conteos de unigramas y bigramas
+de cada documento (matriz dispersa CSR) junto con el vocabulario. A
+partir de ellos se obtienen matrices TF-IDF con distintos min_df, max_df,
+max_features, rango de n-gramas o ponderación sin volver a tokenizar el
+corpus, con el mismo resultado que TfidfVectorizer
+"""
+
+import json
+import os
+from numbers import Integral
+from typing import List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import (CountVectorizer, TfidfTransformer,
+                                             TfidfVectorizer)
+
+
+VERSION_ALMACEN = 1
+
+
+class AlmacenTerminos:
+    """Conteos de n-gramas por documento reutilizables entre vectorizaciones"""
+
+    def __init__(self, conteos: sp.csr_matrix, terminos: List[str],
+                 ngram_range: Tuple[int, int] = (1, 2)):
+        """
+        Args:
+            conteos: Matriz CSR documentos x términos con los conteos
+            terminos: Término de cada columna, en orden alfabético
+            ngram_range: Rango de n-gramas con el que se contó
+        """
+        self.conteos = conteos
+        self.terminos = np.asarray(terminos, dtype=object)
+        self.ngram_range = tuple(ngram_range)
+        # Orden del n-grama de cada columna (los tokens no contienen espacios)
+        self.orden_ngrama = np.fromiter((t.count(' ') + 1 for t in self.terminos),
+                                        dtype=np.int8, count=len(self.terminos))
+
+    @classmethod
+    def construir(cls, textos: List[str], ngram_range: Tuple[int, int] = (1, 2)) -> 'AlmacenTerminos':
+        """
+        Cuenta los n-gramas de los textos (la única tokenización necesaria)
+
+        Args:
+            textos: Textos procesados
+            ngram_range: Rango de n-gramas más amplio que se vaya a usar
+
+        Returns:
+            AlmacenTerminos con los conteos
+        """
+        print(f"🧮 Contando n-gramas de {len(textos)} documentos...")
+        contador = CountVectorizer(ngram_range=ngram_range, dtype=np.int32)
+        conteos = contador.fit_transform(textos).tocsr()
+        almacen = cls(conteos, contador.get_feature_names_out(), ngram_range)
+        print(f"✅ {conteos.shape[1]} términos, {conteos.nnz} conteos distintos de cero")
+        return almacen
+
+    def guardar(self, directorio: str):
+        """
+        Guarda los conteos (NPZ comprimido), los términos y un manifiesto
+
+        Args:
+            directorio: Carpeta de destino (se crea si no existe)
+        """
+        os.makedirs(directorio, exist_ok=True)
+        sp.save_npz(os.path.join(directorio, 'conteos.npz'), self.conteos, compressed=True)
+        with open(os.path.join(directorio, 'terminos.txt'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.terminos))
+        with open(os.path.join(directorio, 'manifiesto.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': VERSION_ALMACEN,
+                'ngram_range': list(self.ngram_range),
+                'n_documentos': self.conteos.shape[0],
+                'n_terminos': self.conteos.shape[1]
+            }, f, indent=2)
+        print(f"💾 Almacén de términos guardado en: {directorio}")
+
+    @classmethod
+    def cargar(cls, directorio: str) -> 'AlmacenTerminos':
+        """Carga un almacén guardado con `guardar`"""
+        with open(os.path.join(directorio, 'manifiesto.json'), encoding='utf-8') as f:
+            manifiesto = json.load(f)
+        if manifiesto['version'] != VERSION_ALMACEN:
+            raise ValueError(f"Versión de almacén no soportada: {manifiesto['version']}")
+
+        conteos = sp.load_npz(os.path.join(directorio, 'conteos.npz')).tocsr()
+        with open(os.path.join(directorio, 'terminos.txt'), encoding='utf-8') as f:
+            terminos = f.read().split('\n') if manifiesto['n_terminos'] else []
+        return cls(conteos, terminos, manifiesto['ngram_range'])
+
+    def seleccionar(self, min_df=1, max_df=1.0, max_features: Optional[int] = None,
+                    ngram_range: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """
+        Columnas que conservaría TfidfVectorizer con esos parámetros
+
+        Reproduce la poda de scikit-learn (incluido el desempate de
+        max_features), así que el resultado es idéntico al de ajustar un
+        vectorizador sobre los mismos textos.
+
+        Returns:
+            Índices de las columnas seleccionadas, en orden alfabético
+        """
+        columnas = np.arange(self.conteos.shape[1])
+        if ngram_range is not None:
+            minimo, maximo = ngram_range
+            if minimo < self.ngram_range[0] or maximo > self.ngram_range[1]:
+                raise ValueError(f"ngram_range {ngram_range} fuera del rango almacenado "
+                                 f"{self.ngram_range}")
+            columnas = np.flatnonzero((self.orden_ngrama >= minimo) & (self.orden_ngrama <= maximo))
+
+        conteos = self.conteos[:, columnas]
+        n_documentos = conteos.shape[0]
+        max_docs = max_df if isinstance(max_df, Integral) else max_df * n_documentos
+        min_docs = min_df if isinstance(min_df, Integral) else min_df * n_documentos
+        if max_docs < min_docs:
+            raise ValueError("max_df corresponde a menos documentos que min_df")
+
+        dfs = np.bincount(conteos.indices, minlength=conteos.shape[1])
+        mascara = (dfs <= max_docs) & (dfs >= min_docs)
+        if max_features is not None and mascara.sum() > max_features:
+            tfs = np.asarray(conteos.sum(axis=0, dtype=np.int64)).ravel()
+            elegidos = (-tfs[mascara]).argsort()[:max_features]
+            nueva = np.zeros(len(dfs), dtype=bool)
+            nueva[np.where(mascara)[0][elegidos]] = True
+            mascara = nueva
+
+        if not mascara.any():
+            raise ValueError("Tras la poda no queda ningún término: reducir min_df o aumentar max_df")
+        return columnas[mascara]
+
+    def tfidf(self, min_df=2, max_df=0.8, max_features: Optional[int] = None,
+              ngram_range: Optional[Tuple[int, int]] = None, norm: str = 'l2',
+              use_idf: bool = True, smooth_idf: bool = True,
+              sublinear_tf: bool = False, dtype=np.float64) -> Tuple[sp.csr_matrix, TfidfVectorizer]:
+        """
+        Obtiene la matriz TF-IDF con los parámetros indicados
+
+        Los argumentos tienen el mismo significado que en TfidfVectorizer
+        (dtype: np.float64 o np.float32).
+
+        Returns:
+            Tupla (matriz CSR, TfidfVectorizer ya ajustado para transformar
+            textos nuevos con el mismo vocabulario e IDF)
+        """
+        columnas = self.seleccionar(min_df, max_df, max_features, ngram_range)
+        dtype = np.dtype(dtype).type
+        conteos = self.conteos[:, columnas].astype(dtype)
+
+        transformador = TfidfTransformer(norm=norm, use_idf=use_idf, smooth_idf=smooth_idf,
+                                         sublinear_tf=sublinear_tf)
+        vectores = transformador.fit_transform(conteos).tocsr()
+
+        vocabulario = {termino: i for i, termino in enumerate(self.terminos[columnas])}
+        vectorizador = TfidfVectorizer(vocabulary=vocabulario,
+                                       ngram_range=ngram_range or self.ngram_range,
+                                       norm=norm, use_idf=use_idf, smooth_idf=smooth_idf,
+                                       sublinear_tf=sublinear_tf, dtype=dtype)
+        if use_idf:
+            vectorizador.idf_ = transformador.idf_
+        else:
+            # Sin IDF no hay nada que aprender: basta con un ajuste trivial
+            vectorizador.fit([''])
+        return vectores, vectorizador
+
+
+# ========================================
+# EJEMPLO DE USO
+# ========================================
+if __name__ == "__main__":
+    import pandas as pd
+
+    df = pd.read_csv('data/processed/dataset_procesado.csv')
+    almacen = AlmacenTerminos.construir(df['texto_procesado'].tolist())
+    almacen.guardar('data/processed/almacen_terminos')
+
+    # Probar varias configuraciones sin volver a tokenizar
+    almacen = AlmacenTerminos.cargar('data/processed/almacen_terminos')
+    for min_df, max_features, ngram_range in [(1, None, (1, 1)), (2, 100, (1, 2)), (2, 50, (2, 2))]:
+        X, _ = almacen.tfidf(min_df=min_df, max_features=max_features, ngram_range=ngram_range)
+        print(f"   min_df={min_df}, max_features={max_features}, ngram_range={ngram_range}: "
+              f"{X.shape[0]} x {X.shape[1]}")
@@ -16,6 +16,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from scraping import WebScraper
 from preprocessing import PreprocesadorTexto
+from cache_preprocesado import CachePreprocesado
 from model import ModeloAprendizajeWeb
 import plotly.express as px
 import plotly.graph_objects as go
@@ -68,7 +69,12 @@ def inicializar_sesion():
     if 'scraper' not in st.session_state:
         st.session_state.scraper = WebScraper()
     if 'preprocesador' not in st.session_state:
-        st.session_state.preprocesador = PreprocesadorTexto()
+        # Los textos ya procesados en clics o sesiones anteriores se reutilizan
+        ruta_cache = os.path.join(os.path.dirname(__file__), '..', 'data', 'processed',
+                                  'cache_preprocesado.sqlite')
+        st.session_state.preprocesador = PreprocesadorTexto(
+            cache_textos=CachePreprocesado(ruta_cache)
+        )
     if 'modelo' not in st.session_state:
         st.session_state.modelo = ModeloAprendizajeWeb()
     if 'datos' not in st.session_state:
@@ -193,7 +199,7 @@ def pagina_extraccion():
                                     # Preprocesar si no está ya procesado
                                     if 'texto_procesado' not in df.columns:
                                         prep = PreprocesadorTexto()
-                                        df['texto_procesado'] = df['texto'].apply(prep.procesar_texto)
+                                        df['texto_procesado'] = prep.procesar_textos(df['texto'], n_jobs=1)
                                     
                                     # Categorizar
                                     categorizador = CategorizadorAutomatico()
@@ -396,11 +402,9 @@ def pagina_entrenamiento():
         with st.spinner("Procesando textos..."):
             prep = st.session_state.preprocesador
             
-            # Procesar cada texto
-            textos_procesados = []
-            for texto in st.session_state.datos['texto']:
-                texto_proc = prep.procesar_texto(texto)
-                textos_procesados.append(texto_proc)
+            # Procesar en el proceso de Streamlit: un pool de procesos
+            # arrancado en cada ejecución del script cuesta más de lo que ahorra
+            textos_procesados = prep.procesar_textos(st.session_state.datos['texto'], n_jobs=1)
             
             st.session_state.datos['texto_procesado'] = textos_procesados
             
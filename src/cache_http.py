@@ -0,0 +1,176 @@
+"""
+=======================================================
+MÓDULO: CACHÉ HTTP - Respuestas persistentes en disco
+=======================================================
+Este módulo guarda en disco las páginas descargadas por el scraper
+junto con su ETag y Last-Modified, para que las siguientes ejecuciones
+hagan peticiones condicionales y reutilicen la extracción si el
+servidor responde 304 (Not Modified)
+"""
+
+import json
+import time
+from typing import Dict, Optional
+
+from cache_sqlite import CacheSQLite
+
+
+class CacheHTTP(CacheSQLite):
+    """Caché de respuestas HTTP en SQLite con expulsión LRU y TTL"""
+
+    COLUMNAS = """
+        url TEXT PRIMARY KEY,
+        cuerpo BLOB,
+        etag TEXT,
+        last_modified TEXT,
+        resultado TEXT,
+        tam INTEGER,
+        tiempo_parseo REAL,
+        validado REAL,
+        ultimo_acceso REAL
+    """
+
+    def __init__(self, ruta: str = 'data/raw/cache_http.sqlite',
+                 tam_max_mb: float = 500, ttl_segundos: float = 30 * 24 * 3600):
+        """
+        Args:
+            ruta: Archivo SQLite donde se guarda la caché
+            tam_max_mb: Tamaño máximo de la caché (MB). Al superarlo se
+                eliminan las entradas usadas hace más tiempo
+            ttl_segundos: Antigüedad máxima de una entrada desde su última
+                validación con el servidor. Las entradas caducadas se descartan
+        """
+        super().__init__(ruta, tam_max_mb)
+        self.ttl = ttl_segundos
+
+        # Contadores de la sesión actual
+        self.aciertos = 0
+        self.fallos = 0
+        self.bytes_ahorrados = 0
+        self.segundos_parseo_ahorrados = 0.0
+
+    def obtener(self, url: str) -> Optional[Dict]:
+        """
+        Busca una entrada vigente para la URL
+
+        Args:
+            url: URL a buscar
+
+        Returns:
+            Diccionario con etag, last_modified, resultado, tam y
+            tiempo_parseo, o None si no hay entrada o ha caducado
+        """
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT etag, last_modified, resultado, tam, tiempo_parseo, validado "
+                "FROM entradas WHERE url = ?", (url,)
+            ).fetchone()
+
+            if fila is None:
+                return None
+
+            etag, last_modified, resultado, tam, tiempo_parseo, validado = fila
+            if time.time() - validado > self.ttl:
+                self._eliminar([(url, tam)])
+                self._conexion.commit()
+                return None
+
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'resultado': json.loads(resultado),
+            'tam': tam,
+            'tiempo_parseo': tiempo_parseo
+        }
+
+    def obtener_cuerpo(self, url: str) -> Optional[bytes]:
+        """Devuelve el contenido guardado de una URL, o None si no está"""
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT cuerpo FROM entradas WHERE url = ?", (url,)
+            ).fetchone()
+        return fila[0] if fila else None
+
+    def cabeceras_condicionales(self, entrada: Dict) -> Dict[str, str]:
+        """Construye las cabeceras If-None-Match / If-Modified-Since de una entrada"""
+        cabeceras = {}
+        if entrada.get('etag'):
+            cabeceras['If-None-Match'] = entrada['etag']
+        if entrada.get('last_modified'):
+            cabeceras['If-Modified-Since'] = entrada['last_modified']
+        return cabeceras
+
+    def registrar_acierto(self, url: str, entrada: Dict):
+        """
+        Marca una entrada como revalidada tras recibir un 304
+
+        Args:
+            url: URL revalidada
+            entrada: Entrada devuelta por `obtener`
+        """
+        ahora = time.time()
+        with self._lock:
+            self._conexion.execute(
+                "UPDATE entradas SET validado = ?, ultimo_acceso = ? WHERE url = ?",
+                (ahora, ahora, url)
+            )
+            self._conexion.commit()
+            self.aciertos += 1
+            self.bytes_ahorrados += entrada['tam']
+            self.segundos_parseo_ahorrados += entrada['tiempo_parseo']
+
+    def registrar_fallo(self):
+        """Cuenta una descarga completa que no pudo servirse desde la caché"""
+        with self._lock:
+            self.fallos += 1
+
+    def guardar(self, url: str, cuerpo: bytes, etag: Optional[str],
+                last_modified: Optional[str], resultado: Dict, tiempo_parseo: float):
+        """
+        Guarda (o reemplaza) la respuesta de una URL
+
+        Solo se guardan respuestas con ETag o Last-Modified, ya que sin
+        ellas no es posible hacer peticiones condicionales.
+
+        Args:
+            url: URL descargada
+            cuerpo: Contenido de la respuesta
+            etag: Cabecera ETag (o None)
+            last_modified: Cabecera Last-Modified (o None)
+            resultado: Extracción obtenida de la página
+            tiempo_parseo: Segundos que tomó la extracción
+        """
+        if not etag and not last_modified:
+            return
+
+        resultado_json = json.dumps(resultado, ensure_ascii=False)
+        tam = len(cuerpo) + len(resultado_json.encode('utf-8'))
+        if tam > self.tam_max:
+            return
+
+        ahora = time.time()
+        with self._lock:
+            self._insertar([(url, cuerpo, etag, last_modified, resultado_json, tam,
+                             tiempo_parseo, ahora, ahora)], [tam])
+            self._conexion.commit()
+
+    def estadisticas(self) -> Dict:
+        """
+        Resume el uso de la caché en la sesión actual
+
+        Returns:
+            Diccionario con aciertos, fallos, tasa de acierto, bytes y
+            segundos de parseo ahorrados, número de entradas y tamaño en disco
+        """
+        entradas, tam = self._contar()
+
+        total = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_acierto': self.aciertos / total if total else 0.0,
+            'bytes_ahorrados': self.bytes_ahorrados,
+            'segundos_parseo_ahorrados': self.segundos_parseo_ahorrados,
+            'entradas': entradas,
+            'tam_bytes': tam
+        }
@@ -0,0 +1,185 @@
+"""
+=======================================================
+MÓDULO: CACHÉ DE PREPROCESAMIENTO - Textos procesados en disco
+=======================================================
+Este módulo guarda en disco el resultado de PreprocesadorTexto para
+cada documento, indexado por un hash del texto original y de la
+configuración del preprocesador, de modo que las siguientes ejecuciones
+solo procesan los documentos nuevos
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+from cache_sqlite import TAM_CONSULTA, CacheSQLite
+
+# Accesos acumulados en memoria antes de escribirlos aunque no haya guardados
+MAX_ACCESOS_PENDIENTES = 10_000
+
+
+class CachePreprocesado(CacheSQLite):
+    """Caché de textos preprocesados en SQLite con expulsión LRU"""
+
+    COLUMNAS = """
+        clave BLOB PRIMARY KEY,
+        procesado TEXT,
+        tam INTEGER,
+        ultimo_acceso REAL
+    """
+
+    def __init__(self, ruta: str = 'data/processed/cache_preprocesado.sqlite',
+                 tam_max_mb: float = 200):
+        """
+        Args:
+            ruta: Archivo SQLite donde se guarda la caché
+            tam_max_mb: Tamaño máximo de la caché (MB). Al superarlo se
+                eliminan las entradas usadas hace más tiempo
+        """
+        super().__init__(ruta, tam_max_mb)
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS meta (nombre TEXT PRIMARY KEY, valor TEXT)"
+        )
+        self._conexion.commit()
+
+        # Último acceso de cada clave leída, pendiente de escribir en disco.
+        # Se vuelca en la misma transacción del siguiente guardado (antes de
+        # expulsar), al cerrar o al acumular MAX_ACCESOS_PENDIENTES claves
+        self._accesos_pendientes: Dict[bytes, float] = {}
+
+        # Contadores de la sesión actual
+        self.aciertos = 0
+        self.fallos = 0
+
+    def comprobar_version(self, version: str) -> bool:
+        """
+        Vacía la caché si se creó con otra versión del pipeline
+
+        Args:
+            version: Versión actual del pipeline de preprocesamiento
+
+        Returns:
+            True si la caché se ha invalidado
+        """
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT valor FROM meta WHERE nombre = 'version'"
+            ).fetchone()
+            if fila is not None and fila[0] == version:
+                return False
+
+            if fila is not None:
+                self._borrar_todo()
+                self._accesos_pendientes.clear()
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,)
+            )
+            self._conexion.commit()
+
+        if fila is not None:
+            print(f"♻️  Caché de preprocesamiento invalidada (versión {fila[0]} -> {version})")
+        return fila is not None
+
+    def obtener_varios(self, claves: List[bytes]) -> Dict[bytes, str]:
+        """
+        Busca los textos procesados de varias claves
+
+        La fecha de acceso de las claves encontradas se anota en memoria y
+        se escribe más tarde, para que las lecturas no hagan un commit.
+
+        Args:
+            claves: Claves de los documentos
+
+        Returns:
+            Diccionario clave -> texto procesado con las claves encontradas
+        """
+        distintas = list(dict.fromkeys(claves))
+        encontrados = {}
+        ahora = time.time()
+
+        with self._lock:
+            for i in range(0, len(distintas), TAM_CONSULTA):
+                bloque = distintas[i:i + TAM_CONSULTA]
+                marcas = ','.join('?' * len(bloque))
+                encontrados.update(self._conexion.execute(
+                    f"SELECT clave, procesado FROM entradas WHERE clave IN ({marcas})", bloque
+                ).fetchall())
+
+            self._accesos_pendientes.update(dict.fromkeys(encontrados, ahora))
+            if len(self._accesos_pendientes) >= MAX_ACCESOS_PENDIENTES:
+                self._volcar_accesos()
+                self._conexion.commit()
+
+            self.aciertos += sum(1 for clave in claves if clave in encontrados)
+            self.fallos += sum(1 for clave in claves if clave not in encontrados)
+
+        return encontrados
+
+    def obtener(self, clave: bytes) -> Optional[str]:
+        """Devuelve el texto procesado de una clave, o None si no está"""
+        return self.obtener_varios([clave]).get(clave)
+
+    def guardar_varios(self, entradas: List[Tuple[bytes, str]]):
+        """
+        Guarda (o reemplaza) varios textos procesados
+
+        Args:
+            entradas: Lista de tuplas (clave, texto procesado)
+        """
+        if not entradas:
+            return
+
+        ahora = time.time()
+        filas = [(clave, procesado, len(clave) + len(procesado.encode('utf-8')), ahora)
+                 for clave, procesado in dict(entradas).items()]
+
+        with self._lock:
+            # Los accesos pendientes cuentan para decidir qué se expulsa
+            self._volcar_accesos()
+            self._insertar(filas, [fila[2] for fila in filas])
+            self._conexion.commit()
+
+    def guardar(self, clave: bytes, procesado: str):
+        """Guarda el texto procesado de una clave"""
+        self.guardar_varios([(clave, procesado)])
+
+    def _volcar_accesos(self):
+        """Escribe los accesos pendientes (sin commit; se llama con el lock)"""
+        if not self._accesos_pendientes:
+            return
+        self._conexion.executemany(
+            "UPDATE entradas SET ultimo_acceso = ? WHERE clave = ?",
+            [(ahora, clave) for clave, ahora in self._accesos_pendientes.items()]
+        )
+        self._accesos_pendientes.clear()
+
+    def estadisticas(self) -> Dict:
+        """
+        Resume el uso de la caché en la sesión actual
+
+        Returns:
+            Diccionario con aciertos, fallos, tasa de acierto, número de
+            entradas y tamaño en disco
+        """
+        entradas, tam = self._contar()
+
+        total = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_acierto': self.aciertos / total if total else 0.0,
+            'entradas': entradas,
+            'tam_bytes': tam
+        }
+
+    def vaciar(self):
+        """Elimina todas las entradas de la caché"""
+        super().vaciar()
+        with self._lock:
+            self._accesos_pendientes.clear()
+
+    def cerrar(self):
+        """Escribe los accesos pendientes y cierra la conexión con la base de datos"""
+        with self._lock:
+            self._volcar_accesos()
+            self._conexion.commit()
+        super().cerrar()
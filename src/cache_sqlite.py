@@ -0,0 +1,130 @@
+"""
+=======================================================
+MÓDULO: CACHÉ SQLITE - Base común de las cachés en disco
+=======================================================
+Este módulo reúne lo que comparten CacheHTTP y CachePreprocesado: una
+tabla 'entradas' en SQLite con el tamaño y el último acceso de cada
+entrada, el tamaño total mantenido en memoria y la expulsión LRU al
+superar el tamaño máximo
+"""
+
+import sqlite3
+import threading
+from typing import Iterable, List, Sequence, Tuple
+
+
+# Máximo de parámetros por consulta (límite de SQLite en versiones antiguas)
+TAM_CONSULTA = 500
+
+
+class CacheSQLite:
+    """
+    Base de las cachés en SQLite con expulsión LRU por tamaño
+
+    Las subclases definen COLUMNAS (la primera es la clave y deben
+    incluir 'tam' y 'ultimo_acceso') y acceden a la base con self._lock
+    adquirido.
+    """
+
+    COLUMNAS = ''
+
+    def __init__(self, ruta: str, tam_max_mb: float):
+        """
+        Args:
+            ruta: Archivo SQLite donde se guarda la caché
+            tam_max_mb: Tamaño máximo de la caché (MB). Al superarlo se
+                eliminan las entradas usadas hace más tiempo
+        """
+        self.ruta = ruta
+        self.tam_max = int(tam_max_mb * 1024 * 1024)
+        self._clave = self.COLUMNAS.split()[0]
+
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.execute(f"CREATE TABLE IF NOT EXISTS entradas ({self.COLUMNAS})")
+        self._conexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ultimo_acceso ON entradas (ultimo_acceso)"
+        )
+        self._conexion.commit()
+
+        # Tamaño total de las entradas, mantenido al insertar y borrar para
+        # no sumar toda la tabla en cada guardado
+        self._tam_total = self._sumar_tam()
+
+    def _sumar_tam(self) -> int:
+        """Suma el tamaño de todas las entradas (recorre la tabla completa)"""
+        return self._conexion.execute(
+            "SELECT COALESCE(SUM(tam), 0) FROM entradas"
+        ).fetchone()[0]
+
+    def _tam_de(self, claves: Sequence) -> int:
+        """Tamaño de las entradas existentes con esas claves"""
+        total = 0
+        for i in range(0, len(claves), TAM_CONSULTA):
+            bloque = list(claves[i:i + TAM_CONSULTA])
+            marcas = ','.join('?' * len(bloque))
+            total += self._conexion.execute(
+                f"SELECT COALESCE(SUM(tam), 0) FROM entradas WHERE {self._clave} IN ({marcas})",
+                bloque
+            ).fetchone()[0]
+        return total
+
+    def _insertar(self, filas: List[Tuple], tams: Iterable[int]):
+        """
+        Inserta o reemplaza filas (con la clave primero), actualiza el
+        tamaño total y expulsa si hace falta. No hace commit
+        """
+        reemplazados = self._tam_de([fila[0] for fila in filas])
+        marcas = ','.join('?' * len(filas[0]))
+        self._conexion.executemany(f"INSERT OR REPLACE INTO entradas VALUES ({marcas})", filas)
+        self._tam_total += sum(tams) - reemplazados
+        self._expulsar()
+
+    def _eliminar(self, entradas: List[Tuple]):
+        """Elimina entradas dadas como tuplas (clave, tam). No hace commit"""
+        self._conexion.executemany(f"DELETE FROM entradas WHERE {self._clave} = ?",
+                                   [(clave,) for clave, _ in entradas])
+        self._tam_total -= sum(tam for _, tam in entradas)
+
+    def _expulsar(self):
+        """Elimina las entradas menos usadas hasta respetar el tamaño máximo"""
+        if self._tam_total <= self.tam_max:
+            return
+
+        # Solo se recorre la tabla cuando hay que expulsar; de paso se corrige
+        # el total por si otro proceso ha escrito en el mismo archivo
+        self._tam_total = self._sumar_tam()
+        cursor = self._conexion.execute(
+            f"SELECT {self._clave}, tam FROM entradas ORDER BY ultimo_acceso"
+        )
+        eliminar = []
+        exceso = self._tam_total - self.tam_max
+        for clave, tam in cursor:
+            if exceso <= 0:
+                break
+            eliminar.append((clave, tam))
+            exceso -= tam
+        self._eliminar(eliminar)
+
+    def _borrar_todo(self):
+        """Elimina todas las entradas. No hace commit"""
+        self._conexion.execute("DELETE FROM entradas")
+        self._tam_total = 0
+
+    def _contar(self) -> Tuple[int, int]:
+        """Número de entradas y tamaño total en disco"""
+        with self._lock:
+            return self._conexion.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tam), 0) FROM entradas"
+            ).fetchone()
+
+    def vaciar(self):
+        """Elimina todas las entradas de la caché"""
+        with self._lock:
+            self._borrar_todo()
+            self._conexion.commit()
+
+    def cerrar(self):
+        """Cierra la conexión con la base de datos"""
+        with self._lock:
+            self._conexion.close()
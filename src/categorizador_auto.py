@@ -10,11 +10,11 @@ Este módulo identifica categorías automáticamente usando:
 
 import numpy as np
 import pandas as pd
-from sklearn.cluster import KMeans
-from sklearn.feature_extraction.text import TfidfVectorizer
 from collections import Counter
 import re
 
+from clustering import CacheModelos, barrido_k, crear_kmeans
+
 
 class CategorizadorAutomatico:
     """Clase para identificar categorías automáticamente"""
@@ -23,6 +23,9 @@ class CategorizadorAutomatico:
         self.clusters = None
         self.keywords_por_cluster = {}
         self.etiquetas_sugeridas = {}
+        self.curva_k = None
+        # Modelos ajustados en barridos de k anteriores (ver clustering.barrido_k)
+        self.cache_modelos = CacheModelos()
         
         # Diccionario de palabras clave por dominio
         self.dominios = {
@@ -125,7 +128,9 @@ class CategorizadorAutomatico:
         
         return pd.DataFrame(resultados)
     
-    def clustering_con_etiquetas(self, X, n_clusters='auto', textos_procesados=None):
+    def clustering_con_etiquetas(self, X, n_clusters='auto', textos_procesados=None,
+                                 algoritmo='kmeans', tam_lote=1024, k_max=10, presupuesto_s=30,
+                                 n_jobs=1):
         """
         Realiza clustering y sugiere etiquetas para cada grupo
         
@@ -133,25 +138,36 @@ class CategorizadorAutomatico:
             X: Matriz de características (TF-IDF)
             n_clusters: Número de clusters o 'auto' para detección automática
             textos_procesados: Textos procesados para análisis de keywords
+            algoritmo: 'kmeans', 'minibatch' (MiniBatchKMeans, para corpus grandes)
+                o 'esferico' (similitud coseno, recomendado para TF-IDF)
+            tam_lote: Documentos por minilote (solo 'minibatch')
+            k_max: Mayor número de clusters probado con 'auto'
+            presupuesto_s: Segundos para probar valores de k con 'auto'
+            n_jobs: Procesos del barrido de k (1 = en el proceso actual,
+                adecuado para Streamlit; -1 = todos los núcleos en corpus grandes)
             
         Returns:
             Dict con clusters, etiquetas sugeridas y keywords
         """
         # Determinar número óptimo de clusters si es 'auto'
+        if n_clusters == 'auto' and X.shape[0] < 4:
+            # Con menos de 4 documentos solo cabe k = 2
+            n_clusters = 2
+        
         if n_clusters == 'auto':
-            n_docs = X.shape[0]
-            if n_docs < 6:
-                n_clusters = 2
-            elif n_docs < 15:
-                n_clusters = 3
-            else:
-                n_clusters = min(5, n_docs // 5)
+            # Probar varios k y quedarse con el de mejor Silhouette
+            barrido = barrido_k(X, range(2, k_max + 1), algoritmo, tam_lote,
+                                presupuesto_s=presupuesto_s, n_jobs=n_jobs,
+                                cache=self.cache_modelos)
+            self.curva_k = barrido['curva']
+            n_clusters = barrido['mejor_k']
+            clusters = barrido['modelo'].labels_
             
             print(f"📊 Clusters detectados automáticamente: {n_clusters}")
-        
-        # Realizar clustering
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-        clusters = kmeans.fit_predict(X)
+        else:
+            # Realizar clustering
+            kmeans = crear_kmeans(n_clusters, algoritmo, tam_lote)
+            clusters = kmeans.fit_predict(X)
         
         self.clusters = clusters
         
@@ -0,0 +1,594 @@
+"""
+=======================================================
+MÓDULO: CLUSTERING - Algoritmos y métricas escalables
+=======================================================
+Este módulo reúne lo que comparten ModeloAprendizajeWeb y
+CategorizadorAutomatico para agrupar documentos:
+1. K-Means completo o por minilotes (MiniBatchKMeans) sobre matrices dispersas
+2. Coeficiente Silhouette sobre una muestra estratificada por cluster,
+   con intervalo de confianza (el exacto es O(n²) en tiempo y memoria)
+3. Barrido de k en paralelo, con arranque en caliente desde los centros
+   del k anterior, para elegir el número de grupos
+4. K-Means esférico (similitud coseno) que trabaja directamente sobre la
+   matriz TF-IDF dispersa, con centros normalizados y opcionalmente podados
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Hashable, Iterable, List, Optional
+
+import numpy as np
+
+
+ALGORITMOS = ('kmeans', 'minibatch', 'esferico')
+
+# Por encima de estos documentos el Silhouette exacto es demasiado costoso
+TAM_MUESTRA_SILHOUETTE = 10_000
+
+# Con n_jobs=-1, por debajo de estos documentos el barrido se hace en el
+# proceso actual: arrancar el pool cuesta más que los ajustes
+MIN_DOCUMENTOS_PARALELO = 5000
+
+
+def crear_kmeans(n_clusters: int, algoritmo: str = 'kmeans', tam_lote: int = 1024,
+                 random_state: int = 42, init=None, top_terminos: Optional[int] = None):
+    """
+    Crea el estimador de clustering
+
+    Args:
+        n_clusters: Número de grupos
+        algoritmo: 'kmeans' (K-Means completo, 10 inicializaciones),
+            'minibatch' (MiniBatchKMeans: cada iteración usa solo tam_lote
+            documentos, para corpus grandes) o 'esferico' (KMeansEsferico:
+            similitud coseno sobre la matriz dispersa)
+        tam_lote: Documentos por minilote (solo 'minibatch')
+        random_state: Semilla
+        init: Centros iniciales (n_clusters x características); con ellos
+            se hace una sola inicialización. None = k-means++
+        top_terminos: Términos que conserva cada centro (solo 'esferico';
+            None = todos)
+
+    Returns:
+        Estimador de scikit-learn sin ajustar
+    """
+    inicio = {} if init is None else {'init': init, 'n_init': 1}
+    if algoritmo == 'kmeans':
+        from sklearn.cluster import KMeans
+        return KMeans(**{'n_clusters': n_clusters, 'random_state': random_state, 'n_init': 10,
+                         **inicio})
+    if algoritmo == 'minibatch':
+        from sklearn.cluster import MiniBatchKMeans
+        return MiniBatchKMeans(**{'n_clusters': n_clusters, 'batch_size': tam_lote, 'n_init': 3,
+                                  'random_state': random_state, **inicio})
+    if algoritmo == 'esferico':
+        return KMeansEsferico(**{'n_clusters': n_clusters, 'top_terminos': top_terminos,
+                                 'random_state': random_state, **inicio})
+    raise ValueError(f"algoritmo debe ser uno de {ALGORITMOS}")
+
+
+def muestra_estratificada(etiquetas: np.ndarray, tam_muestra: int,
+                          random_state: int = 42) -> np.ndarray:
+    """
+    Índices de una muestra con la misma proporción de cada cluster
+
+    Cada cluster aporta al menos 2 documentos (si los tiene), para que
+    su Silhouette se pueda calcular.
+
+    Returns:
+        Índices ordenados de la muestra
+    """
+    rng = np.random.default_rng(random_state)
+    grupos, conteos = np.unique(etiquetas, return_counts=True)
+    cuota = np.maximum(np.round(conteos * tam_muestra / len(etiquetas)).astype(int), 2)
+    cuota = np.minimum(cuota, conteos)
+
+    indices = [rng.choice(np.flatnonzero(etiquetas == grupo), n, replace=False)
+               for grupo, n in zip(grupos, cuota)]
+    return np.sort(np.concatenate(indices))
+
+
+def silhouette_muestreado(X, etiquetas: np.ndarray,
+                          tam_muestra: Optional[int] = TAM_MUESTRA_SILHOUETTE,
+                          confianza: float = 0.95, random_state: int = 42,
+                          metrica: str = 'euclidean') -> Dict:
+    """
+    Coeficiente Silhouette sobre una muestra estratificada
+
+    El intervalo de confianza se obtiene con la aproximación normal a
+    partir de los valores individuales de la muestra. Si la muestra
+    abarca todos los documentos, el resultado es el exacto.
+
+    Args:
+        X: Matriz de características
+        etiquetas: Cluster de cada documento
+        tam_muestra: Documentos de la muestra (None = todos)
+        confianza: Nivel del intervalo (0-1)
+        random_state: Semilla
+        metrica: Distancia entre documentos ('euclidean' o 'cosine')
+
+    Returns:
+        Dict con 'silhouette', 'intervalo' (inferior, superior),
+        'tam_muestra' y 'exacto'
+    """
+    from scipy.stats import norm
+    from sklearn.metrics import silhouette_samples
+
+    etiquetas = np.asarray(etiquetas)
+    n_documentos = len(etiquetas)
+    exacto = tam_muestra is None or tam_muestra >= n_documentos
+
+    if exacto:
+        indices = np.arange(n_documentos)
+    else:
+        indices = muestra_estratificada(etiquetas, tam_muestra, random_state)
+
+    valores = silhouette_samples(X[indices], etiquetas[indices], metric=metrica)
+    media = float(valores.mean())
+    if exacto:
+        intervalo = (media, media)
+    else:
+        margen = norm.ppf(0.5 + confianza / 2) * valores.std(ddof=1) / np.sqrt(len(valores))
+        intervalo = (media - margen, media + margen)
+
+    return {
+        'silhouette': media,
+        'intervalo': intervalo,
+        'tam_muestra': len(indices),
+        'exacto': exacto
+    }
+
+
+def asignar_centros(X, centros, algoritmo: str = 'kmeans') -> np.ndarray:
+    """
+    Centro más cercano a cada documento
+
+    Equivale al predict del modelo que calculó los centros (distancia
+    euclídea, o coseno para el esférico), pero solo necesita los centros:
+    sirve para un modelo cargado de un paquete.
+    """
+    from sklearn.preprocessing import normalize
+
+    if algoritmo == 'esferico':
+        X = normalize(X, norm='l2', copy=True)
+        productos = X @ centros.T
+    else:
+        # argmin ||x - c||² = argmax (2·x·c - ||c||²)
+        normas = np.asarray(centros.multiply(centros).sum(axis=1) if hasattr(centros, 'multiply')
+                            else np.square(centros).sum(axis=1)).ravel()
+        productos = 2 * (X @ centros.T) - normas
+    productos = productos.toarray() if hasattr(productos, 'toarray') else np.asarray(productos)
+    return productos.argmax(axis=1)
+
+
+def metrica_silhouette(algoritmo: str) -> str:
+    """Distancia con la que se evalúa cada algoritmo (coseno para el esférico)"""
+    return 'cosine' if algoritmo == 'esferico' else 'euclidean'
+
+
+def calinski_harabasz(X, etiquetas: np.ndarray) -> float:
+    """
+    Índice de Calinski-Harabasz (dispersión entre grupos / dentro de grupos)
+
+    Equivale a sklearn.metrics.calinski_harabasz_score pero admite
+    matrices dispersas sin convertirlas a densas: la dispersión interna se
+    obtiene de las normas de las filas y de las sumas por cluster.
+    """
+    import scipy.sparse as sp
+
+    etiquetas = np.asarray(etiquetas)
+    grupos, posiciones, conteos = np.unique(etiquetas, return_inverse=True, return_counts=True)
+    n_documentos, n_grupos = len(etiquetas), len(grupos)
+    if not 1 < n_grupos < n_documentos:
+        raise ValueError("Se necesitan entre 2 y n_documentos - 1 clusters")
+
+    # Suma de las filas de cada cluster (n_grupos x características)
+    pertenencia = sp.csr_matrix((np.ones(n_documentos), (posiciones, np.arange(n_documentos))),
+                                shape=(n_grupos, n_documentos))
+    sumas = np.asarray((pertenencia @ X).todense() if sp.issparse(X) else pertenencia @ X,
+                       dtype=np.float64)
+    centros = sumas / conteos[:, None]
+    media = sumas.sum(axis=0) / n_documentos
+
+    normas = X.multiply(X).sum() if sp.issparse(X) else np.square(X).sum()
+    dentro = float(normas) - float((conteos * np.square(centros).sum(axis=1)).sum())
+    entre = float((conteos * np.square(centros - media).sum(axis=1)).sum())
+    if dentro <= 0:
+        return 1.0
+    return entre * (n_documentos - n_grupos) / (dentro * (n_grupos - 1))
+
+
+def huella_matriz(X) -> str:
+    """Huella (blake2b) del contenido de una matriz, para la caché de modelos"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((X.shape, str(X.dtype))).encode())
+    if hasattr(X, 'indptr'):
+        for array in (X.data, X.indices, X.indptr):
+            h.update(np.ascontiguousarray(array).tobytes())
+    else:
+        h.update(np.ascontiguousarray(X).tobytes())
+    return h.hexdigest()
+
+
+class CacheModelos:
+    """
+    Caché LRU de resultados de barrido_k con un número máximo de entradas
+
+    Cada entrada guarda un modelo ajustado (con sus etiquetas, una por
+    documento), así que un diccionario sin límite crecería con cada matriz
+    distinta que se agrupa.
+    """
+
+    def __init__(self, max_entradas: int = 32):
+        """
+        Args:
+            max_entradas: Modelos que se conservan (uno por k; 32 son unos
+                tres barridos de k = 2..10). Al superarlo se descarta el
+                usado hace más tiempo
+        """
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()
+
+    def __contains__(self, clave: Hashable) -> bool:
+        return clave in self._entradas
+
+    def __getitem__(self, clave: Hashable) -> Dict:
+        valor = self._entradas[clave]
+        self._entradas.move_to_end(clave)
+        return valor
+
+    def __setitem__(self, clave: Hashable, valor: Dict):
+        self._entradas[clave] = valor
+        self._entradas.move_to_end(clave)
+        while len(self._entradas) > self.max_entradas:
+            self._entradas.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+
+def _ampliar_centros(X, modelo, n_clusters: int, random_state: int) -> Optional[np.ndarray]:
+    """
+    Obtiene n_clusters centros iniciales a partir del ajuste de un k menor
+
+    Se divide en dos, repetidamente, el cluster con mayor suma de
+    distancias al cuadrado a su centro (como en K-Means bisecante), con
+    un 2-means sobre sus documentos. Así el k mayor arranca cerca de una
+    buena solución y basta con una inicialización.
+    """
+    from sklearn.cluster import KMeans
+
+    previos = modelo.cluster_centers_
+    if hasattr(previos, 'toarray'):
+        previos = previos.toarray()
+    centros = [np.asarray(c, dtype=np.float64) for c in previos]
+    miembros = [np.flatnonzero(modelo.labels_ == i) for i in range(len(centros))]
+    normas = np.asarray(X.multiply(X).sum(axis=1) if hasattr(X, 'multiply')
+                        else np.square(X).sum(axis=1)).ravel()
+
+    def dispersion(i):
+        filas = miembros[i]
+        if len(filas) < 2:
+            return -1.0
+        distancias = normas[filas] - 2 * np.asarray(X[filas] @ centros[i]).ravel() + centros[i] @ centros[i]
+        return float(distancias.sum())
+
+    dispersiones = [dispersion(i) for i in range(len(centros))]
+    while len(centros) < n_clusters:
+        peor = int(np.argmax(dispersiones))
+        if dispersiones[peor] < 0:
+            break
+        filas = miembros[peor]
+        division = KMeans(n_clusters=2, n_init=3, random_state=random_state).fit(X[filas])
+        centros[peor], nuevo = (np.asarray(c, dtype=np.float64) for c in division.cluster_centers_)
+        miembros[peor], fila_nueva = filas[division.labels_ == 0], filas[division.labels_ == 1]
+        centros.append(nuevo)
+        miembros.append(fila_nueva)
+        dispersiones[peor] = dispersion(peor)
+        dispersiones.append(dispersion(len(centros) - 1))
+
+    if len(centros) < n_clusters:
+        # No queda ningún cluster divisible: se completa con k-means++
+        return None
+    return np.vstack(centros).astype(X.dtype)
+
+
+def _evaluar_cadena(X, ks: List[int], algoritmo: str, tam_lote: int,
+                    tam_muestra: Optional[int], arranque_caliente: bool, limite: float,
+                    random_state: int, top_terminos: Optional[int] = None) -> List[Dict]:
+    """
+    Ajusta una cadena de k crecientes, cada uno arrancando de los centros
+    del anterior. El primero se ajusta siempre; los demás, solo si no se
+    ha superado el instante límite.
+    """
+    resultados = []
+    anterior = None
+    for k in ks:
+        if resultados and time.time() > limite:
+            break
+        inicio = time.perf_counter()
+        init = None
+        if arranque_caliente and anterior is not None:
+            init = _ampliar_centros(X, anterior, k, random_state)
+        modelo = crear_kmeans(k, algoritmo, tam_lote, random_state, init=init,
+                              top_terminos=top_terminos)
+        etiquetas = modelo.fit_predict(X)
+        anterior = modelo
+
+        calidad = silhouette_muestreado(X, etiquetas, tam_muestra, random_state=random_state,
+                                        metrica=metrica_silhouette(algoritmo))
+        resultados.append({
+            'k': k,
+            'silhouette': calidad['silhouette'],
+            'intervalo': calidad['intervalo'],
+            'calinski_harabasz': calinski_harabasz(X, etiquetas),
+            'segundos': time.perf_counter() - inicio,
+            'modelo': modelo
+        })
+    return resultados
+
+
+def barrido_k(X, ks: Iterable[int] = range(2, 11), algoritmo: str = 'kmeans',
+              tam_lote: int = 1024, tam_muestra: Optional[int] = TAM_MUESTRA_SILHOUETTE,
+              criterio: str = 'silhouette', presupuesto_s: Optional[float] = 60,
+              n_jobs: int = -1, cache: Optional[CacheModelos] = None,
+              arranque_caliente: bool = True, random_state: int = 42,
+              top_terminos: Optional[int] = None) -> Dict:
+    """
+    Ajusta varios valores de k y elige el mejor
+
+    Los k se reparten en tantas cadenas como procesos (k, k + n_jobs,
+    k + 2·n_jobs...); dentro de cada cadena, cada ajuste arranca desde los
+    centros del k anterior, dividiendo en dos el cluster más disperso, así
+    que converge en menos iteraciones y con una sola inicialización. Cada
+    k se puntúa con el Silhouette (muestreado) y con Calinski-Harabasz.
+
+    Args:
+        X: Matriz de características
+        ks: Valores de k candidatos (se ignoran los < 2 o >= n_documentos)
+        algoritmo: 'kmeans', 'minibatch' o 'esferico'
+        tam_lote: Documentos por minilote (solo 'minibatch')
+        tam_muestra: Documentos de la muestra del Silhouette (None = exacto)
+        criterio: 'silhouette' o 'calinski_harabasz' (mayor es mejor)
+        presupuesto_s: Segundos tras los que no se empiezan más ajustes
+            (None = sin límite). El k más pequeño de cada cadena se ajusta siempre
+        n_jobs: Procesos (-1 = todos los núcleos si hay al menos
+            MIN_DOCUMENTOS_PARALELO documentos; si no, 1). Un valor > 1 se
+            respeta siempre
+        cache: CacheModelos (o diccionario) donde guardar y reutilizar
+            modelos ajustados entre llamadas (clave: huella de X, parámetros
+            del barrido y k)
+        arranque_caliente: False para inicializar cada k desde cero (más
+            lento, a veces algo mejor)
+        random_state: Semilla
+        top_terminos: Términos que conserva cada centro (solo 'esferico';
+            None = todos)
+
+    Returns:
+        Dict con 'mejor_k', 'modelo' (el del mejor k, ya ajustado),
+        'curva' (una fila por k evaluado: k, silhouette, intervalo,
+        calinski_harabasz, segundos) y 'no_evaluados' (k sin tiempo)
+    """
+    if criterio not in ('silhouette', 'calinski_harabasz'):
+        raise ValueError("criterio debe ser 'silhouette' o 'calinski_harabasz'")
+
+    ks = sorted({int(k) for k in ks if 2 <= k < X.shape[0]})
+    if not ks:
+        raise ValueError("No hay valores de k válidos para este número de documentos")
+
+    huella = huella_matriz(X) if cache is not None else None
+    def clave(k):
+        return (huella, algoritmo, tam_lote, tam_muestra, arranque_caliente, random_state,
+                top_terminos, k)
+
+    evaluados = {k: cache[clave(k)] for k in ks if cache is not None and clave(k) in cache}
+    pendientes = [k for k in ks if k not in evaluados]
+
+    if pendientes:
+        if n_jobs < 1:
+            n_jobs = (os.cpu_count() or 1) if X.shape[0] >= MIN_DOCUMENTOS_PARALELO else 1
+        n_cadenas = min(n_jobs, len(pendientes))
+        cadenas = [pendientes[i::n_cadenas] for i in range(n_cadenas)]
+        limite = time.time() + presupuesto_s if presupuesto_s is not None else float('inf')
+        argumentos = (algoritmo, tam_lote, tam_muestra, arranque_caliente, limite, random_state,
+                      top_terminos)
+
+        print(f"🔎 Probando k = {', '.join(map(str, pendientes))} en {n_cadenas} proceso(s)...")
+        if n_cadenas == 1:
+            resultados = [_evaluar_cadena(X, cadenas[0], *argumentos)]
+        else:
+            with ProcessPoolExecutor(max_workers=n_cadenas) as executor:
+                futuros = [executor.submit(_evaluar_cadena, X, cadena, *argumentos)
+                           for cadena in cadenas]
+                resultados = [futuro.result() for futuro in futuros]
+
+        for resultado in (fila for cadena in resultados for fila in cadena):
+            evaluados[resultado['k']] = resultado
+            if cache is not None:
+                cache[clave(resultado['k'])] = resultado
+
+    curva = [{c: v for c, v in evaluados[k].items() if c != 'modelo'} for k in sorted(evaluados)]
+    mejor = max(curva, key=lambda fila: fila[criterio])
+
+    print(f"✅ Mejor k = {mejor['k']} ({criterio}: {mejor[criterio]:.3f})")
+    return {
+        'mejor_k': mejor['k'],
+        'modelo': evaluados[mejor['k']]['modelo'],
+        'curva': curva,
+        'no_evaluados': [k for k in ks if k not in evaluados]
+    }
+
+
+class KMeansEsferico:
+    """
+    K-Means con similitud coseno para documentos TF-IDF
+
+    Los documentos se normalizan (L2) y cada uno se asigna al centro con
+    el que tiene mayor producto escalar: un producto matriz dispersa x
+    matriz densa, sin convertir nunca los documentos a densos. Los centros
+    se mantienen normalizados y, con top_terminos, conservan solo sus
+    términos de mayor peso y se guardan como matriz dispersa, de modo que
+    ocupan k x top_terminos en lugar de k x vocabulario.
+
+    Interfaz como la de KMeans de scikit-learn: fit, predict,
+    fit_predict, labels_, cluster_centers_ e inertia_ (suma de las
+    distancias coseno de cada documento a su centro).
+    """
+
+    def __init__(self, n_clusters: int = 8, top_terminos: Optional[int] = None,
+                 max_iter: int = 100, tol: float = 1e-4, n_init: int = 3, init=None,
+                 random_state: int = 42):
+        """
+        Args:
+            n_clusters: Número de grupos
+            top_terminos: Términos que conserva cada centro (None = todos)
+            max_iter: Iteraciones máximas por inicialización
+            tol: Mejora relativa de la similitud total por debajo de la cual se para
+            n_init: Inicializaciones (se conserva la de mayor similitud total)
+            init: Centros iniciales (n_clusters x características) o None
+                para la inicialización k-means++ con distancia coseno
+            random_state: Semilla
+        """
+        self.n_clusters = n_clusters
+        self.top_terminos = top_terminos
+        self.max_iter = max_iter
+        self.tol = tol
+        self.n_init = n_init
+        self.init = init
+        self.random_state = random_state
+
+    @staticmethod
+    def _normalizar(X):
+        from sklearn.preprocessing import normalize
+        return normalize(X, norm='l2', copy=True)
+
+    def _similitudes(self, X, centros) -> np.ndarray:
+        """Producto escalar documentos x centros (denso, n_documentos x k)"""
+        similitudes = X @ centros.T
+        return similitudes.toarray() if hasattr(similitudes, 'toarray') else np.asarray(similitudes)
+
+    def _podar(self, centros):
+        """
+        Normaliza los centros y, con top_terminos, los deja dispersos
+
+        Si los centros llegan dispersos (sumas de documentos TF-IDF), la
+        selección se hace fila a fila sobre sus elementos no nulos, sin
+        crear nunca la matriz densa k x vocabulario.
+        """
+        import scipy.sparse as sp
+
+        podar = self.top_terminos is not None and self.top_terminos < centros.shape[1]
+        if sp.issparse(centros):
+            if not podar:
+                return self._normalizar(centros.toarray())
+            centros = sp.csr_matrix(centros)
+            conservar = np.zeros(centros.nnz, dtype=bool)
+            for fila in range(centros.shape[0]):
+                inicio, fin = centros.indptr[fila], centros.indptr[fila + 1]
+                if fin - inicio <= self.top_terminos:
+                    conservar[inicio:fin] = True
+                else:
+                    mayores = np.argpartition(-centros.data[inicio:fin], self.top_terminos - 1)
+                    conservar[inicio + mayores[:self.top_terminos]] = True
+            centros.data[~conservar] = 0
+            centros.eliminate_zeros()
+            return self._normalizar(centros)
+
+        if podar:
+            columnas = np.argpartition(-centros, self.top_terminos - 1, axis=1)[:, :self.top_terminos]
+            filas = np.repeat(np.arange(centros.shape[0]), self.top_terminos)
+            centros = sp.csr_matrix((centros[filas, columnas.ravel()], (filas, columnas.ravel())),
+                                    shape=centros.shape)
+            centros.eliminate_zeros()
+        return self._normalizar(centros)
+
+    def _inicializar(self, X, rng):
+        """k-means++ con distancia coseno sobre una muestra de documentos"""
+        muestra = rng.choice(X.shape[0], min(X.shape[0], 20_000), replace=False)
+        filas = X[muestra]
+        elegidos = [int(rng.integers(len(muestra)))]
+        distancias = 1 - self._similitudes(filas, filas[elegidos]).ravel()
+        for _ in range(1, self.n_clusters):
+            pesos = np.clip(distancias, 0, None)
+            elegido = (int(rng.choice(len(pesos), p=pesos / pesos.sum())) if pesos.sum() > 0
+                       else int(rng.integers(len(pesos))))
+            elegidos.append(elegido)
+            distancias = np.minimum(distancias, 1 - self._similitudes(filas, filas[[elegido]]).ravel())
+        # Se devuelven dispersos si X lo es; _podar decide si densificarlos
+        return filas[elegidos]
+
+    def _ajustar_una_vez(self, X, centros_iniciales):
+        import scipy.sparse as sp
+
+        n_documentos = X.shape[0]
+        if sp.issparse(centros_iniciales):
+            centros = self._podar(centros_iniciales.astype(X.dtype))
+        else:
+            centros = self._podar(np.asarray(centros_iniciales, dtype=X.dtype))
+        etiquetas = None
+        similitud_total = -np.inf
+
+        for iteracion in range(1, self.max_iter + 1):
+            similitudes = self._similitudes(X, centros)
+            nuevas = similitudes.argmax(axis=1)
+            mejores = similitudes[np.arange(n_documentos), nuevas]
+
+            # Un cluster vacío recibe el documento peor representado, de uno
+            # en uno y solo de clusters que no se quedan vacíos al cederlo
+            conteos = np.bincount(nuevas, minlength=self.n_clusters)
+            peores = np.argsort(mejores)
+            posicion = 0
+            for cluster in np.flatnonzero(conteos == 0):
+                while conteos[nuevas[peores[posicion]]] <= 1:
+                    posicion += 1
+                documento = peores[posicion]
+                posicion += 1
+                conteos[nuevas[documento]] -= 1
+                conteos[cluster] += 1
+                nuevas[documento] = cluster
+                mejores[documento] = similitudes[documento, cluster]
+
+            anterior, similitud_total = similitud_total, float(mejores.sum())
+            convergido = (etiquetas is not None and np.array_equal(nuevas, etiquetas)) or \
+                (similitud_total - anterior <= self.tol * abs(similitud_total))
+            etiquetas = nuevas
+
+            # Centro = suma normalizada de los documentos del cluster
+            pertenencia = sp.csr_matrix((np.ones(n_documentos, dtype=X.dtype),
+                                         (etiquetas, np.arange(n_documentos))),
+                                        shape=(self.n_clusters, n_documentos))
+            sumas = pertenencia @ X
+            centros = self._podar(sumas if hasattr(sumas, 'toarray') else np.asarray(sumas))
+            if convergido:
+                break
+
+        return etiquetas, centros, similitud_total, iteracion
+
+    def fit(self, X, y=None):
+        """Agrupa los documentos de X"""
+        X = self._normalizar(X)
+        rng = np.random.default_rng(self.random_state)
+
+        if self.init is not None:
+            intentos = [self.init if hasattr(self.init, 'toarray') else np.asarray(self.init)]
+        else:
+            intentos = [self._inicializar(X, rng) for _ in range(self.n_init)]
+
+        mejor = None
+        for centros_iniciales in intentos:
+            resultado = self._ajustar_una_vez(X, centros_iniciales)
+            if mejor is None or resultado[2] > mejor[2]:
+                mejor = resultado
+
+        self.labels_, self.cluster_centers_, similitud_total, self.n_iter_ = mejor
+        self.inertia_ = X.shape[0] - similitud_total
+        return self
+
+    def predict(self, X) -> np.ndarray:
+        """Centro más similar (coseno) para cada documento"""
+        return self._similitudes(self._normalizar(X), self.cluster_centers_).argmax(axis=1)
+
+    def fit_predict(self, X, y=None) -> np.ndarray:
+        return self.fit(X).labels_
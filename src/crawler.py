@@ -0,0 +1,378 @@
+"""
+=======================================================
+MÓDULO: CRAWLER - Ampliación del corpus desde semillas
+=======================================================
+Este módulo recorre sitios web a partir de unas URLs semilla usando
+WebScraper para descargar y extraer cada página:
+1. Frontera con prioridad (por defecto, primero las menos profundas)
+2. Filtro de Bloom para no repetir URLs ocupando poca memoria
+3. robots.txt descargado una sola vez por dominio (si no se puede
+   descargar, el dominio queda bloqueado y se reintenta más tarde)
+4. Límites de profundidad y de número de páginas
+"""
+
+import hashlib
+import heapq
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import pandas as pd
+
+from scraping import WebScraper, procesar_html, extraer_titulo_y_texto
+from metricas_scraping import registrar_error
+
+
+class FiltroBloom:
+    """Conjunto aproximado de URLs vistas con memoria fija"""
+
+    def __init__(self, capacidad: int = 1_000_000, tasa_error: float = 1e-4):
+        """
+        Args:
+            capacidad: Número de elementos esperado
+            tasa_error: Probabilidad de falso positivo con esa capacidad
+        """
+        # Tamaño y número de funciones hash óptimos para la tasa de error
+        self.n_bits = max(8, int(-capacidad * math.log(tasa_error) / math.log(2) ** 2))
+        self.n_hashes = max(1, round(self.n_bits / capacidad * math.log(2)))
+        self.bits = bytearray((self.n_bits + 7) // 8)
+        self.n_elementos = 0
+
+    def _posiciones(self, elemento: str):
+        # Doble hashing: h1 + i*h2 a partir de un único blake2b de 128 bits
+        resumen = hashlib.blake2b(elemento.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(resumen[:8], 'little')
+        h2 = int.from_bytes(resumen[8:], 'little') | 1
+        return [(h1 + i * h2) % self.n_bits for i in range(self.n_hashes)]
+
+    def __contains__(self, elemento: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._posiciones(elemento))
+
+    def agregar(self, elemento: str) -> bool:
+        """
+        Añade un elemento al filtro
+
+        Returns:
+            True si el elemento no estaba (salvo falso positivo)
+        """
+        nuevo = False
+        for p in self._posiciones(elemento):
+            byte, bit = p >> 3, 1 << (p & 7)
+            if not self.bits[byte] & bit:
+                self.bits[byte] |= bit
+                nuevo = True
+        if nuevo:
+            self.n_elementos += 1
+        return nuevo
+
+    def __len__(self) -> int:
+        return self.n_elementos
+
+
+def normalizar_url(url: str) -> str:
+    """Quita el fragmento (#...) y pasa a minúsculas el esquema y el host"""
+    url, _ = urldefrag(url)
+    partes = urlparse(url)
+    return partes._replace(scheme=partes.scheme.lower(), netloc=partes.netloc.lower()).geturl()
+
+
+class Crawler:
+    """Rastreador que amplía el corpus siguiendo enlaces desde semillas"""
+
+    def __init__(self, scraper: Optional[WebScraper] = None, max_profundidad: int = 2,
+                 max_paginas: int = 100, delay: float = 1.0, max_concurrencia: int = 4,
+                 mismo_dominio: bool = True, prioridad: Optional[Callable[[str, int], float]] = None,
+                 capacidad_vistos: int = 1_000_000, respetar_robots: bool = True,
+                 reintento_robots_s: float = 60, max_reintentos_robots: int = 3):
+        """
+        Args:
+            scraper: WebScraper usado para descargar y extraer (se crea uno
+                si no se indica)
+            max_profundidad: Saltos máximos desde una semilla
+            max_paginas: Número máximo de páginas extraídas
+            delay: Espera mínima entre peticiones al mismo host (segundos).
+                Si robots.txt indica un Crawl-delay mayor, se usa ese
+            max_concurrencia: Hosts descargados en paralelo
+            mismo_dominio: Si es True, solo se siguen enlaces a los hosts
+                de las semillas
+            prioridad: Función (url, profundidad) -> número; se visitan
+                antes las URLs con valor menor. Por defecto, la profundidad
+            capacidad_vistos: URLs esperadas para dimensionar el filtro de Bloom
+            respetar_robots: Consultar robots.txt antes de cada descarga
+            reintento_robots_s: Si robots.txt no se puede descargar (error
+                5xx o de red), el host se considera bloqueado (RFC 9309) y
+                se vuelve a pedir pasados estos segundos
+            max_reintentos_robots: Descargas fallidas de robots.txt tras las
+                que el host queda bloqueado durante el resto del rastreo
+        """
+        self.scraper = scraper or WebScraper()
+        self.max_profundidad = max_profundidad
+        self.max_paginas = max_paginas
+        self.delay = delay
+        self.max_concurrencia = max_concurrencia
+        self.mismo_dominio = mismo_dominio
+        self.prioridad = prioridad or (lambda url, profundidad: profundidad)
+        self.respetar_robots = respetar_robots
+        self.reintento_robots_s = reintento_robots_s
+        self.max_reintentos_robots = max_reintentos_robots
+
+        self.vistos = FiltroBloom(capacidad_vistos)
+        # Por origen: (robots, instante en que caduca o None si es definitivo)
+        self._robots: Dict[str, Tuple[RobotFileParser, Optional[float]]] = {}
+        self._fallos_robots: Dict[str, int] = {}
+        self._lock_robots = threading.Lock()
+
+        # Frontera: un montículo de URLs por host y un montículo de hosts listos
+        self._colas_host: Dict[str, List] = {}
+        self._hosts_listos: List = []
+        self._proxima_peticion: Dict[str, float] = {}
+        self._secuencia = 0
+        self._dominios: set = set()
+        self._en_curso_hosts: set = set()
+
+    @staticmethod
+    def _origen(url: str) -> str:
+        partes = urlparse(url)
+        return f"{partes.scheme}://{partes.netloc}"
+
+    def _robots_de(self, url: str) -> RobotFileParser:
+        """
+        Descarga y guarda el robots.txt del host de la URL
+
+        Según RFC 9309, un error 4xx equivale a no tener robots.txt (todo
+        permitido) y un error 5xx o de red, a prohibirlo todo. En ese caso
+        el resultado caduca a los `reintento_robots_s` segundos para volver
+        a intentarlo, hasta `max_reintentos_robots` veces.
+        """
+        origen = self._origen(url)
+
+        with self._lock_robots:
+            guardado = self._robots.get(origen)
+            if guardado is not None and (guardado[1] is None or time.monotonic() < guardado[1]):
+                return guardado[0]
+
+        robots = RobotFileParser(origen + '/robots.txt')
+        inaccesible = False
+        try:
+            response = self.scraper.session.get(origen + '/robots.txt', timeout=self.scraper.timeout)
+            if response.status_code >= 500:
+                inaccesible = True
+            elif response.status_code >= 400:
+                robots.allow_all = True
+            else:
+                robots.parse(response.text.splitlines())
+        except Exception:
+            inaccesible = True
+
+        caduca = None
+        with self._lock_robots:
+            if inaccesible:
+                robots.disallow_all = True
+                fallos = self._fallos_robots.get(origen, 0) + 1
+                self._fallos_robots[origen] = fallos
+                if fallos < self.max_reintentos_robots:
+                    caduca = time.monotonic() + self.reintento_robots_s
+                    print(f"⚠️ robots.txt inaccesible en {origen}; "
+                          f"se reintentará en {self.reintento_robots_s:g} s")
+                else:
+                    print(f"🚫 robots.txt inaccesible en {origen}; se omite el host")
+            self._robots[origen] = (robots, caduca)
+        return robots
+
+    def _caducidad_robots(self, url: str) -> Optional[float]:
+        """Instante en que se reintentará el robots.txt del host (None si no aplica)"""
+        with self._lock_robots:
+            guardado = self._robots.get(self._origen(url))
+        return guardado[1] if guardado is not None else None
+
+    def _permitido(self, url: str) -> bool:
+        """Indica si robots.txt permite descargar la URL"""
+        if not self.respetar_robots:
+            return True
+        return self._robots_de(url).can_fetch(self.scraper.headers['User-Agent'], url)
+
+    def _delay_host(self, url: str) -> float:
+        """
+        Espera entre peticiones al host, teniendo en cuenta Crawl-delay y,
+        si robots.txt estaba inaccesible, el momento de reintentarlo
+        """
+        # Solo se consulta lo ya descargado (_visitar pide robots.txt antes)
+        with self._lock_robots:
+            guardado = self._robots.get(self._origen(url)) if self.respetar_robots else None
+        if guardado is None:
+            return self.delay
+        robots, caduca = guardado
+        crawl_delay = robots.crawl_delay(self.scraper.headers['User-Agent'])
+        espera = max(self.delay, float(crawl_delay or 0))
+        if caduca is not None:
+            espera = max(espera, caduca - time.monotonic())
+        return espera
+
+    def _encolar(self, url: str, profundidad: int):
+        """Añade una URL a la frontera si no se ha visto ya"""
+        if profundidad > self.max_profundidad:
+            return
+        partes = urlparse(url)
+        if partes.scheme not in ('http', 'https'):
+            return
+        host = partes.netloc
+        if self.mismo_dominio and host not in self._dominios:
+            return
+        if not self.vistos.agregar(url):
+            return
+
+        cola = self._colas_host.setdefault(host, [])
+        if not cola and host not in self._en_curso_hosts:
+            heapq.heappush(self._hosts_listos,
+                           (self._proxima_peticion.get(host, 0.0), self._secuencia, host))
+        heapq.heappush(cola, (self.prioridad(url, profundidad), self._secuencia, profundidad, url))
+        self._secuencia += 1
+
+    def _visitar(self, url: str):
+        """
+        Descarga y extrae una página (se ejecuta en un hilo del pool)
+
+        Returns:
+            Tupla (resultado o None, enlaces absolutos encontrados, True si
+            hay que reintentarla cuando se vuelva a pedir robots.txt)
+        """
+        if not self._permitido(url):
+            if self._caducidad_robots(url) is not None:
+                return None, [], True
+            print(f"🚫 Bloqueado por robots.txt: {url}")
+            return None, [], False
+
+        medicion = self.scraper._nueva_medicion(url)
+        try:
+            print(f"📥 Extrayendo contenido de: {url}")
+            response, resultado = self.scraper._descargar(url, medicion)
+            enlaces = []
+
+            if resultado is None:
+                inicio_parseo = time.perf_counter()
+                resultado = procesar_html(url, response.content, self.scraper.motor,
+                                          enlaces, medicion)
+                self.scraper._guardar_en_cache(url, response, resultado,
+                                               time.perf_counter() - inicio_parseo)
+                base = response.url
+            else:
+                # Página sin cambios (304): los enlaces salen del HTML guardado
+                cuerpo = self.scraper.cache.obtener_cuerpo(url)
+                if cuerpo:
+                    extraer_titulo_y_texto(cuerpo, self.scraper.motor, enlaces)
+                base = url
+
+            return resultado, [normalizar_url(urljoin(base, enlace)) for enlace in enlaces], False
+
+        except Exception as e:
+            print(f"❌ Error al extraer {url}: {e}")
+            registrar_error(medicion, e)
+            return None, [], False
+        finally:
+            self.scraper._registrar(medicion)
+
+    def iter_rastrear(self, semillas: List[str]) -> Iterator[Dict[str, str]]:
+        """
+        Rastrea a partir de las semillas devolviendo cada página al extraerla
+
+        Cada host tiene como máximo una petición en curso y espera `delay`
+        segundos (o su Crawl-delay) entre peticiones; hosts distintos se
+        descargan en paralelo.
+
+        Args:
+            semillas: URLs de partida
+
+        Returns:
+            Iterador de resultados con el formato de `WebScraper.extraer_texto_url`
+        """
+        semillas = [normalizar_url(url) for url in semillas]
+        self._dominios = {urlparse(url).netloc for url in semillas}
+        self._en_curso_hosts = set()
+        for url in semillas:
+            self._encolar(url, 0)
+
+        extraidas = 0
+        lanzadas = 0
+        en_curso = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrencia) as executor:
+            while (self._hosts_listos or en_curso) and extraidas < self.max_paginas:
+                ahora = time.monotonic()
+                while (self._hosts_listos and len(en_curso) < self.max_concurrencia
+                       and self._hosts_listos[0][0] <= ahora
+                       and extraidas + lanzadas < self.max_paginas):
+                    _, _, host = heapq.heappop(self._hosts_listos)
+                    _, _, profundidad, url = heapq.heappop(self._colas_host[host])
+                    futuro = executor.submit(self._visitar, url)
+                    en_curso[futuro] = (host, url, profundidad)
+                    self._en_curso_hosts.add(host)
+                    lanzadas += 1
+
+                espera = None
+                if self._hosts_listos and len(en_curso) < self.max_concurrencia:
+                    espera = max(0.0, self._hosts_listos[0][0] - time.monotonic())
+                if not en_curso:
+                    if espera is None:
+                        break
+                    time.sleep(espera)
+                    continue
+
+                hechos, _ = wait(en_curso, timeout=espera, return_when=FIRST_COMPLETED)
+                for futuro in hechos:
+                    host, url, profundidad = en_curso.pop(futuro)
+                    self._en_curso_hosts.discard(host)
+                    lanzadas -= 1
+
+                    resultado, enlaces, reintentar = futuro.result()
+                    if reintentar:
+                        # robots.txt inaccesible: la URL vuelve a la cola del host
+                        heapq.heappush(self._colas_host[host], (self.prioridad(url, profundidad),
+                                                                self._secuencia, profundidad, url))
+                        self._secuencia += 1
+
+                    self._proxima_peticion[host] = time.monotonic() + self._delay_host(url)
+                    if self._colas_host[host]:
+                        heapq.heappush(self._hosts_listos,
+                                       (self._proxima_peticion[host], self._secuencia, host))
+                        self._secuencia += 1
+
+                    if resultado is None:
+                        continue
+
+                    extraidas += 1
+                    print(f"[{extraidas}/{self.max_paginas}] Profundidad {profundidad}: "
+                          f"{len(enlaces)} enlaces")
+                    for enlace in enlaces:
+                        self._encolar(enlace, profundidad + 1)
+
+                    yield resultado
+
+    def rastrear(self, semillas: List[str]) -> pd.DataFrame:
+        """
+        Rastrea a partir de las semillas
+
+        Args:
+            semillas: URLs de partida
+
+        Returns:
+            DataFrame con las mismas columnas que `WebScraper.extraer_multiples_urls`
+        """
+        df = pd.DataFrame(list(self.iter_rastrear(semillas)))
+        print(f"\n✅ Se extrajeron {len(df)} documentos exitosamente "
+              f"({len(self.vistos)} URLs descubiertas)")
+        return df
+
+
+# ========================================
+# EJEMPLO DE USO
+# ========================================
+if __name__ == "__main__":
+    crawler = Crawler(max_profundidad=1, max_paginas=10)
+    df = crawler.rastrear(["https://es.wikipedia.org/wiki/Inteligencia_artificial"])
+
+    for idx, row in df.iterrows():
+        print(f"📄 {row['titulo']} ({row['longitud']} palabras) - {row['url']}")
@@ -0,0 +1,238 @@
+"""
+=======================================================
+MÓDULO: DEDUPLICACIÓN - Detección de casi-duplicados
+=======================================================
+Este módulo detecta documentos casi idénticos (artículos sindicados,
+espejos, copias con pequeños cambios) antes del preprocesamiento:
+1. Firma MinHash de los shingles (n-gramas de palabras) de cada texto
+2. LSH por bandas para encontrar candidatos sin comparar todos los pares
+3. Verificación de la similitud estimada y agrupación (union-find)
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Primo de Mersenne usado en las permutaciones universales (a*x + b) mod p
+PRIMO_MERSENNE = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+PATRON_PALABRA = re.compile(r'\w+')
+
+
+def elegir_bandas(umbral: float, n_permutaciones: int) -> Tuple[int, int]:
+    """
+    Elige bandas y filas por banda para que el umbral LSH ((1/b)^(1/r))
+    quede lo más cerca posible del umbral de similitud pedido
+
+    Returns:
+        Tupla (n_bandas, filas_por_banda)
+    """
+    mejor = None
+    for filas in range(1, n_permutaciones + 1):
+        if n_permutaciones % filas:
+            continue
+        bandas = n_permutaciones // filas
+        distancia = abs((1 / bandas) ** (1 / filas) - umbral)
+        if mejor is None or distancia < mejor[0]:
+            mejor = (distancia, bandas, filas)
+    return mejor[1], mejor[2]
+
+
+class DetectorDuplicados:
+    """Clase para detectar y eliminar documentos casi duplicados"""
+
+    def __init__(self, umbral: float = 0.8, n_permutaciones: int = 128,
+                 tam_shingle: int = 3, semilla: int = 42):
+        """
+        Args:
+            umbral: Similitud de Jaccard (0-1) a partir de la cual dos
+                documentos se consideran duplicados
+            n_permutaciones: Longitud de la firma MinHash
+            tam_shingle: Palabras por shingle
+            semilla: Semilla de las permutaciones (firmas reproducibles)
+        """
+        self.umbral = umbral
+        self.n_permutaciones = n_permutaciones
+        self.tam_shingle = tam_shingle
+        self.n_bandas, self.filas_por_banda = elegir_bandas(umbral, n_permutaciones)
+
+        generador = np.random.RandomState(semilla)
+        self._a = generador.randint(1, np.iinfo(np.int64).max, size=n_permutaciones,
+                                    dtype=np.int64).astype(np.uint64)
+        self._b = generador.randint(0, np.iinfo(np.int64).max, size=n_permutaciones,
+                                    dtype=np.int64).astype(np.uint64)
+
+    def shingles(self, texto: str) -> np.ndarray:
+        """
+        Calcula los hashes de los shingles de palabras de un texto
+
+        Args:
+            texto: Texto original
+
+        Returns:
+            Array de hashes (uint64) de los shingles distintos (vacío si
+            el texto no tiene palabras)
+        """
+        palabras = PATRON_PALABRA.findall(texto.lower())
+        if not palabras:
+            return np.empty(0, dtype=np.uint64)
+        n = max(1, len(palabras) - self.tam_shingle + 1)
+        hashes = {
+            zlib.crc32(' '.join(palabras[i:i + self.tam_shingle]).encode('utf-8'))
+            for i in range(n)
+        }
+        return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+    def firma(self, texto: str) -> np.ndarray:
+        """
+        Calcula la firma MinHash de un texto
+
+        Args:
+            texto: Texto original
+
+        Returns:
+            Array de n_permutaciones valores (uint32); todos máximos si el
+            texto no tiene shingles
+        """
+        hashes = self.shingles(texto)
+        if len(hashes) == 0:
+            return np.full(self.n_permutaciones, MAX_HASH, dtype=np.uint32)
+        # Permutaciones (a*x + b) mod p de todos los shingles a la vez
+        permutados = (np.outer(self._a, hashes) + self._b[:, None]) % PRIMO_MERSENNE
+        permutados &= MAX_HASH
+        return permutados.min(axis=1).astype(np.uint32)
+
+    def firmas(self, textos: List[str]) -> np.ndarray:
+        """Calcula la matriz de firmas (n_textos x n_permutaciones)"""
+        firmas = np.empty((len(textos), self.n_permutaciones), dtype=np.uint32)
+        for i, texto in enumerate(textos):
+            firmas[i] = self.firma(texto)
+        return firmas
+
+    def agrupar(self, textos: List[str]) -> List[List[int]]:
+        """
+        Agrupa los textos casi duplicados
+
+        Cada banda de la firma se usa como clave de un diccionario; los
+        documentos que comparten alguna banda son candidatos y se comparan
+        con el primer documento de su cubeta, por lo que el coste es
+        aproximadamente lineal en el número de documentos. Los textos
+        vacíos o sin palabras no tienen shingles y no se agrupan: todos
+        tendrían la misma firma sin parecerse en nada.
+
+        Args:
+            textos: Lista de textos
+
+        Returns:
+            Lista de grupos (índices ordenados) con más de un documento
+        """
+        firmas = self.firmas(textos)
+        padres = list(range(len(textos)))
+
+        def raiz(i):
+            while padres[i] != i:
+                padres[i] = padres[padres[i]]
+                i = padres[i]
+            return i
+
+        con_shingles = [i for i, texto in enumerate(textos) if PATRON_PALABRA.search(texto)]
+
+        for banda in range(self.n_bandas):
+            inicio = banda * self.filas_por_banda
+            fin = inicio + self.filas_por_banda
+
+            cubetas = defaultdict(list)
+            for i in con_shingles:
+                cubetas[firmas[i, inicio:fin].tobytes()].append(i)
+
+            for indices in cubetas.values():
+                primero = indices[0]
+                for j in indices[1:]:
+                    if raiz(primero) == raiz(j):
+                        continue
+                    similitud = np.mean(firmas[primero] == firmas[j])
+                    if similitud >= self.umbral:
+                        padres[raiz(j)] = raiz(primero)
+
+        grupos: Dict[int, List[int]] = defaultdict(list)
+        for i in range(len(textos)):
+            grupos[raiz(i)].append(i)
+
+        return sorted((g for g in grupos.values() if len(g) > 1), key=lambda g: g[0])
+
+    def deduplicar(self, df: pd.DataFrame, columna: str = 'texto',
+                   accion: str = 'eliminar') -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Elimina o marca los documentos casi duplicados de un DataFrame
+
+        Args:
+            df: DataFrame con los documentos (por ejemplo, el del scraper)
+            columna: Columna con el texto a comparar
+            accion: 'eliminar' conserva solo el primer documento de cada
+                grupo; 'agrupar' conserva todos y añade la columna
+                'grupo_duplicado' (-1 para documentos únicos)
+
+        Returns:
+            Tupla (DataFrame resultante, reporte con un grupo por fila)
+        """
+        if accion not in ('eliminar', 'agrupar'):
+            raise ValueError("accion debe ser 'eliminar' o 'agrupar'")
+
+        print(f"🔍 Buscando casi-duplicados en {len(df)} documentos (umbral {self.umbral:.2f})...")
+        grupos = self.agrupar(df[columna].fillna('').tolist())
+
+        filas_reporte = []
+        grupo_por_fila = np.full(len(df), -1)
+        for grupo_id, indices in enumerate(grupos):
+            grupo_por_fila[indices] = grupo_id
+            fila = {
+                'grupo': grupo_id,
+                'representante': df.index[indices[0]],
+                'duplicados': list(df.index[indices[1:]]),
+                'n_documentos': len(indices)
+            }
+            if 'url' in df.columns:
+                fila['url_representante'] = df['url'].iloc[indices[0]]
+            filas_reporte.append(fila)
+
+        reporte = pd.DataFrame(filas_reporte)
+
+        if accion == 'agrupar':
+            resultado = df.copy()
+            resultado['grupo_duplicado'] = grupo_por_fila
+        else:
+            eliminar = np.zeros(len(df), dtype=bool)
+            for indices in grupos:
+                eliminar[indices[1:]] = True
+            resultado = df[~eliminar]
+
+        n_duplicados = sum(len(g) - 1 for g in grupos)
+        print(f"✅ {len(grupos)} grupos de casi-duplicados ({n_duplicados} documentos repetidos)")
+        return resultado, reporte
+
+
+# ========================================
+# EJEMPLO DE USO
+# ========================================
+if __name__ == "__main__":
+    textos = [
+        "El campeonato mundial de fútbol reúne a los mejores equipos del planeta cada cuatro años",
+        "El campeonato mundial de fútbol reúne a los mejores equipos del planeta cada cuatro años.",
+        "El campeonato mundial de fútbol reúne a los mejores equipos del planeta cada cuatro años según la FIFA",
+        "Python es un lenguaje de programación muy usado en ciencia de datos y machine learning",
+        "Los algoritmos de deep learning están revolucionando la inteligencia artificial"
+    ]
+    df = pd.DataFrame({'url': [f"https://ejemplo.com/{i}" for i in range(len(textos))],
+                       'texto': textos})
+
+    detector = DetectorDuplicados(umbral=0.7)
+    df_unicos, reporte = detector.deduplicar(df)
+
+    print(f"\n📄 Documentos únicos: {len(df_unicos)} de {len(df)}")
+    print(reporte.to_string(index=False))
@@ -0,0 +1,296 @@
+"""
+=======================================================
+MÓDULO: INGESTA DE FUENTES - Sitemaps y feeds RSS/Atom
+=======================================================
+Este módulo obtiene las URLs a extraer a partir de los sitemaps
+(incluidos los índices de sitemaps) y feeds RSS/Atom de las fuentes.
+Guarda en un archivo de estado la fecha más reciente vista en cada
+fuente, de modo que en cada ejecución solo se extraen las páginas
+nuevas o modificadas desde la anterior
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from lxml import etree
+
+from scraping import WebScraper
+
+
+# URLs sin fecha recordadas por fuente: si el feed no trae fechas, solo
+# importan las que siguen apareciendo en él, así que basta una ventana
+# con las vistas más recientemente
+MAX_SIN_FECHA = 10_000
+
+
+def parsear_fecha(texto: Optional[str]) -> Optional[datetime]:
+    """
+    Convierte una fecha de sitemap (W3C/ISO 8601) o de RSS (RFC 822) a UTC
+
+    Args:
+        texto: Fecha tal como aparece en el XML
+
+    Returns:
+        datetime con zona horaria UTC, o None si no se puede interpretar
+    """
+    if not texto:
+        return None
+    texto = texto.strip()
+
+    try:
+        # W3C datetime: 2024, 2024-05, 2024-05-01, 2024-05-01T10:00:00Z...
+        iso = texto.replace('Z', '+00:00')
+        if len(iso) == 4:
+            iso += '-01-01'
+        elif len(iso) == 7:
+            iso += '-01'
+        fecha = datetime.fromisoformat(iso)
+    except ValueError:
+        try:
+            fecha = parsedate_to_datetime(texto)
+        except (TypeError, ValueError):
+            return None
+
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return fecha.astimezone(timezone.utc)
+
+
+def _nombre_local(etiqueta) -> str:
+    """Quita el espacio de nombres de una etiqueta: '{ns}loc' -> 'loc'"""
+    return etiqueta.rsplit('}', 1)[-1] if isinstance(etiqueta, str) else ''
+
+
+def _hijo(elemento, nombre: str):
+    """Primer hijo con el nombre local indicado"""
+    for hijo in elemento:
+        if _nombre_local(hijo.tag) == nombre:
+            return hijo
+    return None
+
+
+def _texto_hijo(elemento, *nombres: str) -> Optional[str]:
+    """Texto del primer hijo que tenga alguno de los nombres indicados"""
+    for nombre in nombres:
+        hijo = _hijo(elemento, nombre)
+        if hijo is not None and hijo.text and hijo.text.strip():
+            return hijo.text.strip()
+    return None
+
+
+def _enlace_atom(entrada) -> Optional[str]:
+    """href del <link> alternativo de una entrada Atom"""
+    for hijo in entrada:
+        if _nombre_local(hijo.tag) == 'link' and hijo.get('rel', 'alternate') == 'alternate':
+            return hijo.get('href')
+    return None
+
+
+class IngestorFuentes:
+    """Clase para extraer solo las páginas nuevas de sitemaps y feeds"""
+
+    def __init__(self, scraper: Optional[WebScraper] = None,
+                 ruta_estado: str = 'data/raw/estado_fuentes.json',
+                 max_sin_fecha: int = MAX_SIN_FECHA):
+        """
+        Args:
+            scraper: WebScraper usado para descargar fuentes y páginas
+            ruta_estado: Archivo JSON con la última fecha vista por fuente
+            max_sin_fecha: URLs sin fecha recordadas por fuente (las vistas
+                más recientemente). Debe superar el número de entradas del feed
+        """
+        self.scraper = scraper or WebScraper()
+        self.ruta_estado = ruta_estado
+        self.max_sin_fecha = max_sin_fecha
+        self.estado = self._cargar_estado()
+
+    def _cargar_estado(self) -> Dict:
+        """
+        Lee el estado: {'fuentes': {url: {...}}, 'urls_fallidas': [...]}
+
+        Los archivos antiguos, con las fuentes en el primer nivel, se convierten.
+        """
+        if not os.path.exists(self.ruta_estado):
+            return {'fuentes': {}, 'urls_fallidas': []}
+        with open(self.ruta_estado, encoding='utf-8') as f:
+            estado = json.load(f)
+        if 'fuentes' not in estado:
+            fallidas = estado.pop('_urls_fallidas', [])
+            estado = {'fuentes': estado, 'urls_fallidas': fallidas}
+        return estado
+
+    def guardar_estado(self):
+        """Guarda el estado de las fuentes de forma atómica"""
+        directorio = os.path.dirname(self.ruta_estado)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        temporal = self.ruta_estado + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(self.estado, f, ensure_ascii=False, indent=2)
+        os.replace(temporal, self.ruta_estado)
+
+    def iter_entradas(self, url_fuente: str) -> Iterator[Tuple[str, str, Optional[datetime]]]:
+        """
+        Lee un sitemap, índice de sitemaps o feed de forma incremental
+
+        Cada entrada se libera en cuanto se ha leído, así que la memoria
+        no depende del tamaño del XML.
+
+        Args:
+            url_fuente: URL del sitemap o del feed
+
+        Returns:
+            Iterador de tuplas (tipo, url, fecha) donde tipo es 'pagina'
+            o 'sitemap' (un sitemap hijo de un índice)
+        """
+        response = self.scraper.session.get(url_fuente, stream=True, timeout=self.scraper.timeout)
+        response.raise_for_status()
+        response.raw.decode_content = True
+
+        flujo = response.raw
+        tipo_contenido = response.headers.get('Content-Type', '')
+        if url_fuente.endswith('.gz') or 'gzip' in tipo_contenido:
+            flujo = gzip.GzipFile(fileobj=flujo)
+
+        try:
+            for _, elemento in etree.iterparse(flujo, events=('end',), recover=True,
+                                               resolve_entities=False, no_network=True):
+                nombre = _nombre_local(elemento.tag)
+
+                if nombre == 'url':
+                    entrada = ('pagina', _texto_hijo(elemento, 'loc'),
+                               parsear_fecha(_texto_hijo(elemento, 'lastmod')))
+                elif nombre == 'sitemap':
+                    entrada = ('sitemap', _texto_hijo(elemento, 'loc'),
+                               parsear_fecha(_texto_hijo(elemento, 'lastmod')))
+                elif nombre == 'item':
+                    entrada = ('pagina', _texto_hijo(elemento, 'link', 'guid'),
+                               parsear_fecha(_texto_hijo(elemento, 'pubDate', 'date')))
+                elif nombre == 'entry':
+                    entrada = ('pagina', _enlace_atom(elemento),
+                               parsear_fecha(_texto_hijo(elemento, 'updated', 'published')))
+                else:
+                    continue
+
+                # Liberar la entrada ya leída y las anteriores
+                elemento.clear()
+                while elemento.getprevious() is not None:
+                    del elemento.getparent()[0]
+
+                if entrada[1]:
+                    yield entrada
+        finally:
+            response.close()
+
+    def urls_nuevas(self, fuentes: List[str]) -> List[str]:
+        """
+        Devuelve las URLs nuevas o modificadas desde la última ejecución
+
+        Una entrada con fecha es nueva si es posterior a la última fecha
+        vista en su fuente; una entrada sin fecha, si su URL no está entre
+        las últimas `max_sin_fecha` vistas sin fecha en ella. Los sitemaps
+        hijos de un índice cuya fecha no ha cambiado ni siquiera se
+        descargan. Las URLs que fallaron en la extracción anterior se
+        incluyen de nuevo. El estado se actualiza en memoria; llamar a
+        `guardar_estado` para persistirlo.
+
+        Args:
+            fuentes: URLs de sitemaps o feeds
+
+        Returns:
+            Lista de URLs de páginas sin duplicados
+        """
+        # Reintentar primero las que fallaron en la ejecución anterior
+        nuevas = dict.fromkeys(self.estado['urls_fallidas'])
+        pendientes = list(fuentes)
+
+        while pendientes:
+            fuente = pendientes.pop(0)
+            estado = self.estado['fuentes'].setdefault(fuente,
+                                                       {'ultima_fecha': None, 'sin_fecha': []})
+            ultima = parsear_fecha(estado['ultima_fecha'])
+            # Diccionario ordenado de la vista hace más tiempo a la más reciente
+            vistas_sin_fecha = dict.fromkeys(estado['sin_fecha'])
+            maxima = ultima
+
+            try:
+                print(f"📰 Leyendo fuente: {fuente}")
+                for tipo, url, fecha in self.iter_entradas(fuente):
+                    # Un sitemap hijo sin fecha puede tener páginas nuevas: leerlo siempre
+                    if tipo == 'sitemap' and fecha is None:
+                        pendientes.append(url)
+                        continue
+
+                    if fecha is None:
+                        clave = hashlib.blake2b(url.encode('utf-8'), digest_size=8).hexdigest()
+                        vista = clave in vistas_sin_fecha
+                        # Seguir en el feed la mantiene dentro de la ventana
+                        vistas_sin_fecha.pop(clave, None)
+                        vistas_sin_fecha[clave] = None
+                        if vista:
+                            continue
+                    elif ultima is not None and fecha <= ultima:
+                        continue
+                    else:
+                        maxima = fecha if maxima is None else max(maxima, fecha)
+
+                    if tipo == 'sitemap':
+                        pendientes.append(url)
+                    else:
+                        nuevas[url] = None
+            except Exception as e:
+                print(f"❌ Error al leer {fuente}: {e}")
+                continue
+
+            estado['ultima_fecha'] = maxima.isoformat() if maxima else None
+            estado['sin_fecha'] = list(vistas_sin_fecha)[-self.max_sin_fecha:]
+
+        print(f"✅ {len(nuevas)} URLs nuevas o modificadas en {len(fuentes)} fuentes")
+        return list(nuevas)
+
+    def ingerir(self, fuentes: List[str], **kwargs) -> pd.DataFrame:
+        """
+        Extrae las páginas nuevas de las fuentes y guarda el estado
+
+        Las URLs que no se pudieron extraer (errores temporales, tiempo
+        agotado...) quedan en el estado y se reintentan en la siguiente
+        ejecución, aunque la fecha de su fuente ya haya avanzado.
+
+        Args:
+            fuentes: URLs de sitemaps o feeds
+            **kwargs: Parámetros de `WebScraper.extraer_multiples_urls`
+                (delay, max_concurrencia, max_procesos)
+
+        Returns:
+            DataFrame con los contenidos extraídos
+        """
+        urls = self.urls_nuevas(fuentes)
+        df = self.scraper.extraer_multiples_urls(urls, **kwargs)
+
+        extraidas = set(df['url']) if 'url' in df.columns else set()
+        fallidas = [url for url in urls if url not in extraidas]
+        if fallidas:
+            print(f"⚠️ {len(fallidas)} URLs fallaron; se reintentarán en la próxima ejecución")
+        self.estado['urls_fallidas'] = fallidas
+        self.guardar_estado()
+        return df
+
+
+# ========================================
+# EJEMPLO DE USO
+# ========================================
+if __name__ == "__main__":
+    ingestor = IngestorFuentes()
+
+    # La primera ejecución extrae todo; las siguientes, solo lo nuevo
+    df = ingestor.ingerir(
+        ["https://es.wikipedia.org/w/index.php?title=Especial:PáginasNuevas&feed=atom"],
+        max_concurrencia=4
+    )
+    print(f"\n📄 Documentos nuevos: {len(df)}")
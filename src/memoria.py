@@ -0,0 +1,196 @@
+"""
+=======================================================
+MÓDULO: MEMORIA - Tamaño de matrices y pico de RSS por etapa
+=======================================================
+Este módulo mide lo que ocupa cada matriz del pipeline (elementos no
+nulos, bytes de datos e índices, tipo) y el pico de memoria residente
+(RSS) del proceso en cada etapa (vectorizar, entrenar, clustering), para
+saber qué corpus cabe en un nodo y comparar float64 con float32
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+# Tipos de coma flotante admitidos en vectorización, entrenamiento y clustering
+TIPOS_FLOTANTES = {'float64': np.float64, 'float32': np.float32}
+
+
+def tipo_flotante(dtype) -> type:
+    """
+    Normaliza un tipo de coma flotante ('float32', np.float32, np.dtype...)
+
+    Returns:
+        np.float32 o np.float64
+    """
+    nombre = np.dtype(dtype).name
+    if nombre not in TIPOS_FLOTANTES:
+        raise ValueError(f"dtype debe ser float32 o float64, no {nombre}")
+    return TIPOS_FLOTANTES[nombre]
+
+
+def compactar_indices(X):
+    """
+    Pasa a int32 los índices de una matriz dispersa si caben
+
+    scipy usa int64 cuando alguno de los arrays de entrada lo es, aunque
+    los valores quepan en int32; con int32 los índices ocupan la mitad.
+    La matriz se modifica en el sitio y se devuelve.
+    """
+    if not hasattr(X, 'indices'):
+        return X
+    limite = np.iinfo(np.int32).max
+    if X.nnz <= limite and max(X.shape) <= limite and X.indices.dtype != np.int32:
+        X.indices = X.indices.astype(np.int32)
+        X.indptr = X.indptr.astype(np.int32)
+    return X
+
+
+def bytes_matriz(X) -> int:
+    """Bytes que ocupa una matriz densa o dispersa (datos más índices)"""
+    if hasattr(X, 'indptr'):
+        return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    if hasattr(X, 'nnz'):
+        # Otros formatos de scipy: se convierten solo para medirlos
+        return bytes_matriz(X.tocsr())
+    return np.asarray(X).nbytes
+
+
+def describir_matriz(X) -> Dict:
+    """
+    Forma, tipo, elementos no nulos y bytes de una matriz
+
+    Returns:
+        Diccionario con 'forma', 'dtype', 'indices', 'nnz' y 'mb'
+    """
+    disperso = hasattr(X, 'nnz')
+    return {
+        'forma': f"{X.shape[0]} x {X.shape[1]}" if len(X.shape) == 2 else str(X.shape),
+        'dtype': np.dtype(X.dtype).name,
+        'indices': np.dtype(X.indices.dtype).name if hasattr(X, 'indices') else '-',
+        'nnz': X.nnz if disperso else int(np.prod(X.shape)),
+        'mb': bytes_matriz(X) / 1024 ** 2
+    }
+
+
+def _leer_status(campo: str) -> Optional[float]:
+    """Valor en MB de un campo de /proc/self/status (solo Linux)"""
+    try:
+        with open('/proc/self/status') as f:
+            for linea in f:
+                if linea.startswith(campo + ':'):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def rss_actual_mb() -> Optional[float]:
+    """Memoria residente actual del proceso en MB (None si no se puede medir)"""
+    return _leer_status('VmRSS')
+
+
+def pico_rss_mb() -> Optional[float]:
+    """Pico de memoria residente del proceso en MB (None si no se puede medir)"""
+    pico = _leer_status('VmHWM')
+    if pico is not None:
+        return pico
+    try:
+        import resource
+    except ImportError:
+        return None
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    return maximo / 1024 ** 2 if sys.platform == 'darwin' else maximo / 1024
+
+
+def reiniciar_pico_rss() -> bool:
+    """
+    Reinicia el pico de RSS del proceso (Linux >= 4.0)
+
+    Returns:
+        True si se reinició; si no, el pico de cada etapa es el máximo
+        acumulado desde que empezó el proceso
+    """
+    try:
+        with open(f'/proc/{os.getpid()}/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class InformeMemoria:
+    """Registra, por etapa, la matriz resultante y el pico de RSS"""
+
+    def __init__(self):
+        self.etapas: List[Dict] = []
+
+    @contextmanager
+    def etapa(self, nombre: str):
+        """
+        Mide una etapa del pipeline
+
+        Uso:
+            with informe.etapa('vectorizar') as registro:
+                X = prep.vectorizar_textos(textos)
+                registro['matriz'] = X
+
+        Se puede asignar a registro['matriz'] la matriz que produce la
+        etapa para incluir su tamaño en el informe.
+        """
+        registro = {'etapa': nombre, 'matriz': None}
+        rss_inicial = rss_actual_mb()
+        pico_reiniciado = reiniciar_pico_rss()
+        inicio = time.perf_counter()
+        try:
+            yield registro
+        finally:
+            fila = {
+                'etapa': nombre,
+                'segundos': time.perf_counter() - inicio,
+                'rss_inicial_mb': rss_inicial,
+                'pico_rss_mb': pico_rss_mb(),
+                'pico_por_etapa': pico_reiniciado
+            }
+            if registro['matriz'] is not None:
+                fila.update(describir_matriz(registro['matriz']))
+            self.etapas.append(fila)
+
+    def agregar_matriz(self, nombre: str, X):
+        """Añade al informe una matriz que no corresponde a ninguna etapa medida"""
+        self.etapas.append({'etapa': nombre, **describir_matriz(X)})
+
+    def a_dataframe(self):
+        """
+        Devuelve el informe
+
+        Returns:
+            DataFrame con una fila por etapa
+        """
+        import pandas as pd
+        columnas = ['etapa', 'forma', 'dtype', 'indices', 'nnz', 'mb', 'segundos',
+                    'rss_inicial_mb', 'pico_rss_mb']
+        return pd.DataFrame(self.etapas).reindex(columns=columnas)
+
+    def mostrar(self):
+        """Imprime el informe como tabla"""
+        print(f"{'Etapa':<22}{'Forma':>16}{'dtype':>9}{'índices':>9}{'nnz':>12}"
+              f"{'MB':>9}{'s':>8}{'pico RSS MB':>13}")
+        print("-" * 98)
+        for fila in self.etapas:
+            pico = fila.get('pico_rss_mb')
+            pico = '-' if pico is None else f"{pico:.1f}" + ('' if fila.get('pico_por_etapa') else '*')
+            segundos = fila.get('segundos')
+            nnz = f"{fila['nnz']:,}" if 'nnz' in fila else '-'
+            mb = f"{fila['mb']:.2f}" if 'mb' in fila else '-'
+            print(f"{fila['etapa']:<22}{fila.get('forma', '-'):>16}{fila.get('dtype', '-'):>9}"
+                  f"{fila.get('indices', '-'):>9}{nnz:>12}{mb:>9}"
+                  f"{'-' if segundos is None else f'{segundos:.2f}':>8}{pico:>13}")
+        if any(fila.get('pico_por_etapa') is False for fila in self.etapas):
+            print("* pico acumulado del proceso (no se pudo reiniciar por etapa)")
@@ -0,0 +1,136 @@
+"""
+=======================================================
+MÓDULO: MÉTRICAS DEL SCRAPER - Tiempos por URL y por etapa
+=======================================================
+Este módulo recoge, para cada URL procesada por WebScraper, el tiempo
+de cada etapa (primer byte, descarga, parseo y limpieza), los bytes
+descargados, el código HTTP y el tipo de error, y los resume por host
+con percentiles p50/p95/p99 para localizar hosts lentos y etapas costosas
+"""
+
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import pandas as pd
+
+
+# Etapas medidas (segundos) en el orden en que ocurren
+ETAPAS = ['ttfb', 'descarga', 'parseo', 'limpieza']
+
+PERCENTILES = [0.5, 0.95, 0.99]
+
+
+def nueva_medicion(url: str) -> Dict:
+    """
+    Crea el registro vacío de una URL
+
+    Campos:
+        ttfb: Segundos hasta recibir las cabeceras de la respuesta. Incluye
+            DNS, conexión, TLS y reintentos, que requests no expone por separado
+        descarga: Segundos leyendo el cuerpo tras las cabeceras
+        bytes: Tamaño del cuerpo descargado
+        parseo / limpieza: Segundos de extracción HTML y de limpieza del texto
+        estado: Código HTTP (None si no hubo respuesta)
+        cache: 'acierto' si se reutilizó la extracción (304), 'fallo' si no
+        error: Nombre de la excepción, o None si la URL se procesó bien
+    """
+    return {
+        'url': url,
+        'host': urlparse(url).netloc.lower(),
+        'estado': None,
+        'ttfb': None,
+        'descarga': None,
+        'bytes': 0,
+        'parseo': None,
+        'limpieza': None,
+        'cache': None,
+        'error': None,
+    }
+
+
+class RegistroTiempos:
+    """Acumula las mediciones por URL del scraper (seguro entre hilos)"""
+
+    def __init__(self):
+        self._registros: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def agregar(self, medicion: Dict):
+        """Añade la medición de una URL"""
+        with self._lock:
+            self._registros.append(dict(medicion))
+
+    def __len__(self) -> int:
+        return len(self._registros)
+
+    def a_dataframe(self) -> pd.DataFrame:
+        """
+        Devuelve todas las mediciones
+
+        Returns:
+            DataFrame con una fila por URL y los tiempos en segundos
+        """
+        with self._lock:
+            registros = list(self._registros)
+        columnas = list(nueva_medicion('').keys())
+        return pd.DataFrame(registros, columns=columnas)
+
+    def resumen(self) -> pd.DataFrame:
+        """
+        Resume las mediciones por host
+
+        Returns:
+            DataFrame indexado por host con el número de URLs, errores,
+            aciertos de caché, bytes totales y los percentiles p50/p95/p99
+            de cada etapa en milisegundos
+        """
+        df = self.a_dataframe()
+        if df.empty:
+            return pd.DataFrame()
+
+        grupos = df.groupby('host')
+        resumen = pd.DataFrame({
+            'urls': grupos.size(),
+            'errores': grupos['error'].count(),
+            'aciertos_cache': grupos['cache'].apply(lambda c: (c == 'acierto').sum()),
+            'bytes': grupos['bytes'].sum(),
+        })
+
+        for etapa in ETAPAS:
+            cuantiles = grupos[etapa].quantile(PERCENTILES).unstack() * 1000
+            for p in PERCENTILES:
+                resumen[f'{etapa}_p{int(p * 100)}_ms'] = cuantiles[p]
+
+        return resumen.sort_values('ttfb_p95_ms', ascending=False)
+
+    def exportar(self, ruta: str, resumido: bool = False):
+        """
+        Guarda las mediciones (o su resumen por host) en CSV o JSON
+
+        Args:
+            ruta: Archivo de destino; el formato se elige por la extensión
+            resumido: Si es True, guarda `resumen()` en lugar de cada URL
+        """
+        df = self.resumen().reset_index() if resumido else self.a_dataframe()
+
+        if ruta.endswith('.json'):
+            df.to_json(ruta, orient='records', force_ascii=False, indent=2)
+        else:
+            df.to_csv(ruta, index=False, encoding='utf-8')
+        print(f"💾 Métricas guardadas en: {ruta}")
+
+    def limpiar(self):
+        """Descarta las mediciones acumuladas"""
+        with self._lock:
+            self._registros = []
+
+
+def registrar_error(medicion: Optional[Dict], error: Exception):
+    """Anota en la medición el tipo de error y, si lo hay, el código HTTP"""
+    if medicion is None:
+        return
+    medicion['error'] = type(error).__name__
+    response = getattr(error, 'response', None)
+    if response is not None and medicion['estado'] is None:
+        medicion['estado'] = response.status_code
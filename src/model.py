@@ -6,25 +6,73 @@ Este módulo entrena modelos para clasificar y agrupar textos
 """
 
 import numpy as np
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.linear_model import LogisticRegression
-from sklearn.cluster import KMeans
-from sklearn.metrics import classification_report, confusion_matrix, silhouette_score
-import joblib
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+from clustering import (TAM_MUESTRA_SILHOUETTE, CacheModelos, asignar_centros, barrido_k,
+                        crear_kmeans, metrica_silhouette, silhouette_muestreado)
+from memoria import compactar_indices, tipo_flotante
+
+# scikit-learn, joblib y las librerías de gráficos se importan dentro de
+# los métodos que las usan: un proceso que solo predice arranca más rápido
+
+
+def _reporte_desde_matriz(matriz: np.ndarray, categorias) -> dict:
+    """
+    Reporte de clasificación a partir de la matriz de confusión
+
+    Devuelve las mismas claves que classification_report(output_dict=True)
+    sin necesitar todas las predicciones en memoria (0 si no hay datos).
+    """
+    verdaderos = np.diag(matriz).astype(np.float64)
+    soporte = matriz.sum(axis=1)
+    predichos = matriz.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.nan_to_num(verdaderos / predichos)
+        recall = np.nan_to_num(verdaderos / soporte)
+        f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+
+    reporte = {}
+    for i, categoria in enumerate(categorias):
+        reporte[str(categoria)] = {'precision': precision[i], 'recall': recall[i],
+                                   'f1-score': f1[i], 'support': int(soporte[i])}
+    total = soporte.sum()
+    reporte['accuracy'] = verdaderos.sum() / total if total else 0.0
+    pesos = soporte / total if total else np.zeros(len(soporte))
+    reporte['macro avg'] = {'precision': precision.mean(), 'recall': recall.mean(),
+                            'f1-score': f1.mean(), 'support': int(total)}
+    reporte['weighted avg'] = {'precision': pesos @ precision, 'recall': pesos @ recall,
+                               'f1-score': pesos @ f1, 'support': int(total)}
+    return reporte
 
 
 class ModeloAprendizajeWeb:
     """Clase para entrenar modelos de clasificación y clustering"""
     
-    def __init__(self):
+    def __init__(self, dtype=None):
+        """
+        Args:
+            dtype: np.float32 o np.float64 para convertir las matrices antes
+                de entrenar y predecir (None = usar el tipo que traigan).
+                Con float32 los centros de clustering ocupan la mitad
+        """
         self.modelo_clasificacion = None
         self.modelo_clustering = None
+        self.algoritmo_clustering = None
+        self.centros_clustering = None
+        self.calidad_clustering = None
+        # Reducción LSA (TruncatedSVD) previa al clustering; None = sin reducción
+        self.reductor = None
+        self.curva_k = None
+        # Modelos ajustados en barridos de k anteriores (ver clustering.barrido_k)
+        self._cache_barrido = CacheModelos()
         self.categorias = None
+        self.dtype = None if dtype is None else tipo_flotante(dtype)
+    
+    def _preparar(self, X):
+        """Convierte X al dtype del modelo (sin copiar si ya lo tiene)"""
+        if self.dtype is not None and X.dtype != self.dtype:
+            X = X.astype(self.dtype)
+        return compactar_indices(X)
     
     def entrenar_clasificador(self, X, y, test_size=0.2):
         """
@@ -38,7 +86,12 @@ class ModeloAprendizajeWeb:
         Returns:
             Métricas de evaluación
         """
+        from sklearn.model_selection import train_test_split
+        from sklearn.naive_bayes import MultinomialNB
+        from sklearn.metrics import classification_report, confusion_matrix
+        
         print("🤖 Entrenando clasificador...")
+        X = self._preparar(X)
         
         # Calcular el tamaño mínimo necesario por clase
         n_samples = X.shape[0]
@@ -99,6 +152,114 @@ class ModeloAprendizajeWeb:
             'categorias': self.categorias
         }
     
+    def entrenar_clasificador_por_lotes(self, lotes, clases, algoritmo: str = 'nb',
+                                        fraccion_evaluacion: float = 0.2,
+                                        max_evaluacion: int = 50_000,
+                                        lotes_evaluacion=None, n_epocas: int = 1):
+        """
+        Entrena un clasificador con partial_fit, lote a lote, sin tener
+        nunca el corpus completo en memoria
+        
+        De cada lote se aparta al azar una fracción para evaluar (hasta
+        max_evaluacion filas en total; después se entrena con todo). Si se
+        pasa lotes_evaluacion, se evalúa con esos lotes y no se aparta nada.
+        Las métricas se acumulan en la matriz de confusión, así que la
+        memoria no depende del tamaño del corpus.
+        
+        Args:
+            lotes: Iterable de tuplas (X_lote, y_lote), por ejemplo de
+                `PreprocesadorTexto.generar_lotes`. Con n_epocas > 1 debe
+                ser una función que devuelva un iterable nuevo en cada época
+            clases: Todas las categorías posibles (partial_fit las necesita
+                desde el primer lote)
+            algoritmo: 'nb' (Naive Bayes Multinomial) o 'sgd' (regresión
+                logística entrenada con descenso de gradiente estocástico)
+            fraccion_evaluacion: Proporción de cada lote que se aparta para evaluar
+            max_evaluacion: Máximo de filas apartadas para evaluar
+            lotes_evaluacion: Iterable de tuplas (X_lote, y_lote) para evaluar
+            n_epocas: Pasadas sobre los lotes (solo útil con 'sgd')
+        
+        Returns:
+            Métricas de evaluación (las mismas claves que entrenar_clasificador)
+        """
+        import scipy.sparse as sp
+        
+        if algoritmo == 'nb':
+            from sklearn.naive_bayes import MultinomialNB
+            self.modelo_clasificacion = MultinomialNB()
+        elif algoritmo == 'sgd':
+            from sklearn.linear_model import SGDClassifier
+            # log_loss para poder usar predecir_con_probabilidad
+            self.modelo_clasificacion = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)
+        else:
+            raise ValueError("algoritmo debe ser 'nb' o 'sgd'")
+        
+        if n_epocas > 1 and not callable(lotes):
+            raise ValueError("Con n_epocas > 1, lotes debe ser una función que devuelva los lotes")
+        
+        self.categorias = np.unique(np.asarray(clases))
+        apartar = lotes_evaluacion is None and fraccion_evaluacion > 0
+        evaluacion_X, evaluacion_y = [], []
+        n_entrenadas = 0
+        
+        print(f"🤖 Entrenando clasificador por lotes ({algoritmo}, {n_epocas} época(s))...")
+        
+        for epoca in range(n_epocas):
+            # Misma semilla y mismo recuento en cada época: se apartan
+            # siempre las mismas filas y ninguna llega a entrenar
+            rng = np.random.default_rng(42)
+            n_apartadas = 0
+            for X_lote, y_lote in (lotes() if callable(lotes) else lotes):
+                X_lote = self._preparar(X_lote)
+                y_lote = np.asarray(y_lote)
+                
+                if apartar:
+                    evaluar = rng.random(len(y_lote)) < fraccion_evaluacion
+                    if n_apartadas >= max_evaluacion:
+                        evaluar[:] = False
+                    n_apartadas += int(evaluar.sum())
+                    if evaluar.any():
+                        if epoca == 0:
+                            evaluacion_X.append(X_lote[evaluar])
+                            evaluacion_y.append(y_lote[evaluar])
+                        X_lote, y_lote = X_lote[~evaluar], y_lote[~evaluar]
+                
+                if len(y_lote):
+                    self.modelo_clasificacion.partial_fit(X_lote, y_lote, classes=self.categorias)
+                    n_entrenadas += len(y_lote)
+        
+        if n_entrenadas == 0:
+            raise ValueError("No se recibió ningún lote para entrenar")
+        
+        if apartar:
+            if not evaluacion_y:
+                raise ValueError("No quedaron filas para evaluar: aumentar fraccion_evaluacion")
+            apilar = sp.vstack if sp.issparse(evaluacion_X[0]) else np.vstack
+            lotes_evaluacion = [(apilar(evaluacion_X), np.concatenate(evaluacion_y))]
+        
+        # Matriz de confusión acumulada lote a lote
+        posicion = {categoria: i for i, categoria in enumerate(self.categorias)}
+        matriz_confusion = np.zeros((len(self.categorias), len(self.categorias)), dtype=np.int64)
+        for X_lote, y_lote in lotes_evaluacion or []:
+            y_pred = self.modelo_clasificacion.predict(self._preparar(X_lote))
+            reales = np.array([posicion[y] for y in np.asarray(y_lote)], dtype=np.int64)
+            predichas = np.array([posicion[y] for y in y_pred], dtype=np.int64)
+            np.add.at(matriz_confusion, (reales, predichas), 1)
+        
+        if matriz_confusion.sum() == 0:
+            raise ValueError("No hay filas de evaluación")
+        
+        accuracy = np.trace(matriz_confusion) / matriz_confusion.sum()
+        print(f"✅ Entrenamiento completo ({n_entrenadas // n_epocas} filas de entrenamiento, "
+              f"{matriz_confusion.sum()} de evaluación) - Precisión: {accuracy:.2%}")
+        
+        return {
+            'accuracy': accuracy,
+            'reporte': _reporte_desde_matriz(matriz_confusion, self.categorias),
+            'matriz_confusion': matriz_confusion,
+            'categorias': self.categorias
+        }
+    
     def predecir(self, X) -> np.ndarray:
         """
         Realiza predicciones con el modelo entrenado
@@ -112,7 +273,7 @@ class ModeloAprendizajeWeb:
         if self.modelo_clasificacion is None:
             raise ValueError("El modelo no ha sido entrenado")
         
-        return self.modelo_clasificacion.predict(X)
+        return self.modelo_clasificacion.predict(self._preparar(X))
     
     def predecir_con_probabilidad(self, X) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -127,45 +288,162 @@ class ModeloAprendizajeWeb:
         if self.modelo_clasificacion is None:
             raise ValueError("El modelo no ha sido entrenado")
         
+        X = self._preparar(X)
         predicciones = self.modelo_clasificacion.predict(X)
         probabilidades = self.modelo_clasificacion.predict_proba(X)
         
         return predicciones, probabilidades
     
-    def entrenar_clustering(self, X, n_clusters: int = 3):
+    def ajustar_reduccion(self, X, n_componentes: int = 200):
+        """
+        Ajusta una reducción LSA: proyecta los documentos a n_componentes
+        dimensiones densas con SVD aleatorizado (TruncatedSVD)
+        
+        El clustering posterior se entrena sobre el espacio reducido y
+        `predecir_cluster` aplica la misma proyección. Al cambiar el
+        espacio, el clustering que hubiera deja de ser válido.
+        
+        Args:
+            X: Matriz de características (vectores TF-IDF)
+            n_componentes: Dimensiones del espacio reducido (como mucho, el
+                menor entre documentos y características menos uno)
+            
+        Returns:
+            Matriz densa reducida, con las filas normalizadas (L2)
+        """
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.preprocessing import normalize
+        
+        X = self._preparar(X)
+        # TruncatedSVD necesita menos componentes que documentos y que términos
+        n_componentes = max(1, min(n_componentes, min(X.shape) - 1))
+        print(f"📉 Reduciendo {X.shape[1]} características a {n_componentes} componentes (LSA)...")
+        
+        self.reductor = TruncatedSVD(n_components=n_componentes, algorithm='randomized',
+                                     random_state=42)
+        reducida = self.reductor.fit_transform(X)
+        self.modelo_clustering = None
+        self.centros_clustering = None
+        
+        print(f"✅ Varianza explicada: {self.reductor.explained_variance_ratio_.sum():.1%}")
+        return normalize(reducida, copy=False)
+    
+    def reducir(self, X):
+        """
+        Proyecta documentos al espacio reducido ajustado con `ajustar_reduccion`
+        
+        Returns:
+            Matriz densa (documentos x componentes) con las filas normalizadas
+        """
+        from sklearn.preprocessing import normalize
+        
+        if self.reductor is None:
+            raise ValueError("No hay una reducción ajustada (usar ajustar_reduccion)")
+        return normalize(self.reductor.transform(self._preparar(X)), copy=False)
+    
+    def entrenar_clustering(self, X, n_clusters=3, algoritmo: str = 'kmeans',
+                            tam_lote: int = 1024,
+                            tam_muestra_silhouette: Optional[int] = TAM_MUESTRA_SILHOUETTE,
+                            k_max: int = 10, presupuesto_s: Optional[float] = 60,
+                            top_terminos: Optional[int] = None,
+                            n_componentes: Optional[int] = None, n_jobs: int = 1):
         """
         Entrena un modelo de clustering (agrupamiento)
         
         Args:
             X: Matriz de características
-            n_clusters: Número de grupos
+            n_clusters: Número de grupos, o 'auto' para elegirlo con un
+                barrido de k entre 2 y k_max (la curva de puntuaciones queda
+                en self.curva_k)
+            algoritmo: 'kmeans', 'minibatch' (MiniBatchKMeans, para corpus
+                grandes) o 'esferico' (similitud coseno sobre la matriz
+                dispersa; centros normalizados)
+            tam_lote: Documentos por minilote (solo 'minibatch')
+            tam_muestra_silhouette: Documentos de la muestra estratificada con la
+                que se calcula el Silhouette (None = exacto con todos). El
+                intervalo de confianza queda en self.calidad_clustering
+            k_max: Mayor k probado con n_clusters='auto'
+            presupuesto_s: Segundos para el barrido de k
+            top_terminos: Con 'esferico', términos que conserva cada centro
+                (los centros pasan a ser una matriz dispersa)
+            n_componentes: Si se indica, se ajusta antes una reducción LSA con
+                esas dimensiones (ver ajustar_reduccion). Con una reducción
+                ya ajustada, el clustering se hace siempre en el espacio
+                reducido y los centros tienen una columna por componente
+            n_jobs: Procesos del barrido de k (1 = en el proceso actual,
+                adecuado para Streamlit; -1 = todos los núcleos en corpus grandes)
             
         Returns:
             Métricas de clustering
         """
-        print(f"🎯 Entrenando clustering con {n_clusters} grupos...")
-        
-        # Entrenar K-Means
-        self.modelo_clustering = KMeans(
-            n_clusters=n_clusters,
-            random_state=42,
-            n_init=10
-        )
+        if n_componentes is not None:
+            X = self.ajustar_reduccion(X, n_componentes)
+        elif self.reductor is not None:
+            X = self.reducir(X)
+        else:
+            X = self._preparar(X)
+        
+        if n_clusters == 'auto':
+            barrido = barrido_k(X, range(2, k_max + 1), algoritmo, tam_lote,
+                                tam_muestra_silhouette, presupuesto_s=presupuesto_s,
+                                n_jobs=n_jobs, cache=self._cache_barrido,
+                                top_terminos=top_terminos)
+            self.curva_k = barrido['curva']
+            n_clusters = barrido['mejor_k']
+            # El modelo del mejor k ya está ajustado
+            self.modelo_clustering = barrido['modelo']
+            clusters = self.modelo_clustering.labels_
+            print(f"🎯 Clustering con {n_clusters} grupos (elegido automáticamente)")
+        else:
+            print(f"🎯 Entrenando clustering con {n_clusters} grupos...")
+            
+            # Entrenar K-Means
+            self.modelo_clustering = crear_kmeans(n_clusters, algoritmo, tam_lote,
+                                                  top_terminos=top_terminos)
+            
+            clusters = self.modelo_clustering.fit_predict(X)
         
-        clusters = self.modelo_clustering.fit_predict(X)
+        self.algoritmo_clustering = algoritmo
+        self.centros_clustering = self.modelo_clustering.cluster_centers_
         
         # Calcular calidad del clustering
-        silhouette = silhouette_score(X, clusters)
+        self.calidad_clustering = silhouette_muestreado(X, clusters, tam_muestra_silhouette,
+                                                        metrica=metrica_silhouette(algoritmo))
+        silhouette = self.calidad_clustering['silhouette']
         
-        print(f"✅ Clustering completo - Coeficiente Silhouette: {silhouette:.3f}")
+        if self.calidad_clustering['exacto']:
+            print(f"✅ Clustering completo - Coeficiente Silhouette: {silhouette:.3f}")
+        else:
+            inferior, superior = self.calidad_clustering['intervalo']
+            print(f"✅ Clustering completo - Coeficiente Silhouette: {silhouette:.3f} "
+                  f"[{inferior:.3f}, {superior:.3f}] "
+                  f"(muestra de {self.calidad_clustering['tam_muestra']} documentos)")
         
         return {
             'clusters': clusters,
             'silhouette_score': silhouette,
             'n_clusters': n_clusters,
-            'centros': self.modelo_clustering.cluster_centers_
+            'centros': self.centros_clustering
         }
     
+    def predecir_cluster(self, X) -> np.ndarray:
+        """
+        Asigna documentos nuevos al cluster más cercano
+        
+        Aplica la reducción LSA si el clustering se entrenó con ella.
+        
+        Args:
+            X: Matriz de características (vectores TF-IDF)
+            
+        Returns:
+            Array con el cluster de cada documento
+        """
+        if self.centros_clustering is None:
+            raise ValueError("El modelo de clustering no ha sido entrenado")
+        
+        X = self.reducir(X) if self.reductor is not None else self._preparar(X)
+        return asignar_centros(X, self.centros_clustering, self.algoritmo_clustering)
+    
     def visualizar_matriz_confusion(self, matriz, categorias, guardar_path=None):
         """
         Visualiza la matriz de confusión
@@ -175,6 +453,9 @@ class ModeloAprendizajeWeb:
             categorias: Lista de nombres de categorías
             guardar_path: Ruta para guardar la imagen
         """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
         plt.figure(figsize=(10, 8))
         sns.heatmap(
             matriz, 
@@ -203,6 +484,8 @@ class ModeloAprendizajeWeb:
             clusters: Array de asignaciones de cluster
             guardar_path: Ruta para guardar la imagen
         """
+        import matplotlib.pyplot as plt
+        
         plt.figure(figsize=(10, 6))
         
         unique, counts = np.unique(clusters, return_counts=True)
@@ -225,14 +508,43 @@ class ModeloAprendizajeWeb:
     
     def guardar_modelo(self, ruta: str):
         """Guarda el modelo entrenado"""
+        import joblib
         if self.modelo_clasificacion:
             joblib.dump(self.modelo_clasificacion, ruta)
             print(f"💾 Modelo guardado en: {ruta}")
     
     def cargar_modelo(self, ruta: str):
         """Carga un modelo previamente guardado"""
+        import joblib
         self.modelo_clasificacion = joblib.load(ruta)
         print(f"📂 Modelo cargado desde: {ruta}")
+    
+    def guardar_paquete(self, directorio: str, preprocesador):
+        """
+        Guarda clasificador, categorías y preprocesador (con su vectorizador)
+        en una carpeta autosuficiente para predecir
+        
+        Args:
+            directorio: Carpeta de destino
+            preprocesador: PreprocesadorTexto con el vectorizador ajustado
+        """
+        from paquete_modelo import guardar_paquete
+        guardar_paquete(directorio, self, preprocesador)
+    
+    @staticmethod
+    def cargar_paquete(directorio: str, mmap_mode='r'):
+        """
+        Carga una carpeta guardada con `guardar_paquete`
+        
+        Args:
+            directorio: Carpeta del paquete
+            mmap_mode: 'r' para mapear los arrays en memoria, None para copiarlos
+            
+        Returns:
+            Tupla (ModeloAprendizajeWeb, PreprocesadorTexto)
+        """
+        from paquete_modelo import cargar_paquete
+        return cargar_paquete(directorio, mmap_mode)
 
 
 # ========================================
@@ -289,6 +601,16 @@ if __name__ == "__main__":
     print(f"\n🔮 Predicción para texto nuevo: '{texto_nuevo[0]}'")
     print(f"   Categoría predicha: {prediccion[0]}")
     
+    # Entrenamiento por lotes (corpus que no cabe en memoria)
+    print("\n\n📦 ENTRENAMIENTO POR LOTES")
+    print("-" * 60)
+    modelo_lotes = ModeloAprendizajeWeb()
+    lotes = [(X[i:i + 3], categorias[i:i + 3]) for i in range(0, X.shape[0], 3)]
+    metricas_lotes = modelo_lotes.entrenar_clasificador_por_lotes(
+        lotes, clases=categorias, algoritmo='sgd', lotes_evaluacion=[(X, categorias)]
+    )
+    print(f"🎯 Precisión (SGD por lotes): {metricas_lotes['accuracy']:.2%}")
+    
     # Clustering
     print("\n\n🎯 CLUSTERING NO SUPERVISADO")
     print("-" * 60)
@@ -0,0 +1,274 @@
+"""
+=======================================================
+MÓDULO: PAQUETE DEL MODELO - Artefacto único y versionado
+=======================================================
+Este módulo guarda en una carpeta todo lo necesario para predecir:
+configuración del preprocesador (con sus stopwords), vocabulario e IDF
+del vectorizador, parámetros del clasificador y categorías y, si los hay,
+la reducción LSA y los centros del clustering. Los arrays
+numéricos se guardan como .npy y se cargan con mmap_mode, así el
+arranque es rápido y varios procesos comparten las mismas páginas
+"""
+
+import importlib
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from model import ModeloAprendizajeWeb
+from preprocessing import (PreprocesadorTexto, VectorizadorHashing,
+                           VectorizadorIncremental, VERSION_PIPELINE)
+
+
+# Cambiar al modificar el formato de la carpeta. Historial:
+#   1: preprocesador, vectorizador, clasificador y categorías
+#   2: 'dtype' (del modelo y del vectorizador) y, opcionales, 'reductor' y
+#      'clustering'. Los paquetes del esquema 1 se siguen cargando
+VERSION_ESQUEMA = 2
+
+PARAMETROS_TFIDF = ['lowercase', 'strip_accents', 'token_pattern', 'ngram_range', 'analyzer',
+                    'binary', 'norm', 'use_idf', 'smooth_idf', 'sublinear_tf']
+
+
+def _a_json(valor):
+    """Convierte escalares y tuplas de numpy a tipos de JSON"""
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, tuple):
+        return list(valor)
+    return valor
+
+
+def _guardar_estimador(estimador, directorio: str, prefijo: str) -> Dict:
+    """
+    Guarda un estimador de scikit-learn ajustado
+
+    Los atributos aprendidos (terminados en '_') que son arrays numéricos
+    van a archivos .npy; el resto, al manifiesto.
+
+    Returns:
+        Descripción del estimador para el manifiesto
+    """
+    clase = type(estimador)
+    descripcion = {
+        'clase': f"{clase.__module__}.{clase.__qualname__}",
+        'parametros': {k: _a_json(v) for k, v in estimador.get_params(deep=False).items()},
+        'atributos': {},
+        'arrays': []
+    }
+
+    for nombre, valor in vars(estimador).items():
+        if not nombre.endswith('_') or nombre.startswith('_'):
+            continue
+        if isinstance(valor, np.ndarray) and valor.dtype != object:
+            np.save(os.path.join(directorio, f"{prefijo}_{nombre}.npy"), valor)
+            descripcion['arrays'].append(nombre)
+        elif isinstance(valor, np.ndarray):
+            descripcion['atributos'][nombre] = {'lista': valor.tolist()}
+        else:
+            descripcion['atributos'][nombre] = _a_json(valor)
+
+    return descripcion
+
+
+def _cargar_estimador(descripcion: Dict, directorio: str, prefijo: str,
+                      mmap_mode: Optional[str]):
+    """Reconstruye un estimador guardado con `_guardar_estimador`"""
+    modulo, _, nombre_clase = descripcion['clase'].rpartition('.')
+    if not modulo.startswith('sklearn.'):
+        raise ValueError(f"Clase de estimador no permitida: {descripcion['clase']}")
+
+    clase = getattr(importlib.import_module(modulo), nombre_clase)
+    estimador = clase(**descripcion['parametros'])
+
+    for nombre, valor in descripcion['atributos'].items():
+        if isinstance(valor, dict) and 'lista' in valor:
+            valor = np.array(valor['lista'])
+        setattr(estimador, nombre, valor)
+    for nombre in descripcion['arrays']:
+        setattr(estimador, nombre,
+                np.load(os.path.join(directorio, f"{prefijo}_{nombre}.npy"), mmap_mode=mmap_mode))
+
+    return estimador
+
+
+def _guardar_vectorizador(vectorizador, directorio: str) -> Dict:
+    """Guarda vocabulario e IDF del vectorizador (TF-IDF, incremental o hashing)"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    if isinstance(vectorizador, VectorizadorHashing):
+        np.save(os.path.join(directorio, 'vectorizador_df.npy'), vectorizador.df)
+        return {
+            'tipo': 'hashing',
+            'parametros': {
+                'n_features': vectorizador.n_features,
+                'ngram_range': list(vectorizador.hasher.ngram_range),
+                'min_df': vectorizador.min_df,
+                'max_df': vectorizador.max_df,
+                'dtype': np.dtype(vectorizador.dtype).name
+            },
+            'n_documentos': vectorizador.n_documentos
+        }
+
+    if isinstance(vectorizador, VectorizadorIncremental):
+        # Se guarda como un TfidfVectorizer equivalente: todo el vocabulario,
+        # con IDF 0 en los términos podados, para conservar las columnas
+        terminos = vectorizador.get_feature_names_out()
+        parametros = {'ngram_range': list(vectorizador.ngram_range),
+                      'dtype': np.dtype(getattr(vectorizador, 'dtype', np.float64)).name}
+    elif isinstance(vectorizador, TfidfVectorizer):
+        terminos = vectorizador.get_feature_names_out()
+        parametros = {p: _a_json(getattr(vectorizador, p)) for p in PARAMETROS_TFIDF}
+        parametros['dtype'] = np.dtype(vectorizador.dtype).name
+    else:
+        raise ValueError(f"Vectorizador no soportado: {type(vectorizador).__name__}")
+
+    np.save(os.path.join(directorio, 'vectorizador_idf.npy'),
+            np.asarray(vectorizador.idf_, dtype=parametros['dtype']))
+    with open(os.path.join(directorio, 'terminos.txt'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(terminos))
+    return {'tipo': 'tfidf', 'parametros': parametros, 'n_terminos': len(terminos)}
+
+
+def _cargar_vectorizador(descripcion: Dict, directorio: str, mmap_mode: Optional[str]):
+    """Reconstruye el vectorizador guardado con `_guardar_vectorizador`"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    parametros = dict(descripcion['parametros'])
+    parametros['ngram_range'] = tuple(parametros['ngram_range'])
+    # Los paquetes anteriores a float32 no guardaban el tipo
+    parametros['dtype'] = np.dtype(parametros.get('dtype', 'float64')).type
+
+    if descripcion['tipo'] == 'hashing':
+        vectorizador = VectorizadorHashing(**parametros)
+        vectorizador.df = np.load(os.path.join(directorio, 'vectorizador_df.npy'), mmap_mode=mmap_mode)
+        vectorizador.n_documentos = descripcion['n_documentos']
+        return vectorizador
+
+    with open(os.path.join(directorio, 'terminos.txt'), encoding='utf-8') as f:
+        terminos = f.read().split('\n') if descripcion['n_terminos'] else []
+    vectorizador = TfidfVectorizer(vocabulary={t: i for i, t in enumerate(terminos)}, **parametros)
+    vectorizador.idf_ = np.load(os.path.join(directorio, 'vectorizador_idf.npy'), mmap_mode=mmap_mode)
+    return vectorizador
+
+
+def _guardar_centros(modelo: ModeloAprendizajeWeb, directorio: str) -> Dict:
+    """Guarda los centros del clustering (.npy, o .npz si están podados y son dispersos)"""
+    centros = modelo.centros_clustering
+    disperso = hasattr(centros, 'tocsr')
+    if disperso:
+        import scipy.sparse as sp
+        sp.save_npz(os.path.join(directorio, 'clustering_centros.npz'), centros.tocsr())
+    else:
+        np.save(os.path.join(directorio, 'clustering_centros.npy'), np.asarray(centros))
+    return {'algoritmo': modelo.algoritmo_clustering, 'disperso': disperso}
+
+
+def _cargar_centros(descripcion: Dict, directorio: str, mmap_mode: Optional[str]):
+    """Carga los centros guardados con `_guardar_centros`"""
+    if descripcion['disperso']:
+        import scipy.sparse as sp
+        return sp.load_npz(os.path.join(directorio, 'clustering_centros.npz')).tocsr()
+    return np.load(os.path.join(directorio, 'clustering_centros.npy'), mmap_mode=mmap_mode)
+
+
+def guardar_paquete(directorio: str, modelo: ModeloAprendizajeWeb,
+                    preprocesador: PreprocesadorTexto):
+    """
+    Guarda preprocesador, vectorizador, clasificador y categorías en una carpeta
+    (y, si el modelo los tiene, la reducción LSA y los centros del clustering)
+
+    La carpeta se escribe primero con otro nombre y luego se renombra,
+    así un proceso que la esté leyendo nunca ve un paquete a medias.
+
+    Args:
+        directorio: Carpeta de destino (se reemplaza si existe)
+        modelo: Modelo con el clasificador entrenado
+        preprocesador: Preprocesador con el vectorizador ajustado
+    """
+    if modelo.modelo_clasificacion is None:
+        raise ValueError("El modelo no ha sido entrenado")
+    if preprocesador.vectorizer is None:
+        raise ValueError("El preprocesador no tiene un vectorizador ajustado")
+
+    temporal = directorio.rstrip(os.sep) + '.tmp'
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+
+    manifiesto = {
+        'version_esquema': VERSION_ESQUEMA,
+        'creado': datetime.now(timezone.utc).isoformat(),
+        'preprocesador': {
+            'idioma': preprocesador.idioma,
+            'modo': preprocesador.modo,
+            'version_pipeline': VERSION_PIPELINE,
+            'stop_words': sorted(preprocesador.stop_words)
+        },
+        'vectorizador': _guardar_vectorizador(preprocesador.vectorizer, temporal),
+        'clasificador': _guardar_estimador(modelo.modelo_clasificacion, temporal, 'clasificador'),
+        'categorias': [_a_json(c) for c in modelo.categorias],
+        'dtype': None if modelo.dtype is None else np.dtype(modelo.dtype).name
+    }
+    if modelo.reductor is not None:
+        manifiesto['reductor'] = _guardar_estimador(modelo.reductor, temporal, 'reductor')
+    if modelo.centros_clustering is not None:
+        manifiesto['clustering'] = _guardar_centros(modelo, temporal)
+    with open(os.path.join(temporal, 'manifiesto.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+
+    anterior = directorio.rstrip(os.sep) + '.anterior'
+    if os.path.exists(directorio):
+        shutil.rmtree(anterior, ignore_errors=True)
+        os.replace(directorio, anterior)
+    os.replace(temporal, directorio)
+    shutil.rmtree(anterior, ignore_errors=True)
+
+    print(f"💾 Paquete del modelo guardado en: {directorio}")
+
+
+def cargar_paquete(directorio: str, mmap_mode: Optional[str] = 'r'
+                   ) -> Tuple[ModeloAprendizajeWeb, PreprocesadorTexto]:
+    """
+    Carga un paquete guardado con `guardar_paquete`
+
+    Args:
+        directorio: Carpeta del paquete
+        mmap_mode: Modo de numpy.load para los arrays ('r' = mapeados en
+            memoria de solo lectura; None = copiarlos a memoria)
+
+    Returns:
+        Tupla (modelo listo para predecir, preprocesador con su vectorizador)
+    """
+    with open(os.path.join(directorio, 'manifiesto.json'), encoding='utf-8') as f:
+        manifiesto = json.load(f)
+
+    if manifiesto['version_esquema'] > VERSION_ESQUEMA:
+        raise ValueError(f"El paquete usa el esquema {manifiesto['version_esquema']}; "
+                         f"esta versión solo entiende hasta el {VERSION_ESQUEMA}")
+
+    config = manifiesto['preprocesador']
+    if config['version_pipeline'] != VERSION_PIPELINE:
+        print(f"⚠️ El paquete se creó con el pipeline {config['version_pipeline']} "
+              f"(actual: {VERSION_PIPELINE}); las predicciones pueden variar")
+
+    preprocesador = PreprocesadorTexto(config['idioma'], stop_words=set(config['stop_words']),
+                                       modo=config['modo'])
+    preprocesador.vectorizer = _cargar_vectorizador(manifiesto['vectorizador'], directorio, mmap_mode)
+
+    # El esquema 1 no guardaba el dtype (ni reducción ni clustering)
+    modelo = ModeloAprendizajeWeb(dtype=manifiesto.get('dtype'))
+    modelo.modelo_clasificacion = _cargar_estimador(manifiesto['clasificador'], directorio,
+                                                    'clasificador', mmap_mode)
+    modelo.categorias = np.array(manifiesto['categorias'])
+    if 'reductor' in manifiesto:
+        modelo.reductor = _cargar_estimador(manifiesto['reductor'], directorio, 'reductor', mmap_mode)
+    if 'clustering' in manifiesto:
+        modelo.algoritmo_clustering = manifiesto['clustering']['algoritmo']
+        modelo.centros_clustering = _cargar_centros(manifiesto['clustering'], directorio, mmap_mode)
+
+    print(f"📂 Paquete del modelo cargado desde: {directorio}")
+    return modelo, preprocesador
@@ -5,33 +5,589 @@ MÓDULO 2: PREPROCESAMIENTO - Limpieza y Transformación
 Este módulo prepara el texto para el modelo de ML
 """
 
+import hashlib
+import json
+import os
 import re
-import pandas as pd
 import numpy as np
-from typing import List
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import SnowballStemmer
-from sklearn.feature_extraction.text import TfidfVectorizer
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+from cache_preprocesado import CachePreprocesado
+from memoria import compactar_indices, tipo_flotante
+
+# NLTK, scikit-learn, scipy y joblib se importan solo donde se usan: un
+# proceso que únicamente predice no paga el coste de importarlos todos
+if TYPE_CHECKING:
+    import scipy.sparse as sp
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from almacen_terminos import AlmacenTerminos
+
+
+# Listas de stopwords incluidas en el repositorio (no requieren descargas)
+RUTA_STOPWORDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recursos', 'stopwords')
+
+
+# Modo rápido: URLs y números se eliminan en una sola pasada y las
+# palabras son las secuencias de \w que quedan (equivale a limpiar_texto
+# seguido de word_tokenize, ya que no queda puntuación que separar)
+PATRON_RUIDO = re.compile(r'http\S+|www\S+|\d+')
+PATRON_PALABRA = re.compile(r'\w+')
+
+# Contracciones que el tokenizador Treebank de NLTK separa aunque el texto
+# ya no tenga puntuación; se replican para obtener los mismos tokens
+CONTRACCIONES_TREEBANK = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na'),
+}
+
+MODOS = ('rapido', 'nltk')
+
+# Cambiar al modificar el resultado del preprocesamiento: invalida la
+# caché de textos procesados en disco
+VERSION_PIPELINE = '1'
+
+# Con n_jobs=-1, por debajo de este número de textos arrancar el pool de
+# procesos cuesta más que procesarlos en el proceso actual
+MIN_TEXTOS_PARALELO = 2000
+
+
+def cargar_stopwords(idioma: str) -> set:
+    """
+    Carga las stopwords de un idioma sin acceder a la red
+    
+    Se usa la lista incluida en src/recursos/stopwords/ y, si el idioma no
+    está, el corpus de NLTK ya instalado.
+    
+    Args:
+        idioma: Nombre del idioma en NLTK ('spanish', 'english'...)
+        
+    Returns:
+        Conjunto de stopwords
+    """
+    ruta = os.path.join(RUTA_STOPWORDS, os.path.basename(idioma) + '.txt')
+    if os.path.exists(ruta):
+        with open(ruta, encoding='utf-8') as f:
+            return {linea.strip() for linea in f if linea.strip()}
+    
+    try:
+        from nltk.corpus import stopwords
+        return set(stopwords.words(idioma))
+    except (LookupError, OSError):
+        raise LookupError(
+            f"No hay stopwords para '{idioma}': añadir {ruta} o instalar el corpus "
+            f"de NLTK con `python -m nltk.downloader stopwords`"
+        )
+
+
+# Preprocesador de cada proceso worker (se crea una sola vez por proceso)
+_preprocesador_worker = None
+
+
+def _inicializar_worker(idioma: str, stop_words: set, tam_cache_stems: int,
+                        raices: Dict[str, str], modo: str):
+    """Crea el stemmer, las stopwords y la caché de raíces del proceso worker"""
+    global _preprocesador_worker
+    _preprocesador_worker = PreprocesadorTexto(idioma, stop_words=stop_words,
+                                               tam_cache_stems=tam_cache_stems, modo=modo)
+    if _preprocesador_worker.cache_stems is not None:
+        # Arrancar con las raíces ya conocidas por el proceso principal
+        _preprocesador_worker.cache_stems.actualizar(raices)
+        _preprocesador_worker.cache_stems.registrar_nuevas = True
+
+
+def _procesar_bloque_en_worker(textos: List[str]):
+    """
+    Procesa un bloque de textos en el worker
+
+    Returns:
+        Tupla (textos procesados, raíces nuevas, aciertos, fallos) para que
+        el proceso principal incorpore a su caché lo aprendido en el bloque
+    """
+    cache = _preprocesador_worker.cache_stems
+    procesados = [_preprocesador_worker.procesar_texto(texto) for texto in textos]
+    if cache is None:
+        return procesados, {}, 0, 0
+    return procesados, cache.extraer_nuevas(), *cache.extraer_contadores()
+
+
+def _contar_bloque(hasher: 'HashingVectorizer', textos: List[str]) -> 'sp.csr_matrix':
+    """Cuenta los términos de un bloque de textos (se ejecuta en un worker)"""
+    return hasher.transform(textos)
+
+
+class VectorizadorHashing:
+    """TF-IDF sin vocabulario: hashing de términos e IDF acumulado por bloques"""
+    
+    def __init__(self, n_features: int = 2 ** 18, ngram_range=(1, 2), min_df: int = 1,
+                 max_df: float = 1.0, n_jobs: int = 1, tam_bloque: int = 10_000,
+                 dtype=np.float64):
+        """
+        Args:
+            n_features: Columnas de la matriz (cubetas de hash)
+            ngram_range: Rango de n-gramas, como en TfidfVectorizer
+            min_df: Documentos mínimos en los que debe aparecer una columna
+            max_df: Fracción máxima de documentos en los que puede aparecer
+            n_jobs: Procesos que cuentan bloques en paralelo (1 = sin paralelismo)
+            tam_bloque: Textos por bloque
+            dtype: Tipo de los valores de la matriz (np.float64 o np.float32)
+        """
+        from sklearn.feature_extraction.text import HashingVectorizer
+        
+        self.n_features = n_features
+        self.min_df = min_df
+        self.max_df = max_df
+        self.n_jobs = n_jobs
+        self.tam_bloque = tam_bloque
+        self.dtype = tipo_flotante(dtype)
+        
+        # Sin estado: cada bloque se puede contar por separado
+        self.hasher = HashingVectorizer(n_features=n_features, ngram_range=ngram_range,
+                                        alternate_sign=False, norm=None, dtype=self.dtype)
+        self.df = np.zeros(n_features, dtype=np.int64)
+        self.n_documentos = 0
+    
+    def _bloques(self, textos: Iterable[str]):
+        iterador = iter(textos)
+        while True:
+            bloque = list(islice(iterador, self.tam_bloque))
+            if not bloque:
+                return
+            yield bloque
+    
+    def _contar(self, textos: Iterable[str]) -> Iterable['sp.csr_matrix']:
+        """Matrices de frecuencias de cada bloque, en orden"""
+        if self.n_jobs == 1:
+            for bloque in self._bloques(textos):
+                yield _contar_bloque(self.hasher, bloque)
+            return
+        
+        # Como mucho 2 bloques pendientes por worker: la memoria no depende
+        # del tamaño del corpus
+        n_jobs = self.n_jobs if self.n_jobs > 0 else (os.cpu_count() or 1)
+        pendientes = deque()
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            for bloque in self._bloques(textos):
+                pendientes.append(executor.submit(_contar_bloque, self.hasher, bloque))
+                if len(pendientes) >= 2 * n_jobs:
+                    yield pendientes.popleft().result()
+            while pendientes:
+                yield pendientes.popleft().result()
+    
+    def _acumular(self, conteos: 'sp.csr_matrix'):
+        """Suma la frecuencia documental de un bloque ya contado"""
+        self.df += np.bincount(conteos.indices, minlength=self.n_features)
+        self.n_documentos += conteos.shape[0]
+    
+    def partial_fit(self, textos: Iterable[str]):
+        """Actualiza el IDF con nuevos textos sin guardar sus vectores"""
+        for conteos in self._contar(textos):
+            self._acumular(conteos)
+        return self
+    
+    @property
+    def idf_(self) -> np.ndarray:
+        """IDF suavizado (igual que TfidfVectorizer); 0 en las columnas descartadas"""
+        idf = np.log((1 + self.n_documentos) / (1 + self.df)) + 1
+        descartadas = (self.df < self.min_df) | (self.df > self.max_df * self.n_documentos)
+        idf[descartadas] = 0.0
+        return idf
+    
+    def _ponderar(self, conteos: 'sp.csr_matrix') -> 'sp.csr_matrix':
+        import scipy.sparse as sp
+        from sklearn.preprocessing import normalize
+        
+        vectores = conteos @ sp.diags(self.idf_.astype(self.dtype))
+        vectores.eliminate_zeros()
+        return normalize(vectores.tocsr(), norm='l2', copy=False)
+    
+    def fit_transform(self, textos: Iterable[str]) -> 'sp.csr_matrix':
+        """
+        Calcula el IDF de los textos y devuelve su matriz TF-IDF
+        
+        Args:
+            textos: Textos procesados (lista o cualquier iterable)
+            
+        Returns:
+            Matriz CSR de documentos x n_features
+        """
+        import scipy.sparse as sp
+        
+        self.df[:] = 0
+        self.n_documentos = 0
+        
+        bloques = []
+        for conteos in self._contar(textos):
+            self._acumular(conteos)
+            bloques.append(conteos)
+        
+        if not bloques:
+            return sp.csr_matrix((0, self.n_features), dtype=self.dtype)
+        return self._ponderar(sp.vstack(bloques, format='csr'))
+    
+    def transform(self, textos: Iterable[str]) -> 'sp.csr_matrix':
+        """Vectoriza textos nuevos con el IDF acumulado"""
+        import scipy.sparse as sp
+        
+        bloques = list(self._contar(textos))
+        if not bloques:
+            return sp.csr_matrix((0, self.n_features), dtype=self.dtype)
+        return self._ponderar(sp.vstack(bloques, format='csr'))
+
+
+class VectorizadorIncremental:
+    """
+    TF-IDF que se actualiza con lotes nuevos sin reajustar todo el corpus
+
+    Cada término ocupa siempre la misma columna (su índice en
+    `vocabulario_`); los términos podados por min_df/max_df/max_features
+    dan columnas a cero. Así, las matrices de lotes anteriores y los
+    modelos entrenados con ellas siguen alineados con las nuevas.
+    """
+    
+    def __init__(self, ngram_range=(1, 2), min_df: int = 1, max_df: float = 1.0,
+                 max_features: Optional[int] = None, dtype=np.float64):
+        """
+        Args:
+            ngram_range: Rango de n-gramas, como en TfidfVectorizer
+            min_df: Documentos mínimos en los que debe aparecer un término
+            max_df: Fracción máxima de documentos en los que puede aparecer
+            max_features: Términos conservados, los más frecuentes del corpus.
+                Los empates se resuelven igual que en TfidfVectorizer
+            dtype: Tipo de los valores de la matriz (np.float64 o np.float32)
+        """
+        self.ngram_range = ngram_range
+        self.min_df = min_df
+        self.max_df = max_df
+        self.max_features = max_features
+        self.dtype = tipo_flotante(dtype)
+        
+        # Índice estable de cada término: los términos nuevos se añaden al final
+        self.vocabulario_: Dict[str, int] = {}
+        self._df = np.zeros(1024, dtype=np.int64)
+        self._tf = np.zeros(1024, dtype=np.int64)
+        self.n_documentos = 0
+        self._seleccion = None
+    
+    def _analizador(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        return TfidfVectorizer(ngram_range=self.ngram_range).build_analyzer()
+    
+    def partial_fit(self, textos: Iterable[str]):
+        """
+        Añade un lote de textos a las frecuencias del corpus
+        
+        El coste depende solo del tamaño del lote; la poda por
+        min_df/max_df/max_features se recalcula al vectorizar.
+        
+        Args:
+            textos: Textos procesados nuevos
+        """
+        analizar = self._analizador()
+        df_lote, tf_lote = Counter(), Counter()
+        for texto in textos:
+            terminos = Counter(analizar(texto))
+            tf_lote.update(terminos)
+            df_lote.update(terminos.keys())
+            self.n_documentos += 1
+        
+        for termino in df_lote:
+            if termino not in self.vocabulario_:
+                self.vocabulario_[termino] = len(self.vocabulario_)
+        
+        # Ampliar los contadores duplicando su capacidad
+        if len(self.vocabulario_) > len(self._df):
+            capacidad = max(len(self.vocabulario_), 2 * len(self._df))
+            self._df = np.concatenate([self._df, np.zeros(capacidad - len(self._df), dtype=np.int64)])
+            self._tf = np.concatenate([self._tf, np.zeros(capacidad - len(self._tf), dtype=np.int64)])
+        
+        ids = np.fromiter((self.vocabulario_[t] for t in df_lote), dtype=np.int64, count=len(df_lote))
+        self._df[ids] += np.fromiter(df_lote.values(), dtype=np.int64, count=len(df_lote))
+        self._tf[ids] += np.fromiter((tf_lote[t] for t in df_lote), dtype=np.int64, count=len(df_lote))
+        
+        self._seleccion = None
+        return self
+    
+    def _seleccionar(self) -> np.ndarray:
+        """Índices estables de los términos que superan la poda (en orden)"""
+        if self._seleccion is not None:
+            return self._seleccion
+        
+        n_terminos = len(self.vocabulario_)
+        df = self._df[:n_terminos]
+        max_docs = self.max_df if isinstance(self.max_df, int) else self.max_df * self.n_documentos
+        candidatos = np.flatnonzero((df >= self.min_df) & (df <= max_docs))
+        
+        if self.max_features is not None and len(candidatos) > self.max_features:
+            # Los más frecuentes del corpus, con la misma operación que
+            # TfidfVectorizer (argsort sobre los candidatos en orden
+            # alfabético) para que los empates se resuelvan igual
+            nombres = np.array(list(self.vocabulario_), dtype=object)[candidatos]
+            candidatos = candidatos[np.argsort(nombres, kind='stable')]
+            elegidos = (-self._tf[candidatos]).argsort()[:self.max_features]
+            candidatos = np.sort(candidatos[elegidos])
+        
+        self._seleccion = candidatos
+        return candidatos
+    
+    @property
+    def idf_(self) -> np.ndarray:
+        """
+        IDF suavizado de cada término del vocabulario (igual que
+        TfidfVectorizer); 0 en los términos podados
+        """
+        n_terminos = len(self.vocabulario_)
+        idf = np.zeros(n_terminos)
+        seleccion = self._seleccionar()
+        idf[seleccion] = np.log((1 + self.n_documentos) / (1 + self._df[seleccion])) + 1
+        return idf
+    
+    def get_feature_names_out(self) -> np.ndarray:
+        """Términos de cada columna de la matriz (todo el vocabulario)"""
+        return np.array(list(self.vocabulario_), dtype=object)
+    
+    def terminos_seleccionados(self) -> np.ndarray:
+        """Términos que superan la poda actual (las columnas no nulas)"""
+        return self.get_feature_names_out()[self._seleccionar()]
+    
+    def transform(self, textos: Iterable[str], n_columnas: Optional[int] = None) -> 'sp.csr_matrix':
+        """
+        Vectoriza textos con el vocabulario y el IDF actuales
+        
+        La columna de cada término es su índice estable, que no cambia al
+        añadir lotes ni al recalcular la poda; las columnas de términos
+        podados quedan a cero. Como el vocabulario solo crece, la matriz
+        de un lote anterior equivale a las primeras columnas de la actual.
+        
+        Args:
+            textos: Textos procesados
+            n_columnas: Número de columnas de la matriz (por defecto, el
+                tamaño actual del vocabulario). Un modelo entrenado con
+                n columnas puede seguir usándose pasando n_columnas=n: se
+                descartan los términos añadidos después
+        
+        Returns:
+            Matriz CSR de documentos x n_columnas
+        """
+        import scipy.sparse as sp
+        from sklearn.preprocessing import normalize
+        
+        n_columnas = len(self.vocabulario_) if n_columnas is None else n_columnas
+        idf = self.idf_
+        if len(idf) < n_columnas:
+            idf = np.concatenate([idf, np.zeros(n_columnas - len(idf))])
+        idf = idf[:n_columnas]
+        
+        analizar = self._analizador()
+        indices, datos, punteros = [], [], [0]
+        for texto in textos:
+            for termino, cuenta in Counter(analizar(texto)).items():
+                indice = self.vocabulario_.get(termino)
+                if indice is not None and indice < n_columnas and idf[indice] > 0:
+                    indices.append(indice)
+                    datos.append(cuenta)
+            punteros.append(len(indices))
+        
+        # Los vectorizadores guardados antes de admitir float32 no tienen dtype
+        dtype = getattr(self, 'dtype', np.float64)
+        conteos = sp.csr_matrix((np.array(datos, dtype=dtype), np.array(indices, dtype=np.int64),
+                                 np.array(punteros, dtype=np.int64)),
+                                shape=(len(punteros) - 1, n_columnas))
+        conteos.sort_indices()
+        vectores = conteos @ sp.diags(idf.astype(dtype))
+        return normalize(vectores.tocsr(), norm='l2', copy=False)
+    
+    def fit_transform(self, textos: List[str]) -> 'sp.csr_matrix':
+        """Añade los textos al corpus y devuelve su matriz TF-IDF"""
+        textos = list(textos)
+        return self.partial_fit(textos).transform(textos)
+    
+    def guardar(self, ruta: str):
+        """Guarda el vectorizador (vocabulario y frecuencias) con joblib"""
+        import joblib
+        joblib.dump(self, ruta)
+        print(f"💾 Vectorizador guardado en: {ruta}")
+    
+    @staticmethod
+    def cargar(ruta: str) -> 'VectorizadorIncremental':
+        """Carga un vectorizador guardado con `guardar`"""
+        import joblib
+        return joblib.load(ruta)
+
+
+class CacheStems:
+    """Caché LRU token -> raíz para no repetir el stemming de palabras frecuentes"""
+    
+    def __init__(self, stemmer, tam_max: int = 100_000):
+        """
+        Args:
+            stemmer: Stemmer de NLTK usado para los tokens no guardados
+            tam_max: Número máximo de tokens guardados; al superarlo se
+                descartan los usados hace más tiempo
+        """
+        self.stemmer = stemmer
+        self.tam_max = tam_max
+        self._raices: OrderedDict = OrderedDict()
+        self._nuevas: Dict[str, str] = {}
+        # Solo los workers anotan las raíces nuevas para devolverlas
+        self.registrar_nuevas = False
+        self.aciertos = 0
+        self.fallos = 0
+    
+    def stem(self, token: str) -> str:
+        """Devuelve la raíz del token, calculándola solo la primera vez"""
+        raiz = self._raices.get(token)
+        if raiz is not None:
+            self._raices.move_to_end(token)
+            self.aciertos += 1
+            return raiz
+        
+        self.fallos += 1
+        raiz = self.stemmer.stem(token)
+        self._raices[token] = raiz
+        if self.registrar_nuevas:
+            self._nuevas[token] = raiz
+        if len(self._raices) > self.tam_max:
+            self._raices.popitem(last=False)
+        return raiz
+    
+    def __len__(self) -> int:
+        return len(self._raices)
+    
+    def a_diccionario(self) -> Dict[str, str]:
+        """Copia de las raíces guardadas, de la menos a la más usada recientemente"""
+        return dict(self._raices)
+    
+    def actualizar(self, raices: Dict[str, str]):
+        """Añade raíces ya calculadas (por ejemplo, de otro proceso)"""
+        for token, raiz in raices.items():
+            self._raices[token] = raiz
+            self._raices.move_to_end(token)
+        while len(self._raices) > self.tam_max:
+            self._raices.popitem(last=False)
+    
+    def extraer_nuevas(self) -> Dict[str, str]:
+        """Devuelve las raíces calculadas desde la última llamada y las olvida"""
+        nuevas, self._nuevas = self._nuevas, {}
+        return nuevas
+    
+    def extraer_contadores(self):
+        """Devuelve (aciertos, fallos) desde la última llamada y los reinicia"""
+        contadores = (self.aciertos, self.fallos)
+        self.aciertos = self.fallos = 0
+        return contadores
+    
+    def estadisticas(self) -> Dict:
+        """
+        Resume el uso de la caché
+        
+        Returns:
+            Diccionario con aciertos, fallos, tasa de acierto y número de tokens
+        """
+        total = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_acierto': self.aciertos / total if total else 0.0,
+            'tokens': len(self._raices)
+        }
+    
+    def guardar(self, ruta: str, idioma: str):
+        """
+        Guarda las raíces en un archivo JSON de forma atómica
+        
+        Args:
+            ruta: Archivo de destino
+            idioma: Idioma del stemmer (se comprueba al cargar)
+        """
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        temporal = ruta + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'idioma': idioma, 'raices': self._raices}, f, ensure_ascii=False)
+        os.replace(temporal, ruta)
+    
+    def cargar(self, ruta: str, idioma: str) -> bool:
+        """
+        Carga las raíces guardadas con `guardar`
+        
+        Args:
+            ruta: Archivo JSON de la caché
+            idioma: Idioma del stemmer actual
+            
+        Returns:
+            True si se cargó; False si no existe o es de otro idioma
+        """
+        if not os.path.exists(ruta):
+            return False
+        with open(ruta, encoding='utf-8') as f:
+            datos = json.load(f)
+        if datos.get('idioma') != idioma:
+            return False
+        self.actualizar(datos['raices'])
+        return True
+
 
 class PreprocesadorTexto:
     """Clase para preprocesar y vectorizar texto"""
     
-    def __init__(self, idioma='spanish'):
+    def __init__(self, idioma='spanish', stop_words: Optional[set] = None,
+                 tam_cache_stems: int = 100_000, ruta_cache_stems: Optional[str] = None,
+                 modo: str = 'rapido', cache_textos: Optional[CachePreprocesado] = None):
+        """
+        Args:
+            idioma: Idioma de las stopwords y del stemmer
+            stop_words: Conjunto de stopwords ya cargado (si no, se usa
+                `cargar_stopwords`)
+            tam_cache_stems: Tokens guardados en la caché de raíces (0 = sin caché)
+            ruta_cache_stems: Archivo JSON desde el que arrancar la caché de
+                raíces; se actualiza con `guardar_cache_stems`
+            modo: 'rapido' (una sola pasada con expresiones precompiladas) o
+                'nltk' (limpiar_texto + word_tokenize); ambos dan el mismo resultado
+            cache_textos: Caché en disco de textos procesados; solo se
+                procesan los textos que no estén en ella
+        """
+        if modo not in MODOS:
+            raise ValueError(f"modo debe ser uno de {MODOS}")
+        
+        from nltk.stem import SnowballStemmer
+        
         self.idioma = idioma
+        self.modo = modo
         self.stemmer = SnowballStemmer(idioma)
+        self.ruta_cache_stems = ruta_cache_stems
+        self.cache_stems = CacheStems(self.stemmer, tam_cache_stems) if tam_cache_stems > 0 else None
+        if self.cache_stems is not None and ruta_cache_stems:
+            self.cache_stems.cargar(ruta_cache_stems, idioma)
+        
+        if stop_words is not None:
+            # Conjunto ya cargado (por ejemplo, el del proceso principal)
+            self.stop_words = set(stop_words)
+        else:
+            self.stop_words = cargar_stopwords(idioma)
         
-        # Descargar recursos de NLTK si no están disponibles
-        try:
-            self.stop_words = set(stopwords.words(idioma))
-        except:
-            nltk.download('stopwords', quiet=True)
-            nltk.download('punkt', quiet=True)
-            self.stop_words = set(stopwords.words(idioma))
+        # Huella de la configuración: forma parte de la clave de cada texto
+        # en la caché, así que otra configuración no reutiliza sus entradas
+        configuracion = json.dumps({
+            'version': VERSION_PIPELINE,
+            'idioma': idioma,
+            'stemmer': type(self.stemmer).__name__,
+            'stop_words': sorted(self.stop_words)
+        }, ensure_ascii=False)
+        self._huella = hashlib.blake2b(configuracion.encode('utf-8'), digest_size=16).digest()
+        
+        self.cache_textos = cache_textos
+        if cache_textos is not None:
+            cache_textos.comprobar_version(VERSION_PIPELINE)
         
         self.vectorizer = None
     
@@ -72,6 +628,7 @@ class PreprocesadorTexto:
         Returns:
             Lista de tokens
         """
+        from nltk.tokenize import word_tokenize
         return word_tokenize(texto, language=self.idioma)
     
     def eliminar_stopwords(self, tokens: List[str]) -> List[str]:
@@ -97,8 +654,24 @@ class PreprocesadorTexto:
         Returns:
             Tokens con stemming aplicado
         """
+        if self.cache_stems is not None:
+            stem = self.cache_stems.stem
+            return [stem(token) for token in tokens]
         return [self.stemmer.stem(token) for token in tokens]
     
+    def guardar_cache_stems(self, ruta: Optional[str] = None):
+        """
+        Guarda la caché de raíces para que la siguiente ejecución empiece con ella
+        
+        Args:
+            ruta: Archivo JSON de destino (por defecto, `ruta_cache_stems`)
+        """
+        ruta = ruta or self.ruta_cache_stems
+        if self.cache_stems is None or not ruta:
+            return
+        self.cache_stems.guardar(ruta, self.idioma)
+        print(f"💾 Caché de raíces guardada en: {ruta} ({len(self.cache_stems)} tokens)")
+    
     def procesar_texto(self, texto: str) -> str:
         """
         Pipeline completo de preprocesamiento
@@ -109,6 +682,24 @@ class PreprocesadorTexto:
         Returns:
             Texto procesado
         """
+        if self.cache_textos is None:
+            return self._procesar_sin_cache(texto)
+        
+        clave = self.clave_texto(texto)
+        procesado = self.cache_textos.obtener(clave)
+        if procesado is None:
+            procesado = self._procesar_sin_cache(texto)
+            self.cache_textos.guardar(clave, procesado)
+        return procesado
+    
+    def clave_texto(self, texto: str) -> bytes:
+        """Clave del texto en la caché: hash del texto y de la configuración"""
+        return hashlib.blake2b(texto.encode('utf-8'), digest_size=16, key=self._huella).digest()
+    
+    def _procesar_sin_cache(self, texto: str) -> str:
+        if self.modo == 'rapido':
+            return self.procesar_texto_rapido(texto)
+        
         # 1. Limpiar
         texto = self.limpiar_texto(texto)
         
@@ -124,31 +715,244 @@ class PreprocesadorTexto:
         # Unir tokens de nuevo
         return ' '.join(tokens)
     
-    def vectorizar_textos(self, textos: List[str], max_features: int = 1000):
+    def procesar_texto_rapido(self, texto: str) -> str:
+        """
+        Pipeline de preprocesamiento en una sola pasada
+        
+        Minúsculas, eliminación de URLs y números, separación en palabras,
+        filtrado de stopwords y palabras cortas y stemming sin crear copias
+        intermedias del texto ni usar Punkt. Da el mismo resultado que el
+        pipeline de NLTK (modo 'nltk').
+        
+        Args:
+            texto: Texto original
+            
+        Returns:
+            Texto procesado
+        """
+        stop_words = self.stop_words
+        stem = self.cache_stems.stem if self.cache_stems is not None else self.stemmer.stem
+        
+        raices = []
+        for palabra in PATRON_PALABRA.findall(PATRON_RUIDO.sub('', texto.lower())):
+            partes = CONTRACCIONES_TREEBANK.get(palabra)
+            for token in partes or (palabra,):
+                if len(token) > 2 and token not in stop_words:
+                    raices.append(stem(token))
+        
+        return ' '.join(raices)
+    
+    def procesar_textos(self, textos: Iterable[str], n_jobs: int = -1,
+                        chunksize: Optional[int] = None) -> List[str]:
+        """
+        Aplica `procesar_texto` a muchos textos usando varios procesos
+        
+        Cada proceso worker crea su stemmer y recibe el conjunto de
+        stopwords y una copia de la caché de raíces una sola vez al
+        arrancar; los textos se envían en bloques de `chunksize` para
+        reducir la comunicación entre procesos. Las raíces nuevas que
+        calcula cada worker se añaden a la caché del proceso principal.
+        Si hay caché de textos, solo se procesan los que no estén en ella.
+        
+        Args:
+            textos: Textos originales (lista, Serie de pandas o iterable)
+            n_jobs: Número de procesos. -1 = todos los núcleos si hay al
+                menos MIN_TEXTOS_PARALELO textos por procesar (con menos, no
+                se crea el pool); 1 = sin paralelismo, en el proceso actual;
+                un valor > 1 se respeta siempre. En servidores como
+                Streamlit conviene pasar 1
+            chunksize: Textos por bloque enviado a cada worker. Por defecto
+                se reparten unos 4 bloques por worker
+            
+        Returns:
+            Lista de textos procesados en el mismo orden que la entrada
+        """
+        textos = list(textos)
+        if self.cache_textos is None:
+            return self._procesar_lote(textos, n_jobs, chunksize)
+        
+        claves = [self.clave_texto(texto) for texto in textos]
+        guardados = self.cache_textos.obtener_varios(claves)
+        
+        pendientes = {}
+        for clave, texto in zip(claves, textos):
+            if clave not in guardados:
+                pendientes.setdefault(clave, texto)
+        
+        if pendientes:
+            en_cache = sum(1 for clave in claves if clave in guardados)
+            print(f"🗃️  {en_cache} textos en caché, {len(pendientes)} por procesar")
+            nuevos = self._procesar_lote(list(pendientes.values()), n_jobs, chunksize)
+            nuevos = dict(zip(pendientes, nuevos))
+            self.cache_textos.guardar_varios(list(nuevos.items()))
+            guardados.update(nuevos)
+        
+        return [guardados[clave] for clave in claves]
+    
+    def _procesar_lote(self, textos: List[str], n_jobs: int,
+                       chunksize: Optional[int]) -> List[str]:
+        """Procesa una lista de textos sin consultar la caché de textos"""
+        if n_jobs is None or n_jobs < 1:
+            n_jobs = (os.cpu_count() or 1) if len(textos) >= MIN_TEXTOS_PARALELO else 1
+        n_jobs = min(n_jobs, len(textos))
+        
+        if n_jobs <= 1:
+            return [self._procesar_sin_cache(texto) for texto in textos]
+        
+        if chunksize is None:
+            chunksize = max(1, len(textos) // (n_jobs * 4))
+        
+        if self.cache_stems is not None:
+            tam_cache, raices = self.cache_stems.tam_max, self.cache_stems.a_diccionario()
+        else:
+            tam_cache, raices = 0, {}
+        
+        bloques = [textos[i:i + chunksize] for i in range(0, len(textos), chunksize)]
+        procesados = []
+        
+        print(f"⚙️  Procesando {len(textos)} textos con {n_jobs} procesos...")
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_inicializar_worker,
+                                 initargs=(self.idioma, self.stop_words, tam_cache, raices,
+                                           self.modo)) as executor:
+            # map conserva el orden de la entrada
+            for bloque, nuevas, aciertos, fallos in executor.map(_procesar_bloque_en_worker, bloques):
+                procesados.extend(bloque)
+                if self.cache_stems is not None:
+                    self.cache_stems.actualizar(nuevas)
+                    self.cache_stems.aciertos += aciertos
+                    self.cache_stems.fallos += fallos
+        
+        return procesados
+    
+    def vectorizar_textos(self, textos: List[str], max_features: int = 1000,
+                          modo: str = 'tfidf', n_features: int = 2 ** 18, n_jobs: int = 1,
+                          dtype=np.float64):
         """
         Convierte textos en vectores numéricos usando TF-IDF
         
         Args:
             textos: Lista de textos
-            max_features: Número máximo de características
+            max_features: Número máximo de características (modo 'tfidf')
+            modo: 'tfidf' (vocabulario en memoria), 'hashing' (sin
+                vocabulario, por bloques y en paralelo; para corpus grandes) o
+                'incremental' (admite lotes nuevos con `actualizar_vectorizador`)
+            n_features: Columnas de la matriz en modo 'hashing'
+            n_jobs: Procesos que vectorizan bloques en modo 'hashing'
+            dtype: np.float64 o np.float32; con float32 la matriz (y los
+                centros de clustering que se calculen sobre ella) ocupan la mitad
             
         Returns:
-            Matriz de vectores TF-IDF
+            Matriz de vectores TF-IDF (CSR con índices int32 si caben)
         """
+        if modo not in ('tfidf', 'hashing', 'incremental'):
+            raise ValueError("modo debe ser 'tfidf', 'hashing' o 'incremental'")
+        
         print(f"🔢 Vectorizando {len(textos)} documentos...")
         
+        if modo == 'hashing':
+            self.vectorizer = VectorizadorHashing(n_features=n_features, ngram_range=(1, 2),
+                                                  min_df=2, max_df=0.8, n_jobs=n_jobs, dtype=dtype)
+            vectores = compactar_indices(self.vectorizer.fit_transform(textos))
+            print(f"✅ Vectorización completa: {vectores.shape[0]} documentos x "
+                  f"{vectores.shape[1]} características (hashing)")
+            return vectores
+        
+        if modo == 'incremental':
+            self.vectorizer = VectorizadorIncremental(ngram_range=(1, 2), min_df=2, max_df=0.8,
+                                                      max_features=max_features, dtype=dtype)
+            vectores = compactar_indices(self.vectorizer.fit_transform(textos))
+            print(f"✅ Vectorización completa: {vectores.shape[0]} documentos x {vectores.shape[1]} características")
+            return vectores
+        
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
         self.vectorizer = TfidfVectorizer(
             max_features=max_features,
             ngram_range=(1, 2),  # Usar unigramas y bigramas
             min_df=2,  # Ignorar términos que aparecen en menos de 2 documentos
-            max_df=0.8  # Ignorar términos que aparecen en más del 80% de documentos
+            max_df=0.8,  # Ignorar términos que aparecen en más del 80% de documentos
+            dtype=tipo_flotante(dtype)
         )
         
-        vectores = self.vectorizer.fit_transform(textos)
+        vectores = compactar_indices(self.vectorizer.fit_transform(textos))
         
         print(f"✅ Vectorización completa: {vectores.shape[0]} documentos x {vectores.shape[1]} características")
         return vectores
     
+    def vectorizar_desde_almacen(self, almacen: 'AlmacenTerminos', max_features: int = 1000,
+                                 **parametros):
+        """
+        Obtiene la matriz TF-IDF a partir de los conteos guardados, sin tokenizar
+        
+        Args:
+            almacen: Conteos de n-gramas del corpus (AlmacenTerminos)
+            max_features: Número máximo de características
+            **parametros: Resto de parámetros de `AlmacenTerminos.tfidf`
+                (min_df, max_df, ngram_range, sublinear_tf, dtype...)
+            
+        Returns:
+            Matriz de vectores TF-IDF (igual que `vectorizar_textos`)
+        """
+        parametros.setdefault('min_df', 2)
+        parametros.setdefault('max_df', 0.8)
+        vectores, self.vectorizer = almacen.tfidf(max_features=max_features, **parametros)
+        print(f"✅ Vectorización desde almacén: {vectores.shape[0]} documentos x "
+              f"{vectores.shape[1]} características")
+        return vectores
+    
+    def actualizar_vectorizador(self, textos_nuevos: List[str], max_features: int = 1000):
+        """
+        Añade un lote de documentos al vectorizador incremental
+        
+        Solo se analizan los documentos nuevos; el vocabulario y el IDF
+        pasan a reflejar todo el corpus visto hasta ahora. Si no hay un
+        vectorizador incremental, se crea.
+        
+        Args:
+            textos_nuevos: Textos procesados del nuevo lote
+            max_features: Número máximo de características (solo al crearlo)
+            
+        Returns:
+            Matriz TF-IDF de los documentos nuevos
+        """
+        if not isinstance(self.vectorizer, VectorizadorIncremental):
+            return self.vectorizar_textos(textos_nuevos, max_features=max_features, modo='incremental')
+        
+        print(f"🔢 Añadiendo {len(textos_nuevos)} documentos al vectorizador "
+              f"({self.vectorizer.n_documentos} ya vistos)...")
+        vectores = compactar_indices(self.vectorizer.fit_transform(textos_nuevos))
+        print(f"✅ Vocabulario: {len(self.vectorizer.vocabulario_)} términos, "
+              f"{len(self.vectorizer.terminos_seleccionados())} seleccionados")
+        return vectores
+    
+    def generar_lotes(self, textos: Iterable[str], etiquetas: Iterable, tam_lote: int = 10_000):
+        """
+        Vectoriza textos y etiquetas por lotes, para entrenar con
+        `ModeloAprendizajeWeb.entrenar_clasificador_por_lotes`
+
+        Usa el vectorizador ya ajustado (por ejemplo un VectorizadorHashing
+        tras `partial_fit` sobre el corpus); solo hay un lote en memoria.
+
+        Args:
+            textos: Textos procesados (lista o cualquier iterable)
+            etiquetas: Categoría de cada texto, en el mismo orden
+            tam_lote: Documentos por lote
+
+        Yields:
+            Tuplas (matriz del lote, array de etiquetas del lote)
+        """
+        if self.vectorizer is None:
+            raise ValueError("El vectorizador no ha sido ajustado")
+
+        pares = zip(textos, etiquetas)
+        while True:
+            lote = list(islice(pares, tam_lote))
+            if not lote:
+                return
+            textos_lote, etiquetas_lote = zip(*lote)
+            yield (compactar_indices(self.vectorizer.transform(list(textos_lote))),
+                   np.asarray(etiquetas_lote))
+
     def obtener_palabras_importantes(self, n: int = 20) -> List[str]:
         """
         Obtiene las palabras más importantes del vocabulario
@@ -159,10 +963,15 @@ class PreprocesadorTexto:
         Returns:
             Lista de palabras importantes
         """
-        if self.vectorizer is None:
+        if self.vectorizer is None or not hasattr(self.vectorizer, 'get_feature_names_out'):
+            # El modo hashing no guarda el vocabulario
             return []
         
-        feature_names = self.vectorizer.get_feature_names_out()
+        if isinstance(self.vectorizer, VectorizadorIncremental):
+            # Sus columnas incluyen los términos podados
+            feature_names = self.vectorizer.terminos_seleccionados()
+        else:
+            feature_names = self.vectorizer.get_feature_names_out()
         return list(feature_names[:n])
 
 
@@ -170,6 +979,8 @@ class PreprocesadorTexto:
 # EJEMPLO DE USO
 # ========================================
 if __name__ == "__main__":
+    import pandas as pd
+    
     # Textos de ejemplo
     textos_ejemplo = [
         "La inteligencia artificial está revolucionando la tecnología moderna",
@@ -185,15 +996,12 @@ if __name__ == "__main__":
     print("EJEMPLO DE PREPROCESAMIENTO")
     print("="*60)
     
-    # Procesar cada texto
-    textos_procesados = []
-    for i, texto in enumerate(textos_ejemplo, 1):
+    # Procesar todos los textos (en paralelo con n_jobs > 1 y corpus grandes)
+    textos_procesados = prep.procesar_textos(textos_ejemplo, n_jobs=2)
+    for i, (texto, texto_procesado) in enumerate(zip(textos_ejemplo, textos_procesados), 1):
         print(f"\n📝 Texto {i} original:")
         print(f"   {texto}")
         
-        texto_procesado = prep.procesar_texto(texto)
-        textos_procesados.append(texto_procesado)
-        
         print(f"🔧 Texto {i} procesado:")
         print(f"   {texto_procesado}")
     
@@ -201,6 +1009,11 @@ if __name__ == "__main__":
     print("\n" + "="*60)
     vectores = prep.vectorizar_textos(textos_procesados, max_features=50)
     
+    # Estadísticas de la caché de raíces
+    stats = prep.cache_stems.estadisticas()
+    print(f"\n🧠 Caché de raíces: {stats['tokens']} tokens, "
+          f"tasa de acierto {stats['tasa_acierto']:.1%}")
+    
     # Mostrar palabras importantes
     palabras = prep.obtener_palabras_importantes(n=10)
     print(f"\n🎯 Top 10 palabras importantes:")
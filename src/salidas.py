@@ -0,0 +1,165 @@
+"""
+=======================================================
+MÓDULO: SALIDAS INCREMENTALES - Escritura por lotes
+=======================================================
+Este módulo guarda los resultados del scraper a medida que llegan,
+en JSONL o Parquet, para que los trabajos largos usen memoria
+constante y puedan reanudarse tras una interrupción
+"""
+
+import glob
+import json
+import os
+import re
+from typing import Dict, List, Set
+
+
+class SalidaJSONL:
+    """Añade registros a un archivo JSON Lines (un objeto por línea)"""
+
+    def __init__(self, ruta: str, tam_lote: int = 100):
+        """
+        Args:
+            ruta: Archivo .jsonl de destino (se crea si no existe)
+            tam_lote: Registros acumulados antes de escribir a disco
+        """
+        self.ruta = ruta
+        self.tam_lote = tam_lote
+        self._lote: List[Dict] = []
+        self._archivo = None
+
+    def urls_guardadas(self) -> Set[str]:
+        """
+        Lee las URLs ya presentes en el archivo
+
+        Las líneas incompletas (por ejemplo, si el proceso se interrumpió
+        mientras escribía) se ignoran.
+
+        Returns:
+            Conjunto de URLs guardadas
+        """
+        urls = set()
+        if not os.path.exists(self.ruta):
+            return urls
+
+        with open(self.ruta, encoding='utf-8') as f:
+            for linea in f:
+                try:
+                    urls.add(json.loads(linea)['url'])
+                except (ValueError, KeyError):
+                    continue
+        return urls
+
+    def escribir(self, registro: Dict):
+        """Añade un registro; se escribe a disco al completar el lote"""
+        self._lote.append(registro)
+        if len(self._lote) >= self.tam_lote:
+            self.vaciar_lote()
+
+    def vaciar_lote(self):
+        """Escribe a disco los registros pendientes"""
+        if not self._lote:
+            return
+
+        if self._archivo is None:
+            self._archivo = self._abrir()
+
+        for registro in self._lote:
+            self._archivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        self._archivo.flush()
+        os.fsync(self._archivo.fileno())
+        self._lote = []
+
+    def _abrir(self):
+        """Abre el archivo en modo añadir, completando una última línea cortada"""
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        termina_en_salto = True
+        if os.path.exists(self.ruta) and os.path.getsize(self.ruta) > 0:
+            with open(self.ruta, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                termina_en_salto = f.read(1) == b'\n'
+
+        archivo = open(self.ruta, 'a', encoding='utf-8')
+        if not termina_en_salto:
+            archivo.write('\n')
+        return archivo
+
+    def cerrar(self):
+        """Escribe lo pendiente y cierra el archivo"""
+        self.vaciar_lote()
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+
+class SalidaParquet:
+    """Escribe registros en un directorio de archivos Parquet, uno por lote"""
+
+    def __init__(self, directorio: str, tam_lote: int = 1000):
+        """
+        Args:
+            directorio: Carpeta de destino (se crea si no existe)
+            tam_lote: Registros por archivo (cada uno es un row group)
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("SalidaParquet necesita pyarrow: pip install pyarrow")
+
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.directorio = directorio
+        self.tam_lote = tam_lote
+        self._lote: List[Dict] = []
+
+        os.makedirs(directorio, exist_ok=True)
+        # Tras el mayor número existente: si falta alguna parte (borrada a
+        # mano) o la numeración tiene huecos, no se sobrescribe ninguna
+        numeros = [re.search(r'parte-(\d+)\.parquet$', ruta) for ruta in self._partes()]
+        self._siguiente = max((int(n.group(1)) for n in numeros if n), default=-1) + 1
+
+    def _partes(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directorio, 'parte-*.parquet')))
+
+    def urls_guardadas(self) -> Set[str]:
+        """
+        Lee las URLs ya presentes leyendo solo la columna 'url'
+
+        Returns:
+            Conjunto de URLs guardadas
+        """
+        urls = set()
+        for ruta in self._partes():
+            tabla = self._pq.read_table(ruta, columns=['url'])
+            urls.update(tabla.column('url').to_pylist())
+        return urls
+
+    def escribir(self, registro: Dict):
+        """Añade un registro; se escribe a disco al completar el lote"""
+        self._lote.append(registro)
+        if len(self._lote) >= self.tam_lote:
+            self.vaciar_lote()
+
+    def vaciar_lote(self):
+        """Escribe los registros pendientes en un nuevo archivo Parquet"""
+        if not self._lote:
+            return
+
+        tabla = self._pa.Table.from_pylist(self._lote)
+        ruta = os.path.join(self.directorio, f'parte-{self._siguiente:05d}.parquet')
+
+        # Escribir primero a un temporal para no dejar archivos a medias
+        temporal = ruta + '.tmp'
+        self._pq.write_table(tabla, temporal, row_group_size=len(self._lote))
+        os.replace(temporal, ruta)
+
+        self._siguiente += 1
+        self._lote = []
+
+    def cerrar(self):
+        """Escribe lo pendiente"""
+        self.vaciar_lote()
@@ -6,20 +6,302 @@ Este módulo se encarga de extraer texto de páginas web
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+from bs4.dammit import EncodingDetector
+from lxml import etree
 import re
+import os
 import time
-from typing import List, Dict
+import heapq
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Iterator, Optional, Tuple, Callable
+from urllib.parse import urlparse
 import pandas as pd
+from cache_http import CacheHTTP
+from metricas_scraping import RegistroTiempos, nueva_medicion, registrar_error
+
+
+# Etiquetas cuyo contenido no forma parte del texto visible (igual que get_text)
+ETIQUETAS_SIN_TEXTO = {'script', 'style', 'template', 'rt', 'rp'}
+
+# Tamaño de los bloques con los que se alimenta el parser incremental
+TAM_BLOQUE = 64 * 1024
+
+
+def extraer_con_beautifulsoup(contenido: bytes,
+                              enlaces: Optional[List[str]] = None) -> Tuple[Optional[str], str]:
+    """
+    Extrae el primer <h1> y el texto de los <p> construyendo el árbol completo
+    
+    Args:
+        contenido: HTML de la página en bytes
+        enlaces: Lista opcional donde añadir el href de cada <a>
+        
+    Returns:
+        Tupla (título o None, texto de los párrafos sin limpiar)
+    """
+    soup = BeautifulSoup(contenido, 'lxml')
+    
+    titulo = soup.find('h1')
+    titulo = titulo.get_text().strip() if titulo else None
+    
+    parrafos = soup.find_all('p')
+    texto = ' '.join([p.get_text().strip() for p in parrafos])
+    
+    if enlaces is not None:
+        enlaces.extend(a['href'] for a in soup.find_all('a') if a.get('href'))
+    
+    return titulo, texto
+
+
+def _texto_elemento(elemento, partes: List[str]):
+    """Acumula el texto visible de un elemento lxml y sus descendientes"""
+    if elemento.text:
+        partes.append(elemento.text)
+    for hijo in elemento:
+        if isinstance(hijo.tag, str) and hijo.tag not in ETIQUETAS_SIN_TEXTO:
+            _texto_elemento(hijo, partes)
+        if hijo.tail:
+            partes.append(hijo.tail)
+
+
+def extraer_con_lxml(contenido: bytes,
+                     enlaces: Optional[List[str]] = None) -> Tuple[Optional[str], str]:
+    """
+    Extrae el primer <h1> y el texto de los <p> en una sola pasada
+    
+    Recorre el documento con el parser incremental de lxml atendiendo solo
+    a los eventos de cierre de <h1> y <p>, y libera cada párrafo en cuanto
+    se ha leído, en lugar de construir un árbol de BeautifulSoup completo.
+    Produce la misma salida que `extraer_con_beautifulsoup`.
+    
+    Args:
+        contenido: HTML de la página en bytes
+        enlaces: Lista opcional donde añadir el href de cada <a>
+        
+    Returns:
+        Tupla (título o None, texto de los párrafos sin limpiar)
+    """
+    if not contenido:
+        return None, ''
+    
+    # Probar las mismas codificaciones que BeautifulSoup (BOM, <meta charset>, ...)
+    for codificacion in EncodingDetector(contenido, is_html=True).encodings:
+        try:
+            return _recorrer_h1_y_parrafos(contenido, codificacion, enlaces)
+        except LookupError:
+            continue
+    return _recorrer_h1_y_parrafos(contenido, None, enlaces)
+
+
+def _recorrer_h1_y_parrafos(contenido: bytes, codificacion: Optional[str],
+                            enlaces: Optional[List[str]]) -> Tuple[Optional[str], str]:
+    """Recorrido incremental de `extraer_con_lxml` con una codificación concreta"""
+    etiquetas = ('h1', 'p', 'a') if enlaces is not None else ('h1', 'p')
+    parser = etree.HTMLPullParser(events=('end',), tag=etiquetas, encoding=codificacion)
+    
+    titulo = None
+    parrafos = []
+    
+    def consumir_eventos():
+        nonlocal titulo
+        for _, elemento in parser.read_events():
+            if elemento.tag == 'a':
+                href = elemento.get('href')
+                if href:
+                    enlaces.append(href)
+                continue
+            
+            ancestros = {a.tag for a in elemento.iterancestors()}
+            
+            # Dentro de <script>, <template>... no hay texto visible
+            if ancestros & ETIQUETAS_SIN_TEXTO:
+                texto_elemento = ''
+            else:
+                partes = []
+                _texto_elemento(elemento, partes)
+                texto_elemento = ''.join(partes).strip()
+            
+            if elemento.tag == 'p':
+                parrafos.append(texto_elemento)
+                # Un <p> dentro del primer <h1> forma parte del título
+                if titulo is None and 'h1' in ancestros:
+                    continue
+            elif titulo is None:
+                titulo = texto_elemento
+            
+            # Liberar lo ya leído para que el árbol no crezca con la página
+            elemento.clear(keep_tail=True)
+            while elemento.getprevious() is not None:
+                del elemento.getparent()[0]
+    
+    for inicio in range(0, len(contenido), TAM_BLOQUE):
+        parser.feed(contenido[inicio:inicio + TAM_BLOQUE])
+        consumir_eventos()
+    parser.close()
+    consumir_eventos()
+    
+    return titulo, ' '.join(parrafos)
+
+
+def extraer_titulo_y_texto(contenido: bytes, motor: str = 'lxml',
+                           enlaces: Optional[List[str]] = None) -> Tuple[Optional[str], str]:
+    """
+    Extrae el primer <h1> y el texto de los <p> con el motor indicado
+    
+    Args:
+        contenido: HTML de la página en bytes
+        motor: 'lxml' (con BeautifulSoup como respaldo) o 'beautifulsoup'
+        enlaces: Lista opcional donde añadir el href de cada <a>
+        
+    Returns:
+        Tupla (título o None, texto de los párrafos sin limpiar)
+    """
+    if motor == 'lxml':
+        encontrados = [] if enlaces is not None else None
+        try:
+            titulo, texto = extraer_con_lxml(contenido, encontrados)
+            if enlaces is not None:
+                enlaces.extend(encontrados)
+            return titulo, texto
+        except Exception as e:
+            print(f"⚠️ Extracción rápida fallida ({e}), usando BeautifulSoup")
+    return extraer_con_beautifulsoup(contenido, enlaces)
+
+
+# Patrones de limpieza precompilados
+PATRON_SALTOS = re.compile(r'\n+')
+PATRON_ESPACIOS = re.compile(r'\s+')
+PATRON_CARACTERES_RAROS = re.compile(r'[^\w\s.,;:!?¿¡áéíóúüñÁÉÍÓÚÜÑ-]')
+
+
+def limpiar_texto_extraido(texto: str) -> str:
+    """Limpia el texto eliminando caracteres extraños"""
+    # Eliminar saltos de línea múltiples
+    texto = PATRON_SALTOS.sub(' ', texto)
+    # Eliminar espacios múltiples
+    texto = PATRON_ESPACIOS.sub(' ', texto)
+    # Eliminar caracteres especiales extraños
+    texto = PATRON_CARACTERES_RAROS.sub('', texto)
+    return texto.strip()
+
+
+def procesar_html(url: str, contenido: bytes, motor: str = 'lxml',
+                  enlaces: Optional[List[str]] = None,
+                  medicion: Optional[Dict] = None) -> Dict[str, str]:
+    """
+    Convierte el HTML descargado de una URL en un registro del scraper
+    
+    Args:
+        url: URL de la página
+        contenido: HTML de la página en bytes
+        motor: Motor de extracción ('lxml' o 'beautifulsoup')
+        enlaces: Lista opcional donde añadir el href de cada <a>
+        medicion: Diccionario opcional donde anotar los segundos de
+            'parseo' y 'limpieza'
+        
+    Returns:
+        Diccionario con url, titulo, texto y longitud
+    """
+    inicio = time.perf_counter()
+    titulo, texto = extraer_titulo_y_texto(contenido, motor, enlaces)
+    titulo = titulo if titulo is not None else "Sin título"
+    fin_parseo = time.perf_counter()
+    
+    texto = limpiar_texto_extraido(texto)
+    
+    if medicion is not None:
+        medicion['parseo'] = fin_parseo - inicio
+        medicion['limpieza'] = time.perf_counter() - fin_parseo
+    
+    return {
+        'url': url,
+        'titulo': titulo,
+        'texto': texto,
+        'longitud': len(texto.split())
+    }
+
+
+def _procesar_html_en_proceso(url: str, contenido: bytes, motor: str):
+    """
+    Ejecuta `procesar_html` en un proceso del pool
+    
+    Returns:
+        Tupla (resultado o None, tiempos de parseo/limpieza y error)
+    """
+    tiempos = {}
+    try:
+        resultado = procesar_html(url, contenido, motor, medicion=tiempos)
+    except Exception as e:
+        print(f"❌ Error al procesar {url}: {e}")
+        tiempos['error'] = type(e).__name__
+        resultado = None
+    return resultado, tiempos
 
 
 class WebScraper:
     """Clase para extraer contenido de sitios web"""
     
-    def __init__(self):
+    def __init__(self, tam_pool: int = 10, reintentos: int = 3,
+                 factor_backoff: float = 0.5, timeout: float = 10, cache=None,
+                 motor: str = 'lxml', tiempos: Optional[RegistroTiempos] = None):
+        """
+        Args:
+            tam_pool: Conexiones reutilizables por host (keep-alive)
+            reintentos: Reintentos ante errores transitorios
+            factor_backoff: Base de la espera exponencial entre reintentos
+                (segundos). Se respeta Retry-After en respuestas 429/503
+            timeout: Tiempo máximo de espera por petición (segundos)
+            cache: CacheHTTP opcional para hacer peticiones condicionales
+                y reutilizar extracciones de páginas sin cambios
+            motor: 'lxml' para la extracción rápida en una pasada (con
+                BeautifulSoup como respaldo si falla) o 'beautifulsoup'
+            tiempos: RegistroTiempos opcional donde guardar los tiempos de
+                cada etapa (primer byte, descarga, parseo, limpieza) por URL
+        """
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        self.timeout = timeout
+        self.cache = cache
+        self.motor = motor
+        self.tiempos = tiempos
+        self.session = self._crear_sesion(tam_pool, reintentos, factor_backoff)
+    
+    def _crear_sesion(self, tam_pool: int, reintentos: int,
+                      factor_backoff: float) -> requests.Session:
+        """Crea una sesión HTTP con pool de conexiones y reintentos"""
+        reintento = Retry(
+            total=reintentos,
+            connect=reintentos,
+            read=reintentos,
+            status=reintentos,
+            backoff_factor=factor_backoff,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET', 'HEAD'],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adaptador = HTTPAdapter(
+            pool_connections=tam_pool,
+            pool_maxsize=tam_pool,
+            max_retries=reintento
+        )
+        
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.mount('http://', adaptador)
+        session.mount('https://', adaptador)
+        return session
+    
+    def cerrar(self):
+        """Cierra las conexiones abiertas de la sesión"""
+        self.session.close()
     
     def extraer_texto_url(self, url: str) -> Dict[str, str]:
         """
@@ -31,72 +313,414 @@ class WebScraper:
         Returns:
             Diccionario con título, texto y URL
         """
+        medicion = self._nueva_medicion(url)
         try:
             print(f"📥 Extrayendo contenido de: {url}")
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'lxml')
+            response, resultado = self._descargar(url, medicion)
             
-            # Extraer título
-            titulo = soup.find('h1')
-            titulo = titulo.get_text().strip() if titulo else "Sin título"
+            # La página no ha cambiado: reutilizar la extracción guardada
+            if resultado is not None:
+                return resultado
             
-            # Extraer texto de párrafos
-            parrafos = soup.find_all('p')
-            texto = ' '.join([p.get_text().strip() for p in parrafos])
+            inicio_parseo = time.perf_counter()
+            resultado = procesar_html(url, response.content, self.motor, medicion=medicion)
+            self._guardar_en_cache(url, response, resultado, time.perf_counter() - inicio_parseo)
             
-            # Limpiar texto
-            texto = self.limpiar_texto(texto)
-            
-            return {
-                'url': url,
-                'titulo': titulo,
-                'texto': texto,
-                'longitud': len(texto.split())
-            }
+            return resultado
             
         except Exception as e:
             print(f"❌ Error al extraer {url}: {e}")
+            registrar_error(medicion, e)
+            return None
+        finally:
+            self._registrar(medicion)
+    
+    def _nueva_medicion(self, url: str) -> Optional[Dict]:
+        """Crea la medición de una URL si la instrumentación está activa"""
+        return nueva_medicion(url) if self.tiempos is not None else None
+    
+    def _registrar(self, medicion: Optional[Dict]):
+        """Guarda una medición terminada en el registro de tiempos"""
+        if medicion is not None:
+            self.tiempos.agregar(medicion)
+    
+    def _descargar(self, url: str, medicion: Optional[Dict] = None):
+        """
+        Descarga una URL usando la caché si está configurada
+        
+        Args:
+            url: La URL del sitio web
+            medicion: Diccionario opcional donde anotar código HTTP,
+                tiempo hasta el primer byte, tiempo de descarga y bytes
+            
+        Returns:
+            Tupla (respuesta, None) si hubo que descargar la página, o
+            (None, resultado guardado) si el servidor respondió 304
+        """
+        entrada = self.cache.obtener(url) if self.cache else None
+        cabeceras = self.cache.cabeceras_condicionales(entrada) if entrada else {}
+        
+        # Con stream=True la petición vuelve al recibir las cabeceras
+        inicio = time.perf_counter()
+        response = self.session.get(url, headers=cabeceras, timeout=self.timeout, stream=True)
+        primer_byte = time.perf_counter()
+        contenido = response.content
+        
+        if medicion is not None:
+            medicion['estado'] = response.status_code
+            medicion['ttfb'] = primer_byte - inicio
+            medicion['descarga'] = time.perf_counter() - primer_byte
+            medicion['bytes'] = len(contenido)
+        
+        if entrada and response.status_code == 304:
+            self.cache.registrar_acierto(url, entrada)
+            if medicion is not None:
+                medicion['cache'] = 'acierto'
+            return None, entrada['resultado']
+        
+        response.raise_for_status()
+        if medicion is not None and self.cache:
+            medicion['cache'] = 'fallo'
+        return response, None
+    
+    def _descargar_seguro(self, url: str):
+        """
+        Igual que `_descargar`, pero sin lanzar excepciones
+        
+        Returns:
+            Tupla (respuesta, resultado guardado, medición), o None si la
+            descarga falla (en ese caso la medición ya queda registrada)
+        """
+        medicion = self._nueva_medicion(url)
+        try:
+            print(f"📥 Descargando: {url}")
+            response, resultado = self._descargar(url, medicion)
+            return response, resultado, medicion
+        except Exception as e:
+            print(f"❌ Error al descargar {url}: {e}")
+            registrar_error(medicion, e)
+            self._registrar(medicion)
             return None
     
+    def _guardar_en_cache(self, url: str, response, resultado: Dict, tiempo_parseo: float):
+        """Registra una descarga completa en la caché, si está configurada"""
+        if self.cache:
+            self.cache.registrar_fallo()
+            self.cache.guardar(
+                url, response.content,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+                resultado,
+                tiempo_parseo
+            )
+    
+    def extraer_titulo_y_texto(self, contenido: bytes) -> Tuple[Optional[str], str]:
+        """
+        Extrae el primer <h1> y el texto de los <p> con el motor configurado
+        
+        Args:
+            contenido: HTML de la página en bytes
+            
+        Returns:
+            Tupla (título o None, texto de los párrafos sin limpiar)
+        """
+        return extraer_titulo_y_texto(contenido, self.motor)
+    
     def limpiar_texto(self, texto: str) -> str:
         """Limpia el texto eliminando caracteres extraños"""
-        # Eliminar saltos de línea múltiples
-        texto = re.sub(r'\n+', ' ', texto)
-        # Eliminar espacios múltiples
-        texto = re.sub(r'\s+', ' ', texto)
-        # Eliminar caracteres especiales extraños
-        texto = re.sub(r'[^\w\s.,;:!?¿¡áéíóúüñÁÉÍÓÚÜÑ-]', '', texto)
-        return texto.strip()
+        return limpiar_texto_extraido(texto)
     
-    def extraer_multiples_urls(self, urls: List[str], delay: float = 1.0) -> pd.DataFrame:
+    def extraer_multiples_urls(self, urls: List[str], delay: float = 1.0,
+                               max_concurrencia: int = 1,
+                               max_procesos: int = 0) -> pd.DataFrame:
         """
         Extrae contenido de múltiples URLs
         
         Args:
             urls: Lista de URLs
-            delay: Tiempo de espera entre peticiones (segundos)
+            delay: Tiempo de espera entre peticiones (segundos). Con
+                max_concurrencia > 1 se aplica por host
+            max_concurrencia: Número máximo de descargas simultáneas.
+                Con 1 se procesan las URLs una a una
+            max_procesos: Si es mayor que 0, el parseo y la limpieza se
+                hacen en ese número de procesos (ver `iter_extraer_pipeline`)
             
         Returns:
             DataFrame con los contenidos extraídos
         """
-        resultados = []
+        resultados = list(self.iter_extraer(urls, delay, max_concurrencia, max_procesos))
+        
+        df = pd.DataFrame(resultados)
+        print(f"\n✅ Se extrajeron {len(df)} documentos exitosamente")
+        return df
+    
+    def iter_extraer(self, urls: List[str], delay: float = 1.0,
+                     max_concurrencia: int = 1,
+                     max_procesos: int = 0) -> Iterator[Dict[str, str]]:
+        """
+        Extrae contenido de múltiples URLs devolviendo cada resultado al obtenerlo
+        
+        Acepta los mismos parámetros que `extraer_multiples_urls`, pero no
+        acumula los resultados, por lo que la memoria no crece con el corpus.
+        
+        Returns:
+            Iterador de resultados en el orden de `urls` (se omiten las
+            URLs que fallan)
+        """
+        if max_procesos > 0:
+            yield from self.iter_extraer_pipeline(
+                urls, delay, max_concurrencia=max_concurrencia, max_procesos=max_procesos
+            )
+            return
+        
+        if max_concurrencia > 1:
+            yield from self._iter_concurrente(urls, delay, max_concurrencia)
+            return
         
         for i, url in enumerate(urls, 1):
             print(f"\n[{i}/{len(urls)}] Procesando URL...")
             resultado = self.extraer_texto_url(url)
             
             if resultado:
-                resultados.append(resultado)
+                yield resultado
             
             # Pausa para no sobrecargar el servidor
             if i < len(urls):
                 time.sleep(delay)
+    
+    def extraer_a_salida(self, urls: List[str], salida, delay: float = 1.0,
+                         max_concurrencia: int = 1, max_procesos: int = 0) -> int:
+        """
+        Extrae URLs escribiendo cada resultado en una salida incremental
         
-        df = pd.DataFrame(resultados)
-        print(f"\n✅ Se extrajeron {len(df)} documentos exitosamente")
-        return df
+        Las URLs que ya están en la salida se omiten, de modo que un trabajo
+        interrumpido se reanuda volviendo a llamar con la misma lista.
+        
+        Args:
+            urls: Lista de URLs
+            salida: SalidaJSONL o SalidaParquet de destino
+            delay, max_concurrencia, max_procesos: Igual que en
+                `extraer_multiples_urls`
+            
+        Returns:
+            Número de documentos nuevos escritos
+        """
+        guardadas = salida.urls_guardadas()
+        pendientes = [url for url in urls if url not in guardadas]
+        if guardadas:
+            print(f"⏭️ Reanudando: {len(urls) - len(pendientes)} URLs ya guardadas")
+        
+        escritos = 0
+        try:
+            for resultado in self.iter_extraer(pendientes, delay, max_concurrencia, max_procesos):
+                salida.escribir(resultado)
+                escritos += 1
+        finally:
+            salida.cerrar()
+        
+        print(f"\n✅ Se guardaron {escritos} documentos nuevos")
+        return escritos
+    
+    def _iter_concurrente(self, urls: List[str], delay: float,
+                          max_concurrencia: int) -> Iterator[Dict[str, str]]:
+        """
+        Descarga URLs en paralelo respetando la cortesía por host
+        
+        Args:
+            urls: Lista de URLs
+            delay: Espera entre peticiones al mismo host (segundos)
+            max_concurrencia: Número máximo de descargas simultáneas
+            
+        Returns:
+            Iterador de resultados en el mismo orden que `urls`
+        """
+        terminados = {}
+        siguiente = 0
+        
+        for i, resultado in self._planificar_por_host(urls, delay, max_concurrencia,
+                                                      self.extraer_texto_url):
+            terminados[i] = resultado
+            
+            # Entregar en orden de entrada todo lo que ya esté disponible
+            while siguiente in terminados:
+                resultado = terminados.pop(siguiente)
+                siguiente += 1
+                if resultado:
+                    yield resultado
+    
+    def _planificar_por_host(self, urls: List[str], delay: float, max_concurrencia: int,
+                             tarea: Callable) -> Iterator[Tuple[int, object]]:
+        """
+        Ejecuta `tarea(url)` en paralelo respetando la cortesía por host
+        
+        Cada host tiene como máximo una petición en curso y la siguiente
+        no empieza hasta `delay` segundos después de terminar la anterior,
+        mientras que hosts distintos se descargan en paralelo.
+        
+        Args:
+            urls: Lista de URLs
+            delay: Espera entre peticiones al mismo host (segundos)
+            max_concurrencia: Número máximo de tareas simultáneas
+            tarea: Función que recibe una URL
+            
+        Returns:
+            Iterador de tuplas (posición en `urls`, resultado de la tarea)
+            en orden de finalización
+        """
+        # Agrupar las URLs por host conservando su posición original
+        colas = {}
+        for i, url in enumerate(urls):
+            host = urlparse(url).netloc.lower()
+            colas.setdefault(host, deque()).append((i, url))
+        
+        # Montículo de hosts listos: (instante en que puede pedirse, orden, host)
+        listos = [(0.0, orden, host) for orden, host in enumerate(colas)]
+        heapq.heapify(listos)
+        contador = len(listos)
+        
+        en_curso = {}
+        
+        with ThreadPoolExecutor(max_workers=max_concurrencia) as executor:
+            while listos or en_curso:
+                ahora = time.monotonic()
+                while listos and len(en_curso) < max_concurrencia and listos[0][0] <= ahora:
+                    _, _, host = heapq.heappop(listos)
+                    i, url = colas[host].popleft()
+                    print(f"\n[{i + 1}/{len(urls)}] Procesando URL...")
+                    futuro = executor.submit(tarea, url)
+                    en_curso[futuro] = (i, host)
+                
+                # Esperar hasta que termine una tarea o se libere un host
+                espera = None
+                if listos and len(en_curso) < max_concurrencia:
+                    espera = max(0.0, listos[0][0] - time.monotonic())
+                if not en_curso:
+                    time.sleep(espera)
+                    continue
+                
+                hechos, _ = wait(en_curso, timeout=espera, return_when=FIRST_COMPLETED)
+                for futuro in hechos:
+                    i, host = en_curso.pop(futuro)
+                    if colas[host]:
+                        heapq.heappush(listos, (time.monotonic() + delay, contador, host))
+                        contador += 1
+                    yield i, futuro.result()
+    
+    def iter_extraer_pipeline(self, urls: List[str], delay: float = 1.0,
+                              max_concurrencia: int = 8, max_procesos: Optional[int] = None,
+                              tam_cola: int = 64, orden: str = 'entrada') -> Iterator[Dict[str, str]]:
+        """
+        Extrae URLs separando la descarga del parseo
+        
+        Varios hilos descargan las páginas (con la cortesía por host de
+        `extraer_multiples_urls`) y dejan el HTML en una cola acotada; un
+        pool de procesos lo parsea y limpia. Si el parseo va más lento que
+        la red, la cola se llena y las descargas se detienen hasta que haya
+        hueco, de modo que la memoria no crece con el número de URLs.
+        
+        Args:
+            urls: Lista de URLs
+            delay: Espera entre peticiones al mismo host (segundos)
+            max_concurrencia: Número máximo de descargas simultáneas
+            max_procesos: Procesos de parseo (por defecto, uno por núcleo)
+            tam_cola: Páginas descargadas que pueden esperar a ser parseadas
+            orden: 'entrada' para devolver los resultados en el orden de
+                `urls` o 'completado' para devolverlos según terminan
+            
+        Returns:
+            Iterador de resultados con el mismo formato que `extraer_texto_url`
+        """
+        if orden not in ('entrada', 'completado'):
+            raise ValueError("orden debe ser 'entrada' o 'completado'")
+        
+        max_procesos = max_procesos or os.cpu_count() or 1
+        cola = queue.Queue(maxsize=tam_cola)
+        detener = threading.Event()
+        fin = object()
+        
+        def productor():
+            try:
+                for item in self._planificar_por_host(urls, delay, max_concurrencia,
+                                                      self._descargar_seguro):
+                    while not detener.is_set():
+                        try:
+                            cola.put(item, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if detener.is_set():
+                        return
+            finally:
+                if not detener.is_set():
+                    cola.put(fin)
+        
+        hilo = threading.Thread(target=productor, daemon=True)
+        hilo.start()
+        
+        terminados = {}
+        siguiente = 0
+        
+        def entregar(i, resultado):
+            # Devuelve los resultados que ya pueden salir según el orden pedido
+            nonlocal siguiente
+            if orden == 'completado':
+                return [resultado] if resultado else []
+            terminados[i] = resultado
+            listos = []
+            while siguiente in terminados:
+                resultado = terminados.pop(siguiente)
+                siguiente += 1
+                if resultado:
+                    listos.append(resultado)
+            return listos
+        
+        try:
+            with ProcessPoolExecutor(max_workers=max_procesos) as procesos:
+                pendientes = {}
+                descargas_terminadas = False
+                
+                while not descargas_terminadas or pendientes:
+                    # Mandar a parsear lo descargado mientras haya procesos libres
+                    while not descargas_terminadas and len(pendientes) < 2 * max_procesos:
+                        try:
+                            item = cola.get_nowait() if pendientes else cola.get()
+                        except queue.Empty:
+                            break
+                        if item is fin:
+                            descargas_terminadas = True
+                            break
+                        
+                        i, descarga = item
+                        if descarga is None:
+                            yield from entregar(i, None)
+                            continue
+                        
+                        response, resultado, medicion = descarga
+                        if resultado is not None:
+                            self._registrar(medicion)
+                            yield from entregar(i, resultado)
+                            continue
+                        
+                        futuro = procesos.submit(_procesar_html_en_proceso, urls[i],
+                                                 response.content, self.motor)
+                        pendientes[futuro] = (i, response, medicion)
+                    
+                    if not pendientes:
+                        continue
+                    
+                    hechos, _ = wait(pendientes, timeout=0.05, return_when=FIRST_COMPLETED)
+                    for futuro in hechos:
+                        i, response, medicion = pendientes.pop(futuro)
+                        resultado, tiempos = futuro.result()
+                        if resultado:
+                            tiempo_parseo = tiempos['parseo'] + tiempos['limpieza']
+                            self._guardar_en_cache(urls[i], response, resultado, tiempo_parseo)
+                        if medicion is not None:
+                            medicion.update(tiempos)
+                            self._registrar(medicion)
+                        yield from entregar(i, resultado)
+        finally:
+            detener.set()
 
 
 # ========================================
@@ -110,8 +734,8 @@ if __name__ == "__main__":
         "https://es.wikipedia.org/wiki/Python_(lenguaje_de_programaci%C3%B3n)"
     ]
     
-    # Crear scraper
-    scraper = WebScraper()
+    # Crear scraper con caché en disco para las siguientes ejecuciones
+    scraper = WebScraper(cache=CacheHTTP('data/raw/cache_http.sqlite'))
     
     # Extraer contenido
     df_contenido = scraper.extraer_multiples_urls(urls_ejemplo)
@@ -130,3 +754,7 @@ if __name__ == "__main__":
     # Guardar a CSV
     df_contenido.to_csv('data/raw/contenido_extraido.csv', index=False, encoding='utf-8')
     print("\n💾 Datos guardados en: data/raw/contenido_extraido.csv")
+    
+    stats = scraper.cache.estadisticas()
+    print(f"🗄️ Caché: {stats['aciertos']} aciertos, {stats['fallos']} fallos, "
+          f"{stats['bytes_ahorrados'] / 1024:.1f} KB ahorrados")
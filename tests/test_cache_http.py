@@ -0,0 +1,28 @@
+"""Pruebas del tamaño total y la expulsión de CacheHTTP"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from cache_http import CacheHTTP
+
+
+def test_total_incremental_coincide_con_la_tabla(tmp_path):
+    ruta = str(tmp_path / 'cache.sqlite')
+    cache = CacheHTTP(ruta, tam_max_mb=0.01)
+    for i in range(30):
+        cache.guardar(f'https://ejemplo.com/{i}', b'x' * 1000, 'etag', None, {'i': i}, 0.1)
+        assert cache._tam_total == cache._sumar_tam() <= cache.tam_max
+
+    # Reemplazar una entrada descuenta su tamaño anterior
+    cache.guardar('https://ejemplo.com/29', b'x' * 10, 'etag', None, {}, 0.1)
+    assert cache._tam_total == cache._sumar_tam()
+    tam = cache._tam_total
+    cache.cerrar()
+
+    cache = CacheHTTP(ruta, tam_max_mb=0.01)
+    assert cache._tam_total == tam
+    cache.vaciar()
+    assert cache._tam_total == 0
+    cache.cerrar()
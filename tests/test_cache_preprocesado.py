@@ -0,0 +1,46 @@
+"""Pruebas del tamaño total y de los accesos diferidos de CachePreprocesado"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from cache_preprocesado import CachePreprocesado
+
+
+def clave(i):
+    return i.to_bytes(16, 'little')
+
+
+def test_total_incremental_coincide_con_la_tabla(tmp_path):
+    cache = CachePreprocesado(str(tmp_path / 'cache.sqlite'), tam_max_mb=0.01)
+    for i in range(0, 60, 3):
+        cache.guardar_varios([(clave(j), 'palabra ' * 60) for j in range(i, i + 3)])
+        assert cache._tam_total == cache._sumar_tam() <= cache.tam_max
+
+    # Reemplazos (también repetidos dentro del mismo lote)
+    cache.guardar_varios([(clave(59), 'corto'), (clave(59), 'otro'), (clave(58), '')])
+    assert cache._tam_total == cache._sumar_tam()
+    cache.cerrar()
+
+
+def test_lecturas_no_escriben_y_cuentan_para_la_expulsion(tmp_path):
+    ruta = str(tmp_path / 'cache.sqlite')
+    cache = CachePreprocesado(ruta, tam_max_mb=0.01)
+    texto = 'palabra ' * 400
+    cache.guardar_varios([(clave(0), texto), (clave(1), texto), (clave(2), texto)])
+
+    total_cambios = cache._conexion.total_changes
+    assert cache.obtener(clave(0)) == texto
+    assert cache._conexion.total_changes == total_cambios
+    assert clave(0) in cache._accesos_pendientes
+
+    # El acceso pendiente se vuelca antes de expulsar: se conserva la clave 0
+    cache.guardar(clave(3), texto)
+    assert cache.obtener(clave(0)) == texto
+    assert cache.obtener(clave(1)) is None
+    cache.cerrar()
+
+    cache = CachePreprocesado(ruta, tam_max_mb=0.01)
+    assert cache.obtener(clave(0)) == texto
+    cache.cerrar()
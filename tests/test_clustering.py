@@ -0,0 +1,63 @@
+"""Pruebas del barrido de k y de su caché de modelos"""
+
+import os
+import sys
+
+import numpy as np
+import scipy.sparse as sp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from clustering import CacheModelos, KMeansEsferico, barrido_k
+
+
+def test_cache_modelos_descarta_el_menos_usado():
+    cache = CacheModelos(max_entradas=2)
+    cache['a'] = {'k': 1}
+    cache['b'] = {'k': 2}
+    cache['a']
+    cache['c'] = {'k': 3}
+
+    assert 'a' in cache and 'c' in cache
+    assert 'b' not in cache
+    assert len(cache) == 2
+
+
+def test_barrido_esferico_respeta_top_terminos():
+    X = sp.random(200, 300, density=0.05, format='csr', random_state=0)
+    cache = CacheModelos()
+
+    barrido = barrido_k(X, range(2, 5), 'esferico', n_jobs=1, cache=cache, top_terminos=10)
+    assert barrido['modelo'].cluster_centers_.getnnz(axis=1).max() <= 10
+    assert len(cache) == 3
+
+    # Otro top_terminos no reutiliza los modelos guardados
+    barrido = barrido_k(X, range(2, 5), 'esferico', n_jobs=1, cache=cache)
+    assert barrido['modelo'].cluster_centers_.shape == (barrido['mejor_k'], 300)
+    assert len(cache) == 6
+
+
+def test_esferico_mantiene_centros_dispersos_sin_densificar(monkeypatch):
+    X = sp.random(300, 5000, density=0.01, format='csr', random_state=0)
+
+    # Ninguna matriz dispersa de k x vocabulario se convierte a densa
+    toarray = sp.csr_matrix.toarray
+    def toarray_vigilado(matriz, *args, **kwargs):
+        assert matriz.shape[1] < X.shape[1] or matriz.shape[0] == X.shape[0]
+        return toarray(matriz, *args, **kwargs)
+    monkeypatch.setattr(sp.csr_matrix, 'toarray', toarray_vigilado)
+
+    modelo = KMeansEsferico(n_clusters=5, top_terminos=20, n_init=1).fit(X)
+    assert sp.issparse(modelo.cluster_centers_)
+    assert modelo.cluster_centers_.getnnz(axis=1).max() <= 20
+
+
+def test_esferico_repara_clusters_vacios_sin_vaciar_otros():
+    # El documento peor representado es el único de su cluster: no debe
+    # cederse al cluster vacío (el segundo centro repite el primero)
+    X = sp.csr_matrix(np.vstack([np.tile([1.0, 0, 0], (5, 1)), np.tile([0, 1.0, 0], (5, 1)),
+                                 [[0.9, 0, 1.0]]]))
+    inicio = np.array([[1.0, 0, 0], [1.0, 0, 0], [0, 1.0, 0], [0, 0, 1.0]])
+
+    modelo = KMeansEsferico(n_clusters=4, init=inicio, max_iter=1).fit(X)
+    assert np.bincount(modelo.labels_, minlength=4).min() >= 1
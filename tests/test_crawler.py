@@ -0,0 +1,144 @@
+"""
+Pruebas del Crawler contra un sitio de prueba servido con http.server
+
+Sitio (127.0.0.1, puerto aleatorio):
+    /            -> /a, /privado/secreto, sitio externo
+    /a           -> /b
+    /b           -> /c
+    /c           -> (sin enlaces)
+    /privado/*   -> bloqueado en robots.txt
+El sitio externo es un segundo servidor en otro puerto
+"""
+
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from crawler import Crawler
+from scraping import WebScraper
+
+
+def pagina(titulo, enlaces=()):
+    """HTML mínimo con un título, un párrafo y los enlaces indicados"""
+    anclas = ''.join(f'<a href="{enlace}">{enlace}</a>' for enlace in enlaces)
+    return (f"<html><head><title>{titulo}</title></head><body><h1>{titulo}</h1>"
+            f"<p>Contenido de la página {titulo}.</p>{anclas}</body></html>")
+
+
+def servir(paginas, robots='', estado_robots=200):
+    """
+    Arranca un servidor en un hilo
+
+    Returns:
+        Tupla (servidor, URL base, lista de rutas pedidas)
+    """
+    pedidas = []
+
+    class Manejador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            pedidas.append(self.path)
+            if self.path == '/robots.txt' and estado_robots != 200:
+                self.send_error(estado_robots)
+                return
+            if self.path == '/robots.txt':
+                cuerpo, tipo = robots.encode('utf-8'), 'text/plain'
+            elif self.path in paginas:
+                cuerpo, tipo = paginas[self.path].encode('utf-8'), 'text/html; charset=utf-8'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', tipo)
+            self.send_header('Content-Length', str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Manejador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}", pedidas
+
+
+@pytest.fixture
+def sitio():
+    """Sitio principal y sitio externo; devuelve (base, pedidas, pedidas_externo)"""
+    externo, base_externo, pedidas_externo = servir({'/': pagina('Externo')})
+    principal, base, pedidas = servir({
+        '/': pagina('Inicio', ['/a', '/privado/secreto', base_externo + '/']),
+        '/a': pagina('A', ['/b']),
+        '/b': pagina('B', ['/c']),
+        '/c': pagina('C'),
+        '/privado/secreto': pagina('Secreto'),
+    }, robots='User-agent: *\nDisallow: /privado/\n')
+    yield base, pedidas, pedidas_externo
+    principal.shutdown()
+    externo.shutdown()
+    principal.server_close()
+    externo.server_close()
+
+
+def rutas(df, base):
+    return sorted(url[len(base):] or '/' for url in df['url'])
+
+
+def test_respeta_robots_y_mismo_dominio(sitio):
+    base, pedidas, pedidas_externo = sitio
+    df = Crawler(max_profundidad=5, max_paginas=100, delay=0).rastrear([base + '/'])
+
+    assert rutas(df, base) == ['/', '/a', '/b', '/c']
+    assert '/privado/secreto' not in pedidas
+    assert pedidas.count('/robots.txt') == 1
+    assert pedidas_externo == []
+
+
+def test_corta_en_max_profundidad(sitio):
+    base, pedidas, _ = sitio
+    df = Crawler(max_profundidad=1, max_paginas=100, delay=0).rastrear([base + '/'])
+
+    assert rutas(df, base) == ['/', '/a']
+    assert '/b' not in pedidas
+
+
+def test_limita_max_paginas(sitio):
+    base, pedidas, _ = sitio
+    df = Crawler(max_profundidad=5, max_paginas=2, delay=0).rastrear([base + '/'])
+
+    assert rutas(df, base) == ['/', '/a']
+    assert '/b' not in pedidas
+
+
+def test_sigue_otros_dominios_si_se_permite(sitio):
+    base, _, pedidas_externo = sitio
+    df = Crawler(max_profundidad=1, max_paginas=100, delay=0,
+                 mismo_dominio=False).rastrear([base + '/'])
+
+    assert len(df) == 3
+    assert '/' in pedidas_externo
+
+
+@pytest.mark.parametrize('estado_robots, rutas_esperadas', [
+    (404, ['/', '/a']),  # 4xx: como si no hubiera robots.txt
+    (503, []),           # 5xx: todo prohibido mientras no se pueda descargar
+])
+def test_robots_inaccesible_bloquea_y_se_reintenta(estado_robots, rutas_esperadas):
+    paginas = {'/': pagina('Inicio', ['/a']), '/a': pagina('A')}
+    servidor, base, pedidas = servir(paginas, estado_robots=estado_robots)
+    try:
+        # Sin los reintentos de la sesión HTTP, para contar las peticiones
+        crawler = Crawler(WebScraper(reintentos=0), max_profundidad=1, max_paginas=10, delay=0,
+                          reintento_robots_s=0.1, max_reintentos_robots=3)
+        df = crawler.rastrear([base + '/'])
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+    assert (rutas(df, base) if len(df) else []) == rutas_esperadas
+    if estado_robots >= 500:
+        assert pedidas == ['/robots.txt'] * 3
@@ -0,0 +1,25 @@
+"""Pruebas de DetectorDuplicados"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from deduplicacion import DetectorDuplicados
+
+
+def test_textos_vacios_no_se_agrupan():
+    texto = "el campeonato mundial de fútbol reúne a los mejores equipos del planeta"
+    textos = ['', '   ', '\n\t', '¿?!', texto, texto + '.']
+
+    grupos = DetectorDuplicados(umbral=0.7).agrupar(textos)
+    assert grupos == [[4, 5]]
+
+
+def test_deduplicar_conserva_documentos_vacios():
+    df = pd.DataFrame({'texto': ['', None, '  ', 'un texto cualquiera con varias palabras']})
+    resultado, reporte = DetectorDuplicados().deduplicar(df)
+    assert len(resultado) == 4
+    assert reporte.empty
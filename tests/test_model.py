@@ -0,0 +1,25 @@
+"""Pruebas de la reducción LSA de ModeloAprendizajeWeb"""
+
+import os
+import sys
+
+import numpy as np
+import scipy.sparse as sp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from model import ModeloAprendizajeWeb
+
+
+def test_reduccion_con_corpus_pequeno():
+    # Menos documentos que características y que componentes pedidos
+    X = sp.random(6, 50, density=0.3, format='csr', random_state=0)
+    modelo = ModeloAprendizajeWeb()
+
+    reducida = modelo.ajustar_reduccion(X, n_componentes=200)
+    assert reducida.shape == (6, 5)
+    assert np.allclose(np.linalg.norm(reducida, axis=1), 1)
+
+    modelo.entrenar_clustering(X, n_clusters=2, n_componentes=200)
+    assert modelo.centros_clustering.shape == (2, 5)
+    assert len(modelo.predecir_cluster(X)) == 6
@@ -0,0 +1,56 @@
+"""Pruebas de compatibilidad de esquemas de paquete_modelo"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from model import ModeloAprendizajeWeb
+from paquete_modelo import VERSION_ESQUEMA, cargar_paquete, guardar_paquete
+from preprocessing import PreprocesadorTexto
+
+
+TEXTOS = ['futbol gol partido liga', 'gol partido equipo liga', 'equipo futbol gol estadio',
+          'album cancion banda concierto', 'cancion disco banda gira', 'concierto album disco gira']
+CATEGORIAS = np.array(['Deportes'] * 3 + ['Música'] * 3)
+
+
+def entrenar():
+    preprocesador = PreprocesadorTexto()
+    X = preprocesador.vectorizar_textos(TEXTOS, max_features=100)
+    modelo = ModeloAprendizajeWeb()
+    modelo.entrenar_clasificador(X, CATEGORIAS)
+    return modelo, preprocesador
+
+
+def test_guarda_el_esquema_actual(tmp_path):
+    modelo, preprocesador = entrenar()
+    guardar_paquete(str(tmp_path / 'paquete'), modelo, preprocesador)
+
+    with open(tmp_path / 'paquete' / 'manifiesto.json', encoding='utf-8') as f:
+        assert json.load(f)['version_esquema'] == VERSION_ESQUEMA == 2
+
+
+def test_carga_paquetes_del_esquema_1(tmp_path):
+    modelo, preprocesador = entrenar()
+    directorio = tmp_path / 'paquete'
+    guardar_paquete(str(directorio), modelo, preprocesador)
+
+    # Manifiesto con la forma del esquema 1: sin dtype, reducción ni clustering
+    ruta = directorio / 'manifiesto.json'
+    with open(ruta, encoding='utf-8') as f:
+        manifiesto = json.load(f)
+    manifiesto['version_esquema'] = 1
+    for clave in ('dtype', 'reductor', 'clustering'):
+        manifiesto.pop(clave, None)
+    manifiesto['vectorizador']['parametros'].pop('dtype')
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f)
+
+    cargado, prep_cargado = cargar_paquete(str(directorio))
+    X = prep_cargado.vectorizer.transform(TEXTOS)
+    assert cargado.dtype is None and cargado.reductor is None
+    assert list(cargado.predecir(X)) == list(modelo.predecir(X))
@@ -0,0 +1,31 @@
+"""Pruebas de SalidaParquet"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from salidas import SalidaParquet
+
+pytest.importorskip('pyarrow')
+
+
+def escribir_parte(directorio, url):
+    salida = SalidaParquet(str(directorio), tam_lote=1)
+    salida.escribir({'url': url, 'texto': 'contenido'})
+    salida.cerrar()
+
+
+def test_numeracion_con_huecos_no_sobrescribe(tmp_path):
+    for i in range(3):
+        escribir_parte(tmp_path, f'https://ejemplo.com/{i}')
+    os.remove(tmp_path / 'parte-00001.parquet')
+
+    escribir_parte(tmp_path, 'https://ejemplo.com/nueva')
+
+    assert sorted(os.listdir(tmp_path)) == ['parte-00000.parquet', 'parte-00002.parquet',
+                                            'parte-00003.parquet']
+    assert SalidaParquet(str(tmp_path)).urls_guardadas() == {
+        'https://ejemplo.com/0', 'https://ejemplo.com/2', 'https://ejemplo.com/nueva'}
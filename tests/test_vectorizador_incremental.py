@@ -0,0 +1,50 @@
+"""Pruebas de VectorizadorIncremental: columnas estables y paridad con TfidfVectorizer"""
+
+import os
+import sys
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from preprocessing import VectorizadorIncremental
+
+
+LOTE_1 = ['gol partido liga', 'gol partido equipo', 'equipo liga estadio', 'album banda gira']
+LOTE_2 = ['cancion disco banda', 'album cancion disco', 'banda gira concierto', 'gol disco liga']
+
+
+def test_columnas_estables_entre_lotes():
+    vectorizador = VectorizadorIncremental(ngram_range=(1, 1), min_df=2, max_features=4)
+    antes = vectorizador.fit_transform(LOTE_1)
+    columnas_antes = antes.shape[1]
+    terminos_antes = list(vectorizador.get_feature_names_out())
+
+    vectorizador.partial_fit(LOTE_2)
+    despues = vectorizador.transform(LOTE_1)
+
+    # Los términos conservan su columna y la matriz anterior es un prefijo
+    assert list(vectorizador.get_feature_names_out()[:columnas_antes]) == terminos_antes
+    assert despues.shape[1] >= columnas_antes
+    assert vectorizador.transform(LOTE_1, n_columnas=columnas_antes).shape == antes.shape
+
+    # Las columnas de los términos podados están a cero
+    podados = np.setdiff1d(np.arange(despues.shape[1]), vectorizador._seleccionar())
+    assert despues[:, podados].nnz == 0
+
+
+def test_misma_seleccion_y_valores_que_tfidfvectorizer():
+    parametros = dict(ngram_range=(1, 2), min_df=2, max_df=0.8, max_features=5)
+    vectorizador = VectorizadorIncremental(**parametros)
+    vectorizador.partial_fit(LOTE_1)
+    vectorizador.partial_fit(LOTE_2)
+    referencia = TfidfVectorizer(**parametros)
+    esperada = referencia.fit_transform(LOTE_1 + LOTE_2).toarray()
+
+    seleccionados = vectorizador.terminos_seleccionados()
+    assert sorted(seleccionados) == list(referencia.get_feature_names_out())
+
+    obtenida = vectorizador.transform(LOTE_1 + LOTE_2)[:, vectorizador._seleccionar()].toarray()
+    orden = [referencia.vocabulary_[t] for t in seleccionados]
+    assert np.allclose(obtenida, esperada[:, orden])